@@ -0,0 +1,94 @@
+"""
+Action log with O(1) copies, for State.actions.
+
+Copying a list of actions costs O(game length), so late-game State copies
+were slower than early ones. ActionLog keeps the log in chunks of
+CHUNK_SIZE actions: full chunks are tuples (never mutated) kept in a list
+that copies share, and only the last, partial chunk is copied. Copies that
+diverge (e.g. after undoing into a shared chunk) stop sharing the chunk list
+the first time they append a chunk of their own.
+
+It reads like a list of actions (len, indexing, slicing, iteration,
+equality with lists), and supports append and pop (of the last action).
+"""
+from collections.abc import Sequence
+
+CHUNK_SIZE = 64
+
+
+class ActionLog(Sequence):
+    """Append-only (plus pop) list of actions whose .copy() is O(CHUNK_SIZE)
+
+    Attributes:
+        chunks (List[Tuple[Action]]): Full chunks. Might be shared with
+            copies, and longer than num_chunks (the rest belongs to them).
+        num_chunks (int): Number of chunks of this log.
+        tail (List[Action]): Last actions, not yet in a full chunk.
+    """
+
+    __slots__ = ("chunks", "num_chunks", "tail")
+
+    def __init__(self, actions=()):
+        self.chunks = []
+        self.num_chunks = 0
+        self.tail = []
+        for action in actions:
+            self.append(action)
+
+    def append(self, action):
+        tail = self.tail
+        tail.append(action)
+        if len(tail) == CHUNK_SIZE:
+            if len(self.chunks) != self.num_chunks:
+                # a copy owns the chunks after ours, so stop sharing
+                self.chunks = self.chunks[: self.num_chunks]
+            self.chunks.append(tuple(tail))
+            self.num_chunks += 1
+            self.tail = []
+
+    def pop(self):
+        """Removes and returns the last action"""
+        if len(self.tail) == 0:
+            if self.num_chunks == 0:
+                raise IndexError("pop from empty ActionLog")
+            self.num_chunks -= 1
+            self.tail = list(self.chunks[self.num_chunks])
+        return self.tail.pop()
+
+    def copy(self):
+        log = ActionLog.__new__(ActionLog)
+        log.chunks = self.chunks
+        log.num_chunks = self.num_chunks
+        log.tail = self.tail.copy()
+        return log
+
+    def __len__(self):
+        return self.num_chunks * CHUNK_SIZE + len(self.tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        chunk_index, offset = divmod(index, CHUNK_SIZE)
+        if 0 <= chunk_index < self.num_chunks:
+            return self.chunks[chunk_index][offset]
+        if chunk_index == self.num_chunks and offset < len(self.tail):
+            return self.tail[offset]
+        raise IndexError("ActionLog index out of range")
+
+    def __iter__(self):
+        chunks = self.chunks
+        for i in range(self.num_chunks):
+            yield from chunks[i]
+        yield from self.tail
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # mutable
+
+    def __repr__(self):
+        return f"ActionLog({list(self)!r})"
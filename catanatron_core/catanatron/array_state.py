@@ -0,0 +1,309 @@
+"""
+Alternative State backend that keeps the mutable parts of the board
+(buildings and roads, per player and per node/edge) in flat preallocated
+integer arrays, so that copying a State is a handful of buffer copies
+instead of pickling nested dicts and lists. Meant for search players,
+which copy thousands of times per decision. Player state already lives
+in flat per-seat records (see State.player_records).
+
+Can be used like:
+
+    game.state = ArrayState.from_state(game.state)
+
+All the state_functions accessors keep working, since the arrays are exposed
+through the same dict-like and list-like interfaces State uses.
+"""
+from array import array
+from collections.abc import MutableMapping, Sequence
+
+from catanatron.models.board import Board
+from catanatron.models.enums import SETTLEMENT, CITY, ROAD
+from catanatron.models.player import Color
+from catanatron.models.player_state import PLAYER_INITIAL_STATE, PlayerStateView
+from catanatron.models.topology import NUM_GRAPH_EDGES, NUM_GRAPH_NODES
+from catanatron.state import State
+
+# 0 is reserved to mean "empty"
+COLOR_CODES = {color: i + 1 for i, color in enumerate(Color)}
+CODE_COLORS = (None, *Color)
+
+# node_code = 2 * color_code + (1 if CITY else 0)
+BUILDING_BY_CODE = [None, None] + [
+    (color, building)
+    for color in Color
+    for building in [SETTLEMENT, CITY]  # order matters
+]
+
+PIECE_CAPACITY = {
+    SETTLEMENT: PLAYER_INITIAL_STATE["SETTLEMENTS_AVAILABLE"],
+    CITY: PLAYER_INITIAL_STATE["CITIES_AVAILABLE"],
+    ROAD: PLAYER_INITIAL_STATE["ROADS_AVAILABLE"],
+}
+
+
+class PieceList:
+    """List-like view over the pieces of a given type for a given player.
+
+    Supports the subset of the list API used by the engine (append, remove,
+    insert, iteration, indexing, concatenation and comparison).
+    """
+
+    __slots__ = ("buffer", "start", "capacity")
+
+    def __init__(self, buffer, start, capacity):
+        self.buffer = buffer
+        self.start = start  # buffer[start] holds the count
+        self.capacity = capacity
+
+    def append(self, value):
+        count = self.buffer[self.start]
+        if count >= self.capacity:
+            raise ValueError("No more pieces of this type available")
+        self.buffer[self.start + 1 + count] = value
+        self.buffer[self.start] = count + 1
+
+    def remove(self, value):
+        count = self.buffer[self.start]
+        items = self.buffer[self.start + 1 : self.start + 1 + count]
+        position = items.index(value)  # raises ValueError like list
+        del items[position]
+        items.append(0)
+        self.buffer[self.start + 1 : self.start + 1 + count] = items
+        self.buffer[self.start] = count - 1
+
+    def insert(self, index, value):
+        items = list(self)
+        items.insert(index, value)
+        if len(items) > self.capacity:
+            raise ValueError("No more pieces of this type available")
+        for i, item in enumerate(items):
+            self.buffer[self.start + 1 + i] = item
+        self.buffer[self.start] = len(items)
+
+    def index(self, value):
+        return list(self).index(value)
+
+    def __len__(self):
+        return self.buffer[self.start]
+
+    def __iter__(self):
+        count = self.buffer[self.start]
+        yield from self.buffer[self.start + 1 : self.start + 1 + count]
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+    def __contains__(self, value):
+        return value in list(self)
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def copy(self):
+        return list(self)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def get_pieces_layout():
+    """Returns building_type => (offset, capacity) within a player's block."""
+    layout = dict()
+    offset = 0
+    for building_type, capacity in PIECE_CAPACITY.items():
+        layout[building_type] = (offset, capacity)
+        offset += 1 + capacity  # +1 for the count slot
+    return layout, offset
+
+
+PIECES_LAYOUT, PIECES_BLOCK_SIZE = get_pieces_layout()
+
+
+class BuildingsArray:
+    """Replacement for State.buildings_by_color. One fixed-size block of
+    slots per player with room for all of their pieces.
+
+    Can be used like: `buildings[Color.RED][SETTLEMENT]`.
+    """
+
+    __slots__ = ("buffer", "color_to_index")
+
+    def __init__(self, color_to_index, buffer=None):
+        self.color_to_index = color_to_index
+        size = PIECES_BLOCK_SIZE * len(color_to_index)
+        self.buffer = array("h", [0] * size) if buffer is None else buffer
+
+    @staticmethod
+    def from_buildings_by_color(buildings_by_color, color_to_index):
+        result = BuildingsArray(color_to_index)
+        for color, buildings in buildings_by_color.items():
+            for building_type in PIECE_CAPACITY.keys():
+                pieces = result[color][building_type]
+                for value in buildings[building_type]:
+                    pieces.append(value)
+        return result
+
+    def __getitem__(self, color):
+        return PlayerPieces(self.buffer, self.color_to_index[color] * PIECES_BLOCK_SIZE)
+
+    def copy(self):
+        return BuildingsArray(self.color_to_index, self.buffer[:])
+
+
+class PlayerPieces:
+    __slots__ = ("buffer", "start")
+
+    def __init__(self, buffer, start):
+        self.buffer = buffer
+        self.start = start
+
+    def __getitem__(self, building_type):
+        offset, capacity = PIECES_LAYOUT[building_type]
+        return PieceList(self.buffer, self.start + offset, capacity)
+
+
+class NodeBuildingsArray(MutableMapping):
+    """Replacement for Board.buildings (node_id => (Color, FastBuildingType))."""
+
+    __slots__ = ("codes",)
+
+    def __init__(self, codes=None):
+        self.codes = array("b", [0] * NUM_GRAPH_NODES) if codes is None else codes
+
+    def __getitem__(self, node_id):
+        building = BUILDING_BY_CODE[self.codes[node_id]]
+        if building is None:
+            raise KeyError(node_id)
+        return building
+
+    def get(self, node_id, default=None):
+        return BUILDING_BY_CODE[self.codes[node_id]] or default
+
+    def __setitem__(self, node_id, building):
+        color, building_type = building
+        self.codes[node_id] = 2 * COLOR_CODES[color] + (building_type == CITY)
+
+    def __delitem__(self, node_id):
+        if not self.codes[node_id]:
+            raise KeyError(node_id)
+        self.codes[node_id] = 0
+
+    def __iter__(self):
+        return (node_id for node_id, code in enumerate(self.codes) if code)
+
+    def __len__(self):
+        return NUM_GRAPH_NODES - self.codes.count(0)
+
+    def copy(self):
+        return NodeBuildingsArray(self.codes[:])
+
+
+class EdgeRoadsArray(Sequence):
+    """Replacement for Board.roads (edge_id => Color or None)."""
+
+    __slots__ = ("codes",)
+
+    def __init__(self, codes=None):
+        self.codes = array("b", [0] * NUM_GRAPH_EDGES) if codes is None else codes
+
+    def __getitem__(self, edge_id):
+        if isinstance(edge_id, slice):
+            return [CODE_COLORS[code] for code in self.codes[edge_id]]
+        return CODE_COLORS[self.codes[edge_id]]
+
+    def __setitem__(self, edge_id, color):
+        self.codes[edge_id] = 0 if color is None else COLOR_CODES[color]
+
+    def __iter__(self):
+        return (CODE_COLORS[code] for code in self.codes)
+
+    def __len__(self):
+        return NUM_GRAPH_EDGES
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None  # mutable
+
+    def copy(self):
+        return EdgeRoadsArray(self.codes[:])
+
+
+class ArrayBoard(Board):
+    """Board whose buildings and roads live in flat arrays."""
+
+    def __init__(self, catan_map=None, initialize=True):
+        super().__init__(catan_map, initialize)
+        if initialize:
+            self.buildings = NodeBuildingsArray()
+            self.roads = EdgeRoadsArray()
+
+    @staticmethod
+    def from_board(board: Board):
+        array_board = ArrayBoard(board.map, initialize=False)
+        array_board.__dict__.update(board.copy().__dict__)
+        array_board.buildings = NodeBuildingsArray()
+        array_board.buildings.update(board.buildings)
+        array_board.roads = EdgeRoadsArray()
+        for edge_id, color in enumerate(board.roads):
+            array_board.roads[edge_id] = color
+        return array_board
+
+    def copy(self):
+        board = ArrayBoard(self.map, initialize=False)
+        board.__dict__.update(self.__dict__)  # immutable values
+        board.buildings = self.buildings.copy()
+        board.roads = self.roads.copy()
+        board.component_masks = self.component_masks.copy()
+        board.component_index = self.component_index.copy()
+        board.reachable_masks = self.reachable_masks.copy()
+        board.buildable_edge_masks = self.buildable_edge_masks.copy()
+        board.road_lengths = self.road_lengths.copy()
+        # Cached values are replaced (never mutated), so can be shared.
+        board.player_port_resources_cache = self.player_port_resources_cache.copy()
+        return board
+
+
+class ArrayState(State):
+    """State backed by flat arrays. See module docstring."""
+
+    def __init__(self, players, catan_map=None, discard_limit=7, initialize=True):
+        super().__init__(players, catan_map, discard_limit, initialize)
+        if initialize:
+            self.board = ArrayBoard.from_board(self.board)
+            self.buildings_by_color = BuildingsArray(self.color_to_index)
+
+    @staticmethod
+    def from_state(state: State):
+        """Creates an ArrayState equivalent to the given State"""
+        array_state = ArrayState([], initialize=False)
+        array_state.__dict__.update(state.copy().__dict__)
+        array_state.board = ArrayBoard.from_board(state.board)
+        array_state.buildings_by_color = BuildingsArray.from_buildings_by_color(
+            state.buildings_by_color, state.color_to_index
+        )
+        return array_state
+
+    def copy(self):
+        state_copy = ArrayState([], None, initialize=False)
+        state_copy.__dict__.update(self.__dict__)  # immutable values
+        state_copy.board = self.board.copy()
+        state_copy.player_records = [record.copy() for record in self.player_records]
+        state_copy.player_state = PlayerStateView(state_copy.player_records)
+        state_copy.resource_freqdeck = self.resource_freqdeck.copy()
+        state_copy.development_listdeck = self.development_listdeck.copy()
+        state_copy.buildings_by_color = self.buildings_by_color.copy()
+        state_copy.actions = self.actions.copy()
+        state_copy.forked_attributes = set()
+        return state_copy
+
+    def copy_buildings_by_color(self):
+        return self.buildings_by_color.copy()
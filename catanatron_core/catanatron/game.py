@@ -8,9 +8,16 @@ import sys
 from typing import List, Union, Optional
 
 from catanatron.models.enums import Action, ActionPrompt, ActionType
-from catanatron.state import State, apply_action
-from catanatron.state_functions import player_key, player_has_rolled
+from catanatron.state import (
+    State,
+    UndoRecord,
+    apply_action,
+    apply_action_with_undo,
+    undo_action,
+)
+from catanatron.state_functions import player_has_rolled
 from catanatron.models.map import CatanMap
+from catanatron.models.player_state import PlayerField
 from catanatron.models.player import Color, Player
 
 # To timeout RandomRobots from getting stuck...
@@ -78,6 +85,19 @@ class GameAccumulator:
         """
         pass
 
+    def partial(self):
+        """
+        Returns what has been accumulated so far, as a picklable value that
+        .merge of another accumulator of the same kind can add to its own
+        (e.g. to combine accumulators that ran in different processes).
+        None if this accumulator can't be merged (the default).
+        """
+        return None
+
+    def merge(self, partial):
+        """Adds the .partial() of another accumulator of this kind to this one"""
+        pass
+
 
 class Game:
     """
@@ -167,6 +187,21 @@ class Game:
 
         return apply_action(self.state, action)
 
+    def execute_with_undo(
+        self, action: Action, validate_action: bool = True
+    ) -> UndoRecord:
+        """Like .execute, but returns a record to revert it with .undo"""
+        if validate_action and not is_valid_action(self.state, action):
+            raise ValueError(
+                f"{action} not playable right now. playable_actions={self.state.playable_actions}"
+            )
+
+        return apply_action_with_undo(self.state, action)
+
+    def undo(self, record: UndoRecord):
+        """Reverts an .execute_with_undo call (most recent first)"""
+        undo_action(self.state, record)
+
     def winning_color(self) -> Union[Color, None]:
         """Gets winning color
 
@@ -174,12 +209,8 @@ class Game:
             Union[Color, None]: Might be None if game truncated by TURNS_LIMIT
         """
         result = None
-        for color in self.state.colors:
-            key = player_key(self.state, color)
-            if (
-                self.state.player_state[f"{key}_ACTUAL_VICTORY_POINTS"]
-                >= self.vps_to_win
-            ):
+        for color, record in zip(self.state.colors, self.state.player_records):
+            if record[PlayerField.ACTUAL_VICTORY_POINTS] >= self.vps_to_win:
                 result = color
 
         return result
@@ -197,3 +228,18 @@ class Game:
         game_copy.vps_to_win = self.vps_to_win
         game_copy.state = self.state.copy()
         return game_copy
+
+    def fork(self) -> "Game":
+        """Like .copy, but shares what it can with this Game until either
+        of the two writes it (see State.fork). Cheaper for branching
+        rollouts, which only apply a few actions to each copy.
+
+        Returns:
+            Game: Game fork.
+        """
+        game_fork = Game(players=[], initialize=False)
+        game_fork.seed = self.seed
+        game_fork.id = self.id
+        game_fork.vps_to_win = self.vps_to_win
+        game_fork.state = self.state.fork()
+        return game_fork
@@ -8,7 +8,9 @@ from enum import Enum
 from catanatron.models.map import Water, Port, LandTile
 from catanatron.game import Game
 from catanatron.models.player import Color
+from catanatron.models.action_table import intern_action
 from catanatron.models.enums import RESOURCES, Action, ActionType
+from catanatron.models.topology import EDGE_IDS, EDGES
 from catanatron.state_functions import get_longest_road_length
 
 
@@ -19,17 +21,24 @@ def longest_roads_by_player(state):
     return result
 
 
+def action_to_json(action):
+    """Action with road edge ids as (a, b) node pairs, like the UI sees them"""
+    if action.action_type == ActionType.BUILD_ROAD:
+        return action._replace(value=EDGES[action.value])
+    return action
+
+
 def action_from_json(data):
     color = Color[data[0]]
     action_type = ActionType[data[1]]
     if action_type == ActionType.BUILD_ROAD:
-        action = Action(color, action_type, tuple(data[2]))
+        action = Action(color, action_type, EDGE_IDS[tuple(data[2])])
     elif action_type == ActionType.MARITIME_TRADE:
         value = tuple(data[2])
         action = Action(color, action_type, value)
     else:
         action = Action(color, action_type, data[2])
-    return action
+    return intern_action(action)
 
 
 class GameEncoder(json.JSONEncoder):
@@ -58,7 +67,7 @@ class GameEncoder(json.JSONEncoder):
                         "color": self.default(color),
                     }
                 for direction, edge in tile.edges.items():
-                    color = obj.state.board.roads.get(edge, None)
+                    color = obj.state.board.roads[EDGE_IDS[edge]]
                     edge_id = tuple(sorted(edge))
                     edges[edge_id] = {
                         "id": edge_id,
@@ -74,8 +83,8 @@ class GameEncoder(json.JSONEncoder):
                 "adjacent_tiles": obj.state.board.map.adjacent_tiles,
                 "nodes": nodes,
                 "edges": list(edges.values()),
-                "actions": [self.default(a) for a in obj.state.actions],
-                "player_state": obj.state.player_state,
+                "actions": [action_to_json(a) for a in obj.state.actions],
+                "player_state": dict(obj.state.player_state),
                 "colors": obj.state.colors,
                 "bot_colors": list(
                     map(
@@ -86,7 +95,9 @@ class GameEncoder(json.JSONEncoder):
                 "robber_coordinate": obj.state.board.robber_coordinate,
                 "current_color": obj.state.current_color(),
                 "current_prompt": obj.state.current_prompt,
-                "current_playable_actions": obj.state.playable_actions,
+                "current_playable_actions": [
+                    action_to_json(a) for a in obj.state.playable_actions
+                ],
                 "longest_roads_by_player": longest_roads_by_player(obj.state),
                 "winning_color": obj.winning_color(),
             }
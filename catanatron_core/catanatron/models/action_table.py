@@ -0,0 +1,195 @@
+"""
+Interned actions: one prebuilt Action per color and action that the move
+generator can offer (all but the domestic trade ones, whose values are
+arbitrary), each with a small integer code.
+
+generate_playable_actions hands out these objects instead of building new
+namedtuples, so that playable actions can be handled as ints:
+PlayableActions keeps their codes (and a set of them, for O(1) membership),
+and catanatron_gym maps codes to its action space with a list lookup.
+
+Interned actions are equal to (and hash like) plain Actions with the same
+fields, so code comparing or hashing actions keeps working. Use
+intern_action to get the interned equivalent of a plain Action.
+"""
+from array import array
+from typing import Any, Dict, Optional, Tuple
+
+from catanatron.models.enums import RESOURCES, Action, ActionType
+from catanatron.models.map import BASE_MAP_TEMPLATE, NUM_NODES, LandTile
+from catanatron.models.player import Color
+from catanatron.models.topology import get_land_edges
+
+
+class InternedAction(Action):
+    """Action from the table. Has .code, its index in ACTIONS."""
+
+    code: int
+
+    @classmethod
+    def _make(cls, iterable):
+        return Action._make(iterable)  # e.g. _replace() copies aren't interned
+
+    def __repr__(self):
+        return repr(Action(*self))
+
+    def __reduce__(self):
+        # unpickles (e.g. in search workers) to the table's object
+        return get_action, (self.code,)
+
+
+_TILE_COORDINATES = [
+    coordinate
+    for coordinate, tile_type in BASE_MAP_TEMPLATE.topology.items()
+    if tile_type == LandTile
+]
+_EDGE_IDS = get_land_edges(frozenset(range(NUM_NODES)))
+
+# (action_type, value) of the actions of a color, in code order
+ACTION_TEMPLATES: Tuple[Tuple[ActionType, Any], ...] = (
+    (ActionType.ROLL, None),
+    *[
+        (ActionType.MOVE_ROBBER, (coordinate, victim, None))
+        for coordinate in _TILE_COORDINATES
+        for victim in (None, *Color)
+    ],
+    (ActionType.DISCARD, None),
+    *[(ActionType.BUILD_ROAD, edge_id) for edge_id in _EDGE_IDS],
+    *[(ActionType.BUILD_SETTLEMENT, node_id) for node_id in range(NUM_NODES)],
+    *[(ActionType.BUILD_CITY, node_id) for node_id in range(NUM_NODES)],
+    (ActionType.BUY_DEVELOPMENT_CARD, None),
+    (ActionType.PLAY_KNIGHT_CARD, None),
+    *[
+        (ActionType.PLAY_YEAR_OF_PLENTY, (first_card, RESOURCES[j]))
+        for i, first_card in enumerate(RESOURCES)
+        for j in range(i, len(RESOURCES))
+    ],
+    *[(ActionType.PLAY_YEAR_OF_PLENTY, (first_card,)) for first_card in RESOURCES],
+    (ActionType.PLAY_ROAD_BUILDING, None),
+    *[(ActionType.PLAY_MONOPOLY, resource) for resource in RESOURCES],
+    *[
+        (ActionType.MARITIME_TRADE, tuple(rate * [i] + (4 - rate) * [None] + [j]))
+        for rate in (4, 3, 2)
+        for i in RESOURCES
+        for j in RESOURCES
+        if i != j
+    ],
+    (ActionType.CANCEL_TRADE, None),
+    (ActionType.END_TURN, None),
+)
+NUM_ACTION_TEMPLATES = len(ACTION_TEMPLATES)
+
+
+def _build_table():
+    actions = []
+    by_color: Dict[Color, Dict[ActionType, Dict[Any, InternedAction]]] = dict()
+    for color in Color:
+        by_type: Dict[ActionType, Dict[Any, InternedAction]] = {
+            action_type: dict() for action_type in ActionType
+        }
+        for action_type, value in ACTION_TEMPLATES:
+            action = InternedAction(color, action_type, value)
+            action.code = len(actions)
+            actions.append(action)
+            by_type[action_type][value] = action
+        by_color[color] = by_type
+    return tuple(actions), by_color
+
+
+# code => action. Codes of color i are [i * NUM_ACTION_TEMPLATES, (i + 1) * ...)
+ACTIONS: Tuple[InternedAction, ...]
+# color => action_type => value => action
+INTERNED_ACTIONS: Dict[Color, Dict[ActionType, Dict[Any, InternedAction]]]
+ACTIONS, INTERNED_ACTIONS = _build_table()
+
+
+def get_action(code: int) -> InternedAction:
+    return ACTIONS[code]
+
+
+def intern_action(action: Action) -> Action:
+    """The interned action equal to action (or action, if there's none)"""
+    if isinstance(action, InternedAction):
+        return action
+    try:
+        by_type = INTERNED_ACTIONS.get(action.color, dict())
+        interned = by_type.get(action.action_type, dict()).get(action.value)
+    except TypeError:  # unhashable value (e.g. lists from JSON)
+        return action
+    return action if interned is None else interned
+
+
+def action_code(action: Action) -> Optional[int]:
+    """Code of the interned action equal to action (None if there's none)"""
+    if isinstance(action, InternedAction):
+        return action.code
+    interned = intern_action(action)
+    return interned.code if isinstance(interned, InternedAction) else None
+
+
+class PlayableActions(list):
+    """List of actions (what generate_playable_actions returns) that also
+    keeps the codes of its interned actions, computed on first use (and
+    again after the list is modified).
+
+    Attributes:
+        codes (array): Code of each action (-1 for non-interned ones).
+        code_set (FrozenSet[int]): Codes of the interned actions.
+    """
+
+    __slots__ = ("_codes", "_code_set")
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._codes = None
+        self._code_set = None
+
+    def _compute_codes(self):
+        codes = [action_code(action) for action in self]
+        self._codes = array("h", [-1 if code is None else code for code in codes])
+        self._code_set = frozenset(code for code in codes if code is not None)
+
+    @property
+    def codes(self) -> array:
+        if getattr(self, "_codes", None) is None:
+            self._compute_codes()
+        return self._codes
+
+    @property
+    def code_set(self):
+        self.codes  # computes both, if needed
+        return self._code_set
+
+    def __contains__(self, action):
+        code = action_code(action)
+        if code is None:
+            return list.__contains__(self, action)
+        return code in self.code_set
+
+
+def _clearing_codes(method):
+    def clear_codes_and_call(self, *args, **kwargs):
+        self._codes = None
+        return method(self, *args, **kwargs)
+
+    clear_codes_and_call.__name__ = method.__name__
+    clear_codes_and_call.__doc__ = method.__doc__
+    return clear_codes_and_call
+
+
+# Every in-place modification of the list invalidates its codes
+for _name in [
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+]:
+    setattr(PlayableActions, _name, _clearing_codes(getattr(list, _name)))
@@ -4,7 +4,7 @@ by current player). Main function is generate_playable_actions.
 """
 import operator as op
 from functools import reduce
-from typing import Any, Dict, List, Set, Tuple, Union
+from typing import Any, Dict, List, Tuple, Union
 
 from catanatron.models.decks import (
     CITY_COST_FREQDECK,
@@ -28,21 +28,30 @@ from catanatron.models.enums import (
     WHEAT,
     WOOD,
 )
+from catanatron.models.action_table import INTERNED_ACTIONS, PlayableActions
+from catanatron.models.player_state import PlayerField
+from catanatron.models.topology import INCIDENT_EDGE_MASKS, mask_to_ids
 from catanatron.state_functions import (
     get_player_buildings,
     get_player_freqdeck,
     player_can_afford_dev_card,
     player_can_play_dev,
     player_has_rolled,
-    player_key,
     player_num_resource_cards,
+    player_record,
     player_resource_freqdeck_contains,
 )
 
 
 def generate_playable_actions(state) -> List[Action]:
+    """Interned actions (see action_table.py) except for domestic trade ones"""
+    return PlayableActions(_generate_playable_actions(state))
+
+
+def _generate_playable_actions(state) -> List[Action]:
     action_prompt = state.current_prompt
     color = state.current_color()
+    interned = INTERNED_ACTIONS[color]
 
     if action_prompt == ActionPrompt.BUILD_INITIAL_SETTLEMENT:
         return settlement_possibilities(state, color, True)
@@ -54,11 +63,11 @@ def generate_playable_actions(state) -> List[Action]:
         if state.is_road_building:
             actions = road_building_possibilities(state, color, False)
         elif not player_has_rolled(state, color):
-            actions = [Action(color, ActionType.ROLL, None)]
+            actions = [interned[ActionType.ROLL][None]]
             if player_can_play_dev(state, color, "KNIGHT"):
-                actions.append(Action(color, ActionType.PLAY_KNIGHT_CARD, None))
+                actions.append(interned[ActionType.PLAY_KNIGHT_CARD][None])
         else:
-            actions = [Action(color, ActionType.END_TURN, None)]
+            actions = [interned[ActionType.END_TURN][None]]
             actions.extend(road_building_possibilities(state, color))
             actions.extend(settlement_possibilities(state, color))
             actions.extend(city_possibilities(state, color))
@@ -68,7 +77,7 @@ def generate_playable_actions(state) -> List[Action]:
                 and len(state.development_listdeck) > 0
             )
             if can_buy_dev_card:
-                actions.append(Action(color, ActionType.BUY_DEVELOPMENT_CARD, None))
+                actions.append(interned[ActionType.BUY_DEVELOPMENT_CARD][None])
 
             # Play Dev Cards
             if player_can_play_dev(state, color, "YEAR_OF_PLENTY"):
@@ -78,12 +87,12 @@ def generate_playable_actions(state) -> List[Action]:
             if player_can_play_dev(state, color, "MONOPOLY"):
                 actions.extend(monopoly_possibilities(color))
             if player_can_play_dev(state, color, "KNIGHT"):
-                actions.append(Action(color, ActionType.PLAY_KNIGHT_CARD, None))
+                actions.append(interned[ActionType.PLAY_KNIGHT_CARD][None])
             if (
                 player_can_play_dev(state, color, "ROAD_BUILDING")
                 and len(road_building_possibilities(state, color, False)) > 0
             ):
-                actions.append(Action(color, ActionType.PLAY_ROAD_BUILDING, None))
+                actions.append(interned[ActionType.PLAY_ROAD_BUILDING][None])
 
             # Trade
             actions.extend(maritime_trade_possibilities(state, color))
@@ -117,7 +126,7 @@ def generate_playable_actions(state) -> List[Action]:
 
         # Add cancel option if there aren't acceptees
         if not actions:
-            actions = [Action(color, ActionType.CANCEL_TRADE, None)]
+            actions = [interned[ActionType.CANCEL_TRADE][None]]
 
         return actions
     else:
@@ -125,37 +134,36 @@ def generate_playable_actions(state) -> List[Action]:
 
 
 def monopoly_possibilities(color) -> List[Action]:
-    return [Action(color, ActionType.PLAY_MONOPOLY, card) for card in RESOURCES]
+    monopoly_actions = INTERNED_ACTIONS[color][ActionType.PLAY_MONOPOLY]
+    return [monopoly_actions[card] for card in RESOURCES]
 
 
 def year_of_plenty_possibilities(color, freqdeck: List[int]) -> List[Action]:
-    options: Set[Union[Tuple[FastResource, FastResource], Tuple[FastResource]]] = set()
+    # a dict as an ordered set (strings hash differently in each process, so
+    # set order isn't reproducible, and neither would random choices be)
+    options: Dict[
+        Union[Tuple[FastResource, FastResource], Tuple[FastResource]], None
+    ] = dict()
     for i, first_card in enumerate(RESOURCES):
         for j in range(i, len(RESOURCES)):
             second_card = RESOURCES[j]  # doing it this way to not repeat
 
             to_draw = freqdeck_from_listdeck([first_card, second_card])
             if freqdeck_contains(freqdeck, to_draw):
-                options.add((first_card, second_card))
+                options[(first_card, second_card)] = None
             else:  # try allowing player select 1 card only.
                 if freqdeck_can_draw(freqdeck, 1, first_card):
-                    options.add((first_card,))
+                    options[(first_card,)] = None
                 if freqdeck_can_draw(freqdeck, 1, second_card):
-                    options.add((second_card,))
+                    options[(second_card,)] = None
 
-    return list(
-        map(
-            lambda cards: Action(color, ActionType.PLAY_YEAR_OF_PLENTY, tuple(cards)),
-            options,
-        )
-    )
+    year_of_plenty_actions = INTERNED_ACTIONS[color][ActionType.PLAY_YEAR_OF_PLENTY]
+    return [year_of_plenty_actions[cards] for cards in options]
 
 
 def road_building_possibilities(state, color, check_money=True) -> List[Action]:
-    key = player_key(state, color)
-
     # Check if can't build any more roads.
-    has_roads_available = state.player_state[f"{key}_ROADS_AVAILABLE"] > 0
+    has_roads_available = player_record(state, color)[PlayerField.ROADS_AVAILABLE] > 0
     if not has_roads_available:
         return []
 
@@ -164,8 +172,8 @@ def road_building_possibilities(state, color, check_money=True) -> List[Action]:
     if check_money and not has_money:
         return []
 
-    buildable_edges = state.board.buildable_edges(color)
-    return [Action(color, ActionType.BUILD_ROAD, edge) for edge in buildable_edges]
+    road_actions = INTERNED_ACTIONS[color][ActionType.BUILD_ROAD]
+    return [road_actions[edge_id] for edge_id in state.board.buildable_edges(color)]
 
 
 def settlement_possibilities(state, color, initial_build_phase=False) -> List[Action]:
@@ -173,46 +181,41 @@ def settlement_possibilities(state, color, initial_build_phase=False) -> List[Ac
         buildable_node_ids = state.board.buildable_node_ids(
             color, initial_build_phase=True
         )
-        return [
-            Action(color, ActionType.BUILD_SETTLEMENT, node_id)
-            for node_id in buildable_node_ids
-        ]
+        settlement_actions = INTERNED_ACTIONS[color][ActionType.BUILD_SETTLEMENT]
+        return [settlement_actions[node_id] for node_id in buildable_node_ids]
     else:
-        key = player_key(state, color)
         has_money = player_resource_freqdeck_contains(
             state, color, SETTLEMENT_COST_FREQDECK
         )
         has_settlements_available = (
-            state.player_state[f"{key}_SETTLEMENTS_AVAILABLE"] > 0
+            player_record(state, color)[PlayerField.SETTLEMENTS_AVAILABLE] > 0
         )
         if has_money and has_settlements_available:
             buildable_node_ids = state.board.buildable_node_ids(color)
-            return [
-                Action(color, ActionType.BUILD_SETTLEMENT, node_id)
-                for node_id in buildable_node_ids
-            ]
+            settlement_actions = INTERNED_ACTIONS[color][ActionType.BUILD_SETTLEMENT]
+            return [settlement_actions[node_id] for node_id in buildable_node_ids]
         else:
             return []
 
 
 def city_possibilities(state, color) -> List[Action]:
-    key = player_key(state, color)
-
     can_buy_city = player_resource_freqdeck_contains(state, color, CITY_COST_FREQDECK)
     if not can_buy_city:
         return []
 
-    has_cities_available = state.player_state[f"{key}_CITIES_AVAILABLE"] > 0
+    has_cities_available = player_record(state, color)[PlayerField.CITIES_AVAILABLE] > 0
     if not has_cities_available:
         return []
 
+    city_actions = INTERNED_ACTIONS[color][ActionType.BUILD_CITY]
     return [
-        Action(color, ActionType.BUILD_CITY, node_id)
+        city_actions[node_id]
         for node_id in get_player_buildings(state, color, SETTLEMENT)
     ]
 
 
 def robber_possibilities(state, color) -> List[Action]:
+    robber_actions = INTERNED_ACTIONS[color][ActionType.MOVE_ROBBER]
     actions = []
     for coordinate, tile in state.board.map.land_tiles.items():
         if coordinate == state.board.robber_coordinate:
@@ -220,7 +223,7 @@ def robber_possibilities(state, color) -> List[Action]:
 
         # each tile can yield a (move-but-cant-steal) action or
         #   several (move-and-steal-from-x) actions.
-        to_steal_from = set()  # set of player_indexs
+        to_steal_from = dict()  # colors, as an ordered set (see above)
         for node_id in tile.nodes.values():
             building = state.board.buildings.get(node_id, None)
             if building is not None:
@@ -229,19 +232,13 @@ def robber_possibilities(state, color) -> List[Action]:
                     player_num_resource_cards(state, candidate_color) >= 1
                     and color != candidate_color  # can't play yourself
                 ):
-                    to_steal_from.add(candidate_color)
+                    to_steal_from[candidate_color] = None
 
         if len(to_steal_from) == 0:
-            actions.append(
-                Action(color, ActionType.MOVE_ROBBER, (coordinate, None, None))
-            )
+            actions.append(robber_actions[(coordinate, None, None)])
         else:
             for enemy_color in to_steal_from:
-                actions.append(
-                    Action(
-                        color, ActionType.MOVE_ROBBER, (coordinate, enemy_color, None)
-                    )
-                )
+                actions.append(robber_actions[(coordinate, enemy_color, None)])
 
     return actions
 
@@ -250,15 +247,16 @@ def initial_road_possibilities(state, color) -> List[Action]:
     # Must be connected to last settlement
     last_settlement_node_id = state.buildings_by_color[color][SETTLEMENT][-1]
 
-    buildable_edges = filter(
-        lambda edge: last_settlement_node_id in edge,
-        state.board.buildable_edges(color),
+    buildable_edges = mask_to_ids(
+        state.board.buildable_edge_masks[color]
+        & INCIDENT_EDGE_MASKS[last_settlement_node_id]
     )
-    return [Action(color, ActionType.BUILD_ROAD, edge) for edge in buildable_edges]
+    road_actions = INTERNED_ACTIONS[color][ActionType.BUILD_ROAD]
+    return [road_actions[edge_id] for edge_id in buildable_edges]
 
 
 def discard_possibilities(color) -> List[Action]:
-    return [Action(color, ActionType.DISCARD, None)]
+    return [INTERNED_ACTIONS[color][ActionType.DISCARD][None]]
     # TODO: Be robust to high dimensionality of DISCARD
     # hand = player.resource_deck.to_array()
     # num_cards = player.resource_deck.num_cards()
@@ -294,14 +292,13 @@ def maritime_trade_possibilities(state, color) -> List[Action]:
         hand_freqdeck, state.resource_freqdeck, port_resources
     )
 
-    return list(
-        map(lambda t: Action(color, ActionType.MARITIME_TRADE, t), trade_offers)
-    )
+    trade_actions = INTERNED_ACTIONS[color][ActionType.MARITIME_TRADE]
+    return [trade_actions[trade_offer] for trade_offer in trade_offers]
 
 
 def inner_maritime_trade_possibilities(hand_freqdeck, bank_freqdeck, port_resources):
     """This inner function is to make this logic more shareable"""
-    trade_offers = set()
+    trade_offers = []  # a list (not a set), to keep a reproducible order
 
     # Get lowest rate per resource
     rates: Dict[FastResource, int] = {WOOD: 4, BRICK: 4, SHEEP: 4, WHEAT: 4, ORE: 4}
@@ -323,6 +320,6 @@ def inner_maritime_trade_possibilities(hand_freqdeck, bank_freqdeck, port_resour
                     and freqdeck_count(bank_freqdeck, j_resource) > 0
                 ):
                     trade_offer = tuple(resource_out + [j_resource])
-                    trade_offers.add(trade_offer)
+                    trade_offers.append(trade_offer)
 
     return trade_offers
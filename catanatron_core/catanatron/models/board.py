@@ -1,11 +1,7 @@
-import pickle
-import copy
 from collections import defaultdict
 from typing import Any, Set, Dict, Tuple, List
 import functools
 
-import networkx as nx  # type: ignore
-
 from catanatron.models.player import Color
 from catanatron.models.map import (
     BASE_MAP_TEMPLATE,
@@ -15,25 +11,71 @@ from catanatron.models.map import (
     NodeId,
 )
 from catanatron.models.enums import FastBuildingType, SETTLEMENT, CITY
+from catanatron.models.decks import RESOURCE_FREQDECK_INDEXES
+from catanatron.models import topology
+from catanatron.models.topology import (
+    EDGES,
+    NEIGHBOR_MASKS,
+    NUM_GRAPH_EDGES,
+    ids_to_mask,
+    mask_to_ids,
+)
 
 
-# Used to find relationships between nodes and edges
 base_map = CatanMap.from_template(BASE_MAP_TEMPLATE)
 mini_map = CatanMap.from_template(MINI_MAP_TEMPLATE)
-STATIC_GRAPH = nx.Graph()
-for tile in base_map.tiles.values():
-    STATIC_GRAPH.add_nodes_from(tile.nodes.values())
-    STATIC_GRAPH.add_edges_from(tile.edges.values())
+
+
+@functools.lru_cache(1)
+def get_static_graph():
+    """networkx.Graph of all nodes and edges, for offline tooling (the
+    engine uses the tables in topology.py instead)"""
+    import networkx as nx  # type: ignore
+
+    graph = nx.Graph()
+    for tile in base_map.tiles.values():
+        graph.add_nodes_from(tile.nodes.values())
+        graph.add_edges_from(tile.edges.values())
+    return graph
+
+
+def __getattr__(name):
+    # STATIC_GRAPH is built on first use, so that importing the engine
+    # doesn't need networkx.
+    if name == "STATIC_GRAPH":
+        return get_static_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# node_id => ((neighbor_id, edge_id, edge_bit), ...). Edge sets are encoded
+# as int bitmasks with bit edge_id.
+INCIDENT_EDGES = {
+    node: tuple(
+        (neighbor, edge_id, 1 << edge_id) for neighbor, edge_id in incident_edges
+    )
+    for node, incident_edges in enumerate(topology.INCIDENT_EDGES)
+}
 
 
 @functools.lru_cache(1)
 def get_node_distances():
-    return nx.floyd_warshall(STATIC_GRAPH)
+    """node_id => node_id => number of edges between them"""
+    return {
+        node_id: topology.bfs_distances(node_id)
+        for node_id in range(topology.NUM_GRAPH_NODES)
+    }
 
 
 @functools.lru_cache(3)  # None, range(54), range(24)
+def get_edge_ids(land_nodes=None):
+    """Ids of the edges between land_nodes (default: the base map's land)"""
+    return list(topology.get_land_edges(frozenset(land_nodes or range(NUM_NODES))))
+
+
+@functools.lru_cache(3)
 def get_edges(land_nodes=None):
-    return list(STATIC_GRAPH.subgraph(land_nodes or range(NUM_NODES)).edges())
+    """Same as get_edge_ids, but as (a, b) node pairs"""
+    return [EDGES[edge_id] for edge_id in get_edge_ids(land_nodes)]
 
 
 class Board:
@@ -42,34 +84,49 @@ class Board:
     Attributes:
         buildings (Dict[NodeId, Tuple[Color, FastBuildingType]]): Mapping from
             node id to building (if there is a building there).
-        roads (Dict[EdgeId, Color]): Mapping from edge
-            to Color (if there is a road there). Contains inverted
-            edges as well for ease of querying.
-        connected_components (Dict[Color, List[Set[NodeId]]]): Cache
-            datastructure to speed up maintaining longest road computation.
-            To be queried by Color. Value is a list of node sets.
-        board_buildable_ids (Set[NodeId]): Cache of buildable node ids in board.
+        roads (List[Color]): Color of the road on each edge, by edge id
+            (None if there is no road there). See topology.py.
+        component_masks (Dict[Color, List[int]]): Connected components of
+            each color's roads, as bitmasks of their nodes (see topology.py).
+            Nodes are incidental (might not be owned by the player).
+        component_index (Dict[Color, Dict[NodeId, int]]): node id => index
+            in component_masks of the first component that has the node.
+            Both are replaced (never mutated) on builds, so copies share them.
+        board_buildable_mask (int): Bitmask of the nodes where the distance
+            rule allows a settlement (see topology.py for bitmasks).
+        reachable_masks (Dict[Color, int]): Bitmask of the nodes in any of
+            the color's connected components.
+        buildable_edge_masks (Dict[Color, int]): Bitmask of the land edges
+            without a road that touch a node reachable by the color.
         road_color (Color): Color of player with longest road.
         road_length (int): Number of roads of longest road
         robber_coordinate (Coordinate): Coordinate where robber is.
+        payout_table (Dict[int, Tuple[Dict[Color, Tuple], Tuple]]): Cache of
+            dice number => (color => freqdeck, total freqdeck) that number
+            yields to the buildings on the board (ignoring robber and bank).
+            Updated on builds; replaced (never mutated) so copies can share it.
+        tensor_cache (Any): Slot for catanatron_gym's board tensor cache.
+            Shared with copies (the cache syncs itself to the board it's
+            asked about).
     """
 
     def __init__(self, catan_map=None, initialize=True):
-        self.buildable_subgraph: Any = None
-        self.buildable_edges_cache = {}
         self.player_port_resources_cache = {}
+        self.payout_table = {}
+        self.tensor_cache = None
         if initialize:
             self.map: CatanMap = catan_map or CatanMap.from_template(
                 BASE_MAP_TEMPLATE
             )  # Static State (no need to copy)
 
             self.buildings: Dict[NodeId, Tuple[Color, FastBuildingType]] = dict()
-            self.roads = dict()  # (node_id, node_id) => color
+            self.roads = [None] * NUM_GRAPH_EDGES  # edge_id => color
 
-            # color => int{}[] (list of node_id sets) one per component
-            #   nodes in sets are incidental (might not be owned by player)
-            self.connected_components: Any = defaultdict(list)
-            self.board_buildable_ids = set(self.map.land_nodes)
+            self.component_masks: Dict[Color, List[int]] = defaultdict(list)
+            self.component_index: Dict[Color, Dict[NodeId, int]] = defaultdict(dict)
+            self.board_buildable_mask = ids_to_mask(self.map.land_nodes)
+            self.reachable_masks = defaultdict(int)
+            self.buildable_edge_masks = defaultdict(int)
             self.road_lengths = defaultdict(int)
             self.road_color = None
             self.road_length = 0
@@ -80,9 +137,6 @@ class Board:
                 self.map.land_tiles.keys(),
             ).__next__()
 
-            # Cache buildable subgraph
-            self.buildable_subgraph = STATIC_GRAPH.subgraph(self.map.land_nodes)
-
     def build_settlement(self, color, node_id, initial_build_phase=False):
         """Adds a settlement, and ensures is a valid place to build.
 
@@ -93,10 +147,10 @@ class Board:
                 Whether this is part of initial building phase, so as to skip
                 connectedness validation. Defaults to True.
         """
-        buildable = self.buildable_node_ids(
-            color, initial_build_phase=initial_build_phase
-        )
-        if node_id not in buildable:
+        buildable_mask = self.board_buildable_mask
+        if not initial_build_phase:
+            buildable_mask &= self.reachable_masks[color]
+        if not (buildable_mask >> node_id) & 1:
             raise ValueError(
                 "Invalid Settlement Placement: not connected and not initial-placement"
             )
@@ -105,23 +159,28 @@ class Board:
             raise ValueError("Invalid Settlement Placement: a building exists there")
 
         self.buildings[node_id] = (color, SETTLEMENT)
+        self.update_payout_table(node_id)
 
         previous_road_color = self.road_color
         if initial_build_phase:
-            self.connected_components[color].append({node_id})
+            component_masks = self.component_masks[color]
+            component_index = self.component_index[color].copy()
+            component_index.setdefault(node_id, len(component_masks))
+            self.component_masks[color] = component_masks + [1 << node_id]
+            self.component_index[color] = component_index
+            self._add_reachable_node(color, node_id)
         else:
             # Maybe cut connected components.
-            edges_by_color = defaultdict(list)
-            for edge in STATIC_GRAPH.edges(node_id):
-                edges_by_color[self.roads.get(edge, None)].append(edge)
+            neighbors_by_color = defaultdict(list)
+            for neighbor_id, edge_id in topology.INCIDENT_EDGES[node_id]:
+                neighbors_by_color[self.roads[edge_id]].append(neighbor_id)
 
-            for edge_color, edges in edges_by_color.items():
+            for edge_color, neighbor_ids in neighbors_by_color.items():
                 if edge_color == color or edge_color is None:
                     continue  # ignore
-                if len(edges) == 2:  # rip, edge_color has been plowed
+                if len(neighbor_ids) == 2:  # rip, edge_color has been plowed
                     # consider cut was at b=node_id for edges (a, b) and (b, c)
-                    a = [n for n in edges[0] if n != node_id].pop()
-                    c = [n for n in edges[1] if n != node_id].pop()
+                    a, c = neighbor_ids
 
                     # do dfs from a adding all encountered nodes
                     a_nodeset = self.dfs_walk(a, edge_color)
@@ -129,26 +188,26 @@ class Board:
 
                     # split this components on here.
                     b_index = self._get_connected_component_index(node_id, edge_color)
-                    del self.connected_components[edge_color][b_index]
-                    self.connected_components[edge_color].append(a_nodeset)
-                    self.connected_components[edge_color].append(c_nodeset)
+                    component_masks = self.component_masks[edge_color].copy()
+                    del component_masks[b_index]
+                    component_masks.append(ids_to_mask(a_nodeset))
+                    component_masks.append(ids_to_mask(c_nodeset))
+                    self._set_components(edge_color, component_masks)
+                    self._update_reachable_masks(edge_color)
 
                     # Update longest road by plowed player. Compare again with all
                     self.road_lengths[edge_color] = max(
                         *[
-                            len(longest_acyclic_path(self, component, edge_color))
-                            for component in self.connected_components[edge_color]
+                            longest_road_length(self, mask_to_ids(mask), edge_color)
+                            for mask in component_masks
                         ]
                     )
                     self.road_color, self.road_length = max(
                         self.road_lengths.items(), key=lambda e: e[1]
                     )
 
-        self.board_buildable_ids.discard(node_id)
-        for n in STATIC_GRAPH.neighbors(node_id):
-            self.board_buildable_ids.discard(n)
+        self.board_buildable_mask &= ~((1 << node_id) | NEIGHBOR_MASKS[node_id])
 
-        self.buildable_edges_cache = {}  # Reset buildable_edges
         self.player_port_resources_cache = {}  # Reset port resources
         return previous_road_color, self.road_color, self.road_lengths
 
@@ -173,99 +232,141 @@ class Board:
             if self.is_enemy_node(n, color):
                 continue  # end of the road
 
-            neighbors = [v for v in STATIC_GRAPH.neighbors(n) if v not in visited]
-            expandable = [v for v in neighbors if self.roads.get((n, v), None) == color]
+            expandable = [
+                v
+                for v, edge_id in topology.INCIDENT_EDGES[n]
+                if v not in visited and self.roads[edge_id] == color
+            ]
             agenda.extend(expandable)
 
         return visited
 
     def _get_connected_component_index(self, node_id, color):
-        for i, component in enumerate(self.connected_components[color]):
-            if node_id in component:
-                return i
-
-    def build_road(self, color, edge):
-        buildable = self.buildable_edges(color)
-        inverted_edge = (edge[1], edge[0])
-        if edge not in buildable and inverted_edge not in buildable:
+        return self.component_index[color].get(node_id)
+
+    def _set_components(self, color, component_masks):
+        """Replaces the components of color (and rebuilds their index)"""
+        component_index = dict()
+        for i, mask in enumerate(component_masks):
+            for node_id in mask_to_ids(mask):
+                component_index.setdefault(node_id, i)
+        self.component_masks[color] = component_masks
+        self.component_index[color] = component_index
+
+    def _add_reachable_node(self, color, node_id):
+        """Adds node_id (just added to a component of color) to its masks"""
+        self.reachable_masks[color] |= 1 << node_id
+        land_incident_edges = topology.get_land_incident_edges(self.map.land_nodes)
+        edge_mask = self.buildable_edge_masks[color]
+        for edge_id in land_incident_edges.get(node_id, ()):
+            if self.roads[edge_id] is None:
+                edge_mask |= 1 << edge_id
+        self.buildable_edge_masks[color] = edge_mask
+
+    def _update_reachable_masks(self, color):
+        """Recomputes the masks of color from its connected components"""
+        reachable_mask = 0
+        for mask in self.component_masks[color]:
+            reachable_mask |= mask
+        self.reachable_masks[color] = 0
+        self.buildable_edge_masks[color] = 0
+        for node_id in mask_to_ids(reachable_mask):
+            self._add_reachable_node(color, node_id)
+
+    def build_road(self, color, edge_id):
+        edge_bit = 1 << edge_id
+        if not self.buildable_edge_masks[color] & edge_bit:
             raise ValueError("Invalid Road Placement")
 
-        self.roads[edge] = color
-        self.roads[inverted_edge] = color
+        self.roads[edge_id] = color
+        for edge_color in self.buildable_edge_masks:
+            self.buildable_edge_masks[edge_color] &= ~edge_bit
 
         # Find connected components corresponding to edge nodes (buildings).
-        a, b = edge
+        a, b = EDGES[edge_id]
         a_index = self._get_connected_component_index(a, color)
         b_index = self._get_connected_component_index(b, color)
 
         # Extend or merge components
+        component_masks = self.component_masks[color]
         if a_index is None and not self.is_enemy_node(a, color):
-            component = self.connected_components[color][b_index]
-            component.add(a)
+            component = self._extend_component(color, b_index, a)
         elif b_index is None and not self.is_enemy_node(b, color):
-            component = self.connected_components[color][a_index]
-            component.add(b)
+            component = self._extend_component(color, a_index, b)
         elif a_index is not None and b_index is not None and a_index != b_index:
             # Merge both components into one and delete the other.
-            component = set.union(
-                self.connected_components[color][a_index],
-                self.connected_components[color][b_index],
-            )
-            self.connected_components[color][a_index] = component
-            del self.connected_components[color][b_index]
+            component = component_masks[a_index] | component_masks[b_index]
+            component_masks = component_masks.copy()
+            component_masks[a_index] = component
+            del component_masks[b_index]
+            self._set_components(color, component_masks)
         else:
             # In this case, a_index == b_index, which means that the edge
             # is already part of one component. No actions needed.
             chosen_index = a_index if a_index is not None else b_index
-            component = self.connected_components[color][chosen_index]
+            component = component_masks[chosen_index]
 
         # find longest path on component under question
         previous_road_color = self.road_color
-        candidate_length = len(longest_acyclic_path(self, component, color))
+        candidate_length = longest_road_length(self, mask_to_ids(component), color)
         self.road_lengths[color] = max(self.road_lengths[color], candidate_length)
         if candidate_length >= 5 and candidate_length > self.road_length:
             self.road_color = color
             self.road_length = candidate_length
 
-        self.buildable_edges_cache = {}  # Reset buildable_edges
         return previous_road_color, self.road_color, self.road_lengths
 
+    def _extend_component(self, color, index, node_id):
+        """Adds node_id (in no component yet) to the index-th component"""
+        component_masks = self.component_masks[color].copy()
+        component_masks[index] |= 1 << node_id
+        component_index = self.component_index[color].copy()
+        component_index[node_id] = index
+        self.component_masks[color] = component_masks
+        self.component_index[color] = component_index
+        self._add_reachable_node(color, node_id)
+        return component_masks[index]
+
     def build_city(self, color, node_id):
         building = self.buildings.get(node_id, None)
         if building is None or building[0] != color or building[1] != SETTLEMENT:
             raise ValueError("Invalid City Placement: no player settlement there")
 
         self.buildings[node_id] = (color, CITY)
+        self.update_payout_table(node_id)
+
+    def update_payout_table(self, node_id):
+        """Recomputes the payout_table entries of the numbers around node_id"""
+        payout_table = self.payout_table.copy()
+        for tile in self.map.adjacent_tiles[node_id]:
+            if tile.resource is not None:
+                payout_table[tile.number] = self._compute_payouts(tile.number)
+        self.payout_table = payout_table
+
+    def _compute_payouts(self, number):
+        payouts = dict()
+        totals = [0, 0, 0, 0, 0]
+        for node_id, resource in self.map.number_yields[number]:
+            building = self.buildings.get(node_id, None)
+            if building is None:
+                continue
+            freqdeck = payouts.setdefault(building[0], [0, 0, 0, 0, 0])
+            amount = 1 if building[1] == SETTLEMENT else 2
+            freqdeck[RESOURCE_FREQDECK_INDEXES[resource]] += amount
+            totals[RESOURCE_FREQDECK_INDEXES[resource]] += amount
+        payouts = {color: tuple(freqdeck) for color, freqdeck in payouts.items()}
+        return payouts, tuple(totals)
 
     def buildable_node_ids(self, color: Color, initial_build_phase=False):
-        if initial_build_phase:
-            return sorted(list(self.board_buildable_ids))
-
-        subgraphs = self.find_connected_components(color)
-        nodes = set().union(*subgraphs)
-        return sorted(list(nodes.intersection(self.board_buildable_ids)))
+        """Sorted list of node ids where color can build a settlement"""
+        mask = self.board_buildable_mask
+        if not initial_build_phase:
+            mask &= self.reachable_masks[color]
+        return list(mask_to_ids(mask))
 
     def buildable_edges(self, color: Color):
-        """List of (n1,n2) tuples. Edges are in n1 < n2 order."""
-        if color in self.buildable_edges_cache:
-            return self.buildable_edges_cache[color]
-
-        expandable = set()
-
-        # All nodes for this color.
-        # TODO(tonypr): Explore caching for 'expandable_nodes'?
-        # The 'expandable_nodes' set should only increase in size monotonically I think.
-        # We can take advantage of that.
-        expandable_nodes = set()
-        expandable_nodes = expandable_nodes.union(*self.connected_components[color])
-
-        candidate_edges = self.buildable_subgraph.edges(expandable_nodes)
-        for edge in candidate_edges:
-            if self.get_edge_color(edge) is None:
-                expandable.add(tuple(sorted(edge)))
-
-        self.buildable_edges_cache[color] = list(expandable)
-        return self.buildable_edges_cache[color]
+        """Sorted list of edge ids where color can build a road"""
+        return list(mask_to_ids(self.buildable_edge_masks[color]))
 
     def get_player_port_resources(self, color):
         """Yields resources (None for 3:1) of ports owned by color"""
@@ -283,11 +384,11 @@ class Board:
     def find_connected_components(self, color: Color):
         """
         Returns:
-            nx.Graph[]: connected subgraphs. subgraphs
+            Set[NodeId][]: node sets of connected subgraphs. subgraphs
                 might include nodes that color doesnt own (on the way and on ends),
                 just to make it is "closed" and easier for buildable_nodes to operate.
         """
-        return self.connected_components[color]
+        return [set(mask_to_ids(mask)) for mask in self.component_masks[color]]
 
     def continuous_roads_by_player(self, color: Color):
         paths = []
@@ -301,20 +402,20 @@ class Board:
         board.map = self.map  # reuse since its immutable
         board.buildings = self.buildings.copy()
         board.roads = self.roads.copy()
-        board.connected_components = pickle.loads(
-            pickle.dumps(self.connected_components)
-        )
-        board.board_buildable_ids = self.board_buildable_ids.copy()
+        board.component_masks = self.component_masks.copy()
+        board.component_index = self.component_index.copy()
+        board.board_buildable_mask = self.board_buildable_mask
+        board.reachable_masks = self.reachable_masks.copy()
+        board.buildable_edge_masks = self.buildable_edge_masks.copy()
         board.road_lengths = self.road_lengths.copy()
         board.road_color = self.road_color
         board.road_length = self.road_length
 
         board.robber_coordinate = self.robber_coordinate
-        board.buildable_subgraph = self.buildable_subgraph
-        board.buildable_edges_cache = copy.deepcopy(self.buildable_edges_cache)
-        board.player_port_resources_cache = copy.deepcopy(
-            self.player_port_resources_cache
-        )
+        board.payout_table = self.payout_table
+        board.tensor_cache = self.tensor_cache
+        # port resource sets are replaced (never mutated), so can be shared
+        board.player_port_resources_cache = self.player_port_resources_cache.copy()
         return board
 
     # ===== Helper functions
@@ -325,26 +426,22 @@ class Board:
         except KeyError:
             return None
 
-    def get_edge_color(self, edge):
-        # using try-except instead of .get for performance
-        try:
-            return self.roads[edge]
-        except KeyError:
-            return None
+    def get_edge_color(self, edge_id):
+        return self.roads[edge_id]
 
     def is_enemy_node(self, node_id, color):
         node_color = self.get_node_color(node_id)
         return node_color is not None and node_color != color
 
-    def is_enemy_road(self, edge, color):
-        edge_color = self.get_edge_color(edge)
-        return edge_color is not None and self.get_edge_color(edge) != color
+    def is_enemy_road(self, edge_id, color):
+        edge_color = self.roads[edge_id]
+        return edge_color is not None and edge_color != color
 
     def is_friendly_node(self, node_id, color):
         return self.get_node_color(node_id) == color
 
-    def is_friendly_road(self, edge, color):
-        return self.get_edge_color(edge) == color
+    def is_friendly_road(self, edge_id, color):
+        return self.roads[edge_id] == color
 
 
 def longest_acyclic_path(board: Board, node_set: Set[int], color: Color):
@@ -357,19 +454,17 @@ def longest_acyclic_path(board: Board, node_set: Set[int], color: Color):
             node, path_thus_far = agenda.pop()
 
             able_to_navigate = False
-            for neighbor_node in STATIC_GRAPH.neighbors(node):
-                edge = tuple(sorted((node, neighbor_node)))
-
+            for neighbor_node, edge_id in topology.INCIDENT_EDGES[node]:
                 # Must travel on a friendly road.
-                if not board.is_friendly_road(edge, color):
+                if not board.is_friendly_road(edge_id, color):
                     continue
 
                 # Can't expand past an enemy node.
                 if board.is_enemy_node(neighbor_node, color):
                     continue
 
-                if edge not in path_thus_far:
-                    agenda.append((neighbor_node, path_thus_far + [edge]))
+                if edge_id not in path_thus_far:
+                    agenda.append((neighbor_node, path_thus_far + [edge_id]))
                     able_to_navigate = True
 
             if not able_to_navigate:  # then it is leaf node
@@ -378,3 +473,63 @@ def longest_acyclic_path(board: Board, node_set: Set[int], color: Color):
         paths.extend(paths_from_this_node)
 
     return max(paths, key=len)
+
+
+def longest_road_length(board: Board, node_set: Set[int], color: Color) -> int:
+    """Same as len(longest_acyclic_path(board, node_set, color)), but encodes
+    the component as bitmasks and memoizes on them (see _longest_trail_length),
+    so only components whose roads or blockers changed get recomputed.
+    """
+    edges_mask = 0
+    start_mask = 0
+    enemy_mask = 0
+    for node in node_set:
+        start_mask |= 1 << node
+        if board.is_enemy_node(node, color):
+            enemy_mask |= 1 << node
+
+    # Collect the friendly roads that can be walked from node_set.
+    agenda = list(node_set)
+    visited = set(node_set)
+    while len(agenda) > 0:
+        node = agenda.pop()
+        for neighbor, edge_id, bit in INCIDENT_EDGES[node]:
+            if board.roads[edge_id] != color:
+                continue
+            if board.is_enemy_node(neighbor, color):
+                continue  # can't expand past an enemy node
+            edges_mask |= bit
+            if neighbor not in visited:
+                visited.add(neighbor)
+                agenda.append(neighbor)
+
+    return _longest_trail_length(edges_mask, start_mask, enemy_mask)
+
+
+@functools.lru_cache(maxsize=4096)
+def _longest_trail_length(edges_mask: int, start_mask: int, enemy_mask: int):
+    """Length of longest trail (path not repeating edges) using edges in
+    edges_mask, starting at a node in start_mask and never entering a node
+    in enemy_mask. Depth-first search memoized on (node, used edges)."""
+    memo: Dict[Tuple[int, int], int] = dict()
+
+    def walk(node, used):
+        key = (node, used)
+        if key in memo:
+            return memo[key]
+
+        best = 0
+        for neighbor, _, bit in INCIDENT_EDGES[node]:
+            if not edges_mask & bit or used & bit or enemy_mask >> neighbor & 1:
+                continue
+            length = 1 + walk(neighbor, used | bit)
+            if length > best:
+                best = length
+        memo[key] = best
+        return best
+
+    best = 0
+    for node in INCIDENT_EDGES:
+        if start_mask >> node & 1:
+            best = max(best, walk(node, 0))
+    return best
@@ -21,8 +21,9 @@ NUM_EDGES = 72
 NUM_TILES = 19
 
 
-EdgeId = Tuple[int, int]
 NodeId = int
+EdgeId = int  # see topology.py
+Edge = Tuple[NodeId, NodeId]
 Coordinate = Tuple[int, int, int]
 
 
@@ -32,7 +33,7 @@ class LandTile:
     resource: Union[FastResource, None]  # None means desert tile
     number: Union[int, None]  # None if desert
     nodes: Dict[NodeRef, NodeId]  # node_ref => node_id
-    edges: Dict[EdgeRef, EdgeId]  # edge_ref => edge
+    edges: Dict[EdgeRef, Edge]  # edge_ref => edge
 
     # The id is unique among the tiles, so we can use it as the hash.
     def __hash__(self):
@@ -45,7 +46,7 @@ class Port:
     resource: Union[FastResource, None]  # None means desert tile
     direction: Direction
     nodes: Dict[NodeRef, NodeId]  # node_ref => node_id
-    edges: Dict[EdgeRef, EdgeId]  # edge_ref => edge
+    edges: Dict[EdgeRef, Edge]  # edge_ref => edge
 
     # The id is unique among the tiles, so we can use it as the hash.
     def __hash__(self):
@@ -55,7 +56,7 @@ class Port:
 @dataclass(frozen=True)
 class Water:
     nodes: Dict[NodeRef, int]
-    edges: Dict[EdgeRef, EdgeId]
+    edges: Dict[EdgeRef, Edge]
 
 
 Tile = Union[LandTile, Port, Water]
@@ -205,6 +206,7 @@ class CatanMap:
         node_production: Dict[NodeId, Counter] = dict(),
         tiles_by_id: Dict[int, LandTile] = dict(),
         ports_by_id: Dict[int, Port] = dict(),
+        number_yields: Dict[int, List[Tuple[NodeId, FastResource]]] = dict(),
     ):
         self.tiles = tiles
         self.land_tiles = land_tiles
@@ -214,6 +216,7 @@ class CatanMap:
         self.node_production = node_production
         self.tiles_by_id = tiles_by_id
         self.ports_by_id = ports_by_id
+        self.number_yields = number_yields
 
     @staticmethod
     def from_template(map_template: MapTemplate):
@@ -243,6 +246,7 @@ class CatanMap:
             t.id: t for t in self.tiles.values() if isinstance(t, LandTile)
         }
         self.ports_by_id = {p.id: p for p in self.tiles.values() if isinstance(p, Port)}
+        self.number_yields = init_number_yields(self.land_tiles)
 
         return self
 
@@ -280,6 +284,20 @@ def init_adjacent_tiles(
     return adjacent_tiles
 
 
+def init_number_yields(
+    land_tiles: Dict[Coordinate, LandTile]
+) -> Dict[int, List[Tuple[NodeId, FastResource]]]:
+    """Returns dice number => [(node_id, resource), ...] of every tile with
+    that number. A node appears once per tile it touches."""
+    number_yields = defaultdict(list)
+    for tile in land_tiles.values():
+        if tile.resource is None:
+            continue  # desert
+        for node_id in tile.nodes.values():
+            number_yields[tile.number].append((node_id, tile.resource))
+    return dict(number_yields)
+
+
 def init_node_production(
     adjacent_tiles: Dict[int, List[LandTile]]
 ) -> Dict[NodeId, Counter]:
@@ -449,7 +467,7 @@ def get_nodes_and_edges(tiles, coordinate: Coordinate, node_autoinc):
 
     return (
         typing.cast(Dict[NodeRef, NodeId], nodes),
-        typing.cast(Dict[EdgeRef, EdgeId], edges),
+        typing.cast(Dict[EdgeRef, Edge], edges),
         node_autoinc,
     )
 
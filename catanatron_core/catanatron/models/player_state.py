@@ -0,0 +1,139 @@
+"""
+Per-player records. Each seat has a fixed-size list of values (its record),
+indexed by the PlayerField constants. State.player_records holds one
+record per seat and is the source of truth; State.player_state is a
+dict-like view over them with the historical "P<seat>_<FIELD>" keys.
+"""
+import functools
+from collections.abc import MutableMapping
+
+from catanatron.models.enums import DEVELOPMENT_CARDS, RESOURCES
+
+# These will be prefixed by P0_, P1_, ... in the player_state view.
+# Create Player State blueprint
+PLAYER_INITIAL_STATE = {
+    "VICTORY_POINTS": 0,
+    "ROADS_AVAILABLE": 15,
+    "SETTLEMENTS_AVAILABLE": 5,
+    "CITIES_AVAILABLE": 4,
+    "HAS_ROAD": False,
+    "HAS_ARMY": False,
+    "HAS_ROLLED": False,
+    "HAS_PLAYED_DEVELOPMENT_CARD_IN_TURN": False,
+    # de-normalized features (for performance since we think they are good features)
+    "ACTUAL_VICTORY_POINTS": 0,
+    "LONGEST_ROAD_LENGTH": 0,
+}
+for resource in RESOURCES:
+    PLAYER_INITIAL_STATE[f"{resource}_IN_HAND"] = 0
+for dev_card in DEVELOPMENT_CARDS:
+    PLAYER_INITIAL_STATE[f"{dev_card}_IN_HAND"] = 0
+    PLAYER_INITIAL_STATE[f"PLAYED_{dev_card}"] = 0
+
+PLAYER_FIELDS = tuple(PLAYER_INITIAL_STATE.keys())
+NUM_PLAYER_FIELDS = len(PLAYER_FIELDS)
+
+
+class PlayerField:
+    """Position of each field in a player record. Plain ints (instead of an
+    Enum) since these are read in the hottest paths of the engine."""
+
+    VICTORY_POINTS = PLAYER_FIELDS.index("VICTORY_POINTS")
+    ROADS_AVAILABLE = PLAYER_FIELDS.index("ROADS_AVAILABLE")
+    SETTLEMENTS_AVAILABLE = PLAYER_FIELDS.index("SETTLEMENTS_AVAILABLE")
+    CITIES_AVAILABLE = PLAYER_FIELDS.index("CITIES_AVAILABLE")
+    HAS_ROAD = PLAYER_FIELDS.index("HAS_ROAD")
+    HAS_ARMY = PLAYER_FIELDS.index("HAS_ARMY")
+    HAS_ROLLED = PLAYER_FIELDS.index("HAS_ROLLED")
+    HAS_PLAYED_DEVELOPMENT_CARD_IN_TURN = PLAYER_FIELDS.index(
+        "HAS_PLAYED_DEVELOPMENT_CARD_IN_TURN"
+    )
+    ACTUAL_VICTORY_POINTS = PLAYER_FIELDS.index("ACTUAL_VICTORY_POINTS")
+    LONGEST_ROAD_LENGTH = PLAYER_FIELDS.index("LONGEST_ROAD_LENGTH")
+
+    WOOD_IN_HAND = PLAYER_FIELDS.index("WOOD_IN_HAND")
+    BRICK_IN_HAND = PLAYER_FIELDS.index("BRICK_IN_HAND")
+    SHEEP_IN_HAND = PLAYER_FIELDS.index("SHEEP_IN_HAND")
+    WHEAT_IN_HAND = PLAYER_FIELDS.index("WHEAT_IN_HAND")
+    ORE_IN_HAND = PLAYER_FIELDS.index("ORE_IN_HAND")
+
+    KNIGHT_IN_HAND = PLAYER_FIELDS.index("KNIGHT_IN_HAND")
+    YEAR_OF_PLENTY_IN_HAND = PLAYER_FIELDS.index("YEAR_OF_PLENTY_IN_HAND")
+    MONOPOLY_IN_HAND = PLAYER_FIELDS.index("MONOPOLY_IN_HAND")
+    ROAD_BUILDING_IN_HAND = PLAYER_FIELDS.index("ROAD_BUILDING_IN_HAND")
+    VICTORY_POINT_IN_HAND = PLAYER_FIELDS.index("VICTORY_POINT_IN_HAND")
+
+    PLAYED_KNIGHT = PLAYER_FIELDS.index("PLAYED_KNIGHT")
+    PLAYED_YEAR_OF_PLENTY = PLAYER_FIELDS.index("PLAYED_YEAR_OF_PLENTY")
+    PLAYED_MONOPOLY = PLAYER_FIELDS.index("PLAYED_MONOPOLY")
+    PLAYED_ROAD_BUILDING = PLAYER_FIELDS.index("PLAYED_ROAD_BUILDING")
+
+
+# Resource hand fields are contiguous (in RESOURCES order), so that
+# record[HAND_START:HAND_END] is the player's freqdeck.
+HAND_START = PlayerField.WOOD_IN_HAND
+HAND_END = HAND_START + len(RESOURCES)
+assert PLAYER_FIELDS[HAND_START:HAND_END] == tuple(f"{r}_IN_HAND" for r in RESOURCES)
+
+# Lookups for fields parametrized by card (e.g. f"{card}_IN_HAND")
+IN_HAND_FIELDS = {
+    card: PLAYER_FIELDS.index(f"{card}_IN_HAND")
+    for card in [*RESOURCES, *DEVELOPMENT_CARDS]
+}
+PLAYED_FIELDS = {
+    dev_card: PLAYER_FIELDS.index(f"PLAYED_{dev_card}")
+    for dev_card in DEVELOPMENT_CARDS
+}
+
+
+def initial_player_records(num_players):
+    return [list(PLAYER_INITIAL_STATE.values()) for _ in range(num_players)]
+
+
+@functools.lru_cache(maxsize=None)
+def get_player_state_index(num_players):
+    """Maps keys like 'P1_WOOD_IN_HAND' to (seat, field) pairs."""
+    return {
+        f"P{seat}_{name}": (seat, field)
+        for seat in range(num_players)
+        for field, name in enumerate(PLAYER_FIELDS)
+    }
+
+
+class PlayerStateView(MutableMapping):
+    """Dict-like view over a list of player records, keyed like
+    { P0_HAS_ROAD: False, P1_SETTLEMENTS_AVAILABLE: 18, ... }.
+
+    Reads and writes go straight to the records. Keys are fixed, so keys
+    can't be added nor deleted.
+    """
+
+    __slots__ = ("records", "index")
+
+    def __init__(self, records):
+        self.records = records
+        self.index = get_player_state_index(len(records))
+
+    def __getitem__(self, key):
+        seat, field = self.index[key]
+        return self.records[seat][field]
+
+    def __setitem__(self, key, value):
+        seat, field = self.index[key]
+        self.records[seat][field] = value
+
+    def __delitem__(self, key):
+        raise TypeError("player_state keys can't be deleted")
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def copy(self):
+        """Returns a plain dict snapshot"""
+        return dict(self.items())
+
+    def __repr__(self):
+        return repr(self.copy())
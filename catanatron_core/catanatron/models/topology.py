@@ -0,0 +1,164 @@
+"""
+Static topology of the board graph (which nodes and edges touch which), as
+plain tuples built once at import time.
+
+The engine and feature hot paths use these tables instead of networkx graphs;
+networkx (see board.get_static_graph) is only needed for offline tooling.
+Nodes' neighbors are listed in the same order networkx lists them.
+
+Edges are identified by an integer id (the canonical representation of an
+edge in the engine: roads, road actions, action space). The land edges of
+the base map come first (ids 0..NUM_EDGES-1 = 0..71, in the order networkx lists them, which
+is the order of board.get_edges), followed by the edges touching water.
+EDGES and EDGE_IDS convert between ids and (a, b) node pairs, which is how
+edges are shown to humans (JSON, UI, feature names).
+
+Sets of node or edge ids are also kept as int bitmasks (bit i set for id i):
+land nodes fit in 54 bits and the base map's land edges in 72.
+"""
+import functools
+from typing import Dict, FrozenSet, Tuple
+
+from catanatron.models.map import (
+    BASE_MAP_TEMPLATE,
+    NUM_NODES,
+    CatanMap,
+    Edge,
+    EdgeId,
+    NodeId,
+)
+
+
+def _build_adjacency():
+    """node_id => {neighbor_id: None}, inserted like networkx.Graph would"""
+    adjacency: Dict[NodeId, Dict[NodeId, None]] = dict()
+    for tile in CatanMap.from_template(BASE_MAP_TEMPLATE).tiles.values():
+        for node_id in tile.nodes.values():
+            adjacency.setdefault(node_id, dict())
+        for a, b in tile.edges.values():
+            adjacency.setdefault(a, dict())[b] = None
+            adjacency.setdefault(b, dict())[a] = None
+    return adjacency
+
+
+def _build_edges(adjacency):
+    """(a, b) endpoints of all edges, land edges of the base map first"""
+    edges = []
+    seen = set()
+    for node_id, neighbors in adjacency.items():
+        for neighbor_id in neighbors:
+            if neighbor_id not in seen:
+                edges.append((node_id, neighbor_id))
+        seen.add(node_id)
+    assert all(a < b for a, b in edges)
+    is_land = [a < NUM_NODES and b < NUM_NODES for a, b in edges]
+    return [e for e, land in zip(edges, is_land) if land] + [
+        e for e, land in zip(edges, is_land) if not land
+    ]
+
+
+_adjacency = _build_adjacency()
+NUM_GRAPH_NODES = len(_adjacency)
+assert sorted(_adjacency) == list(range(NUM_GRAPH_NODES))
+
+# edge id => (a, b) endpoints, with a < b
+EDGES: Tuple[Edge, ...] = tuple(_build_edges(_adjacency))
+NUM_GRAPH_EDGES = len(EDGES)
+# (a, b) edge, in any orientation => edge id
+EDGE_IDS: Dict[Edge, EdgeId] = dict()
+for _i, (_a, _b) in enumerate(EDGES):
+    EDGE_IDS[(_a, _b)] = EDGE_IDS[(_b, _a)] = _i
+
+# node_id => (neighbor_id, ...)
+NEIGHBORS: Tuple[Tuple[NodeId, ...], ...] = tuple(
+    tuple(_adjacency[node_id]) for node_id in range(NUM_GRAPH_NODES)
+)
+# node_id => ((neighbor_id, edge id), ...), aligned with NEIGHBORS
+INCIDENT_EDGES: Tuple[Tuple[Tuple[NodeId, EdgeId], ...], ...] = tuple(
+    tuple((neighbor_id, EDGE_IDS[(node_id, neighbor_id)]) for neighbor_id in n)
+    for node_id, n in enumerate(NEIGHBORS)
+)
+# node_id => bitmask of its neighbors
+NEIGHBOR_MASKS: Tuple[int, ...] = tuple(
+    sum(1 << neighbor_id for neighbor_id in n) for n in NEIGHBORS
+)
+# node_id => bitmask of its edges
+INCIDENT_EDGE_MASKS: Tuple[int, ...] = tuple(
+    sum(1 << edge_id for _, edge_id in incident_edges)
+    for incident_edges in INCIDENT_EDGES
+)
+
+
+@functools.lru_cache(maxsize=1 << 16)  # the same masks come up over and over
+def mask_to_ids(mask: int) -> Tuple[int, ...]:
+    """Ids whose bits are set in mask, in increasing order"""
+    ids = []
+    while mask:
+        low_bit = mask & -mask
+        ids.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return tuple(ids)
+
+
+def ids_to_mask(ids) -> int:
+    mask = 0
+    for i in ids:
+        mask |= 1 << i
+    return mask
+
+
+@functools.lru_cache(maxsize=8)
+def get_land_edges(land_nodes: FrozenSet[NodeId]) -> Tuple[EdgeId, ...]:
+    """Ids of the edges between land_nodes (a map's land), in order"""
+    return tuple(
+        i for i, (a, b) in enumerate(EDGES) if a in land_nodes and b in land_nodes
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def get_land_incident_edges(
+    land_nodes: FrozenSet[NodeId],
+) -> Dict[NodeId, Tuple[EdgeId, ...]]:
+    """node_id => ids of its edges to other land_nodes (land nodes only)"""
+    return {
+        node_id: tuple(
+            edge
+            for neighbor_id, edge in INCIDENT_EDGES[node_id]
+            if neighbor_id in land_nodes
+        )
+        for node_id in land_nodes
+    }
+
+
+def bfs_distances(source: NodeId) -> Dict[NodeId, int]:
+    """node_id => number of edges in the shortest path from source"""
+    distances = {source: 0}
+    frontier = [source]
+    while len(frontier) > 0:
+        next_frontier = []
+        for node_id in frontier:
+            for neighbor_id in NEIGHBORS[node_id]:
+                if neighbor_id not in distances:
+                    distances[neighbor_id] = distances[node_id] + 1
+                    next_frontier.append(neighbor_id)
+        frontier = next_frontier
+    return distances
+
+
+def shortest_path(source: NodeId, target: NodeId):
+    """List of nodes of a shortest path from source to target"""
+    parents = {source: None}
+    frontier = [source]
+    while target not in parents:
+        next_frontier = []
+        for node_id in frontier:
+            for neighbor_id in NEIGHBORS[node_id]:
+                if neighbor_id not in parents:
+                    parents[neighbor_id] = node_id
+                    next_frontier.append(neighbor_id)
+        frontier = next_frontier
+
+    path = [target]
+    while path[-1] != source:
+        path.append(parents[path[-1]])
+    return path[::-1]
@@ -1,7 +1,7 @@
 import random
 
 from catanatron.state_functions import (
-    player_key,
+    get_actual_victory_points,
 )
 from catanatron.models.player import Player
 from catanatron.game import Game
@@ -21,11 +21,10 @@ class VictoryPointPlayer(Player):
         best_value = float("-inf")
         best_actions = []
         for action in playable_actions:
-            game_copy = game.copy()
+            game_copy = game.fork()
             game_copy.execute(action)
 
-            key = player_key(game_copy.state, self.color)
-            value = game_copy.state.player_state[f"{key}_ACTUAL_VICTORY_POINTS"]
+            value = get_actual_victory_points(game_copy.state, self.color)
             if value == best_value:
                 best_actions.append(action)
             if value > best_value:
@@ -7,6 +7,7 @@ import pickle
 from collections import defaultdict
 from typing import Any, List, Tuple, Dict, Iterable
 
+from catanatron.action_log import ActionLog
 from catanatron.models.map import BASE_MAP_TEMPLATE, CatanMap
 from catanatron.models.board import Board
 from catanatron.models.enums import (
@@ -16,17 +17,18 @@ from catanatron.models.enums import (
     YEAR_OF_PLENTY,
     SETTLEMENT,
     CITY,
+    ROAD,
     Action,
     ActionPrompt,
     ActionType,
 )
 from catanatron.models.decks import (
     CITY_COST_FREQDECK,
+    RESOURCE_FREQDECK_INDEXES,
     DEVELOPMENT_CARD_COST_FREQDECK,
     SETTLEMENT_COST_FREQDECK,
     draw_from_listdeck,
     freqdeck_add,
-    freqdeck_can_draw,
     freqdeck_contains,
     freqdeck_draw,
     freqdeck_from_listdeck,
@@ -56,32 +58,19 @@ from catanatron.state_functions import (
     player_freqdeck_subtract,
     player_deck_to_array,
     player_key,
+    player_record,
     player_num_resource_cards,
     player_resource_freqdeck_contains,
 )
 from catanatron.models.player import Color, Player
-from catanatron.models.enums import FastResource
-
-# These will be prefixed by P0_, P1_, ...
-# Create Player State blueprint
-PLAYER_INITIAL_STATE = {
-    "VICTORY_POINTS": 0,
-    "ROADS_AVAILABLE": 15,
-    "SETTLEMENTS_AVAILABLE": 5,
-    "CITIES_AVAILABLE": 4,
-    "HAS_ROAD": False,
-    "HAS_ARMY": False,
-    "HAS_ROLLED": False,
-    "HAS_PLAYED_DEVELOPMENT_CARD_IN_TURN": False,
-    # de-normalized features (for performance since we think they are good features)
-    "ACTUAL_VICTORY_POINTS": 0,
-    "LONGEST_ROAD_LENGTH": 0,
-}
-for resource in RESOURCES:
-    PLAYER_INITIAL_STATE[f"{resource}_IN_HAND"] = 0
-for dev_card in DEVELOPMENT_CARDS:
-    PLAYER_INITIAL_STATE[f"{dev_card}_IN_HAND"] = 0
-    PLAYER_INITIAL_STATE[f"PLAYED_{dev_card}"] = 0
+from catanatron.models.player_state import (
+    IN_HAND_FIELDS,
+    PLAYER_INITIAL_STATE,
+    PlayerField,
+    PlayerStateView,
+    initial_player_records,
+)
+from catanatron.zobrist import ROBBER_KEYS, compute_zobrist_hash, piece_key
 
 
 class State:
@@ -94,9 +83,12 @@ class State:
             information that can be easily copiable.
         board (Board): Board state. Settlement locations, cities,
             roads, ect... See Board class.
-        player_state (Dict[str, Any]): See PLAYER_INITIAL_STATE. It will
-            contain one of each key in PLAYER_INITIAL_STATE but prefixed
-            with "P<index_of_player>".
+        player_records (List[List[Any]]): One record per seat, with the values
+            of PLAYER_INITIAL_STATE fields. Index with PlayerField, e.g.:
+            `player_records[0][PlayerField.HAS_ROAD]`. Source of truth.
+        player_state (PlayerStateView): Dict-like view over player_records.
+            It will contain one of each key in PLAYER_INITIAL_STATE but
+            prefixed with "P<index_of_player>".
             Example: { P0_HAS_ROAD: False, P1_SETTLEMENTS_AVAILABLE: 18, ... }
         color_to_index (Dict[Color, int]): Color to seating location cache
         colors (Tuple[Color]): Represents seating order.
@@ -107,7 +99,8 @@ class State:
         buildings_by_color (Dict[Color, Dict[FastBuildingType, List]]): Cache of
             buildings. Can be used like: `buildings_by_color[Color.RED][SETTLEMENT]`
             to get a list of all node ids where RED has settlements.
-        actions (List[Action]): Log of all actions taken. Fully-specified actions.
+        actions (ActionLog): Log of all actions taken. Fully-specified actions.
+            List-like, but cheap to copy. See catanatron.action_log.
         num_turns (int): number of turns thus far
         current_player_index (int): index per colors array of player that should be
             making a decision now. Not necesarilly the same as current_turn_index
@@ -122,6 +115,10 @@ class State:
         free_roads_available (int): Number of roads available left in Road Building
             phase.
         playable_actions (List[Action]): List of playable actions by current player.
+        zobrist_hash (int): Zobrist hash of the pieces and robber on the board.
+            Maintained by apply_action. See catanatron.zobrist.
+        forked_attributes (Set[str]): Attributes (of FORK_SHARED_ATTRIBUTES)
+            still shared with a fork. Copied before apply_action writes them.
     """
 
     def __init__(
@@ -137,11 +134,9 @@ class State:
             self.board = Board(catan_map or CatanMap.from_template(BASE_MAP_TEMPLATE))
             self.discard_limit = discard_limit
 
+            self.player_records = initial_player_records(len(self.colors))
             # feature-ready dictionary
-            self.player_state = dict()
-            for index in range(len(self.colors)):
-                for key, value in PLAYER_INITIAL_STATE.items():
-                    self.player_state[f"P{index}_{key}"] = value
+            self.player_state = PlayerStateView(self.player_records)
             self.color_to_index = {
                 color: index for index, color in enumerate(self.colors)
             }
@@ -154,7 +149,7 @@ class State:
             self.buildings_by_color: Dict[Color, Dict[Any, Any]] = {
                 p.color: defaultdict(list) for p in players
             }
-            self.actions: List[Action] = []  # log of all action taken by players
+            self.actions = ActionLog()  # log of all action taken by players
             self.num_turns = 0  # num_completed_turns
 
             # Current prompt / player
@@ -174,7 +169,9 @@ class State:
             self.current_trade: Tuple = (0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
             self.acceptees = tuple(False for _ in self.colors)
 
+            self.zobrist_hash = compute_zobrist_hash(self.board)
             self.playable_actions = generate_playable_actions(self)
+            self.forked_attributes = set()
 
     def current_player(self):
         """Helper for accessing Player instance who should decide next"""
@@ -197,16 +194,15 @@ class State:
 
         state_copy.board = self.board.copy()
 
-        state_copy.player_state = self.player_state.copy()
+        state_copy.player_records = [record.copy() for record in self.player_records]
+        state_copy.player_state = PlayerStateView(state_copy.player_records)
         state_copy.color_to_index = self.color_to_index
         state_copy.colors = self.colors  # immutable
 
         state_copy.resource_freqdeck = self.resource_freqdeck.copy()
         state_copy.development_listdeck = self.development_listdeck.copy()
 
-        state_copy.buildings_by_color = pickle.loads(
-            pickle.dumps(self.buildings_by_color)
-        )
+        state_copy.buildings_by_color = self.copy_buildings_by_color()
         state_copy.actions = self.actions.copy()
         state_copy.num_turns = self.num_turns
 
@@ -226,9 +222,50 @@ class State:
         state_copy.current_trade = self.current_trade
         state_copy.acceptees = self.acceptees
 
+        state_copy.zobrist_hash = self.zobrist_hash
         state_copy.playable_actions = self.playable_actions
+        state_copy.forked_attributes = set()
         return state_copy
 
+    def copy_buildings_by_color(self):
+        return pickle.loads(pickle.dumps(self.buildings_by_color))
+
+    def fork(self):
+        """Creates a copy-on-write copy of this State. Cheaper than .copy()
+        when only a few actions will be applied to it (e.g. rollouts).
+
+        The map, board and buildings_by_color are shared with this state
+        until apply_action (or undo_action) is about to write them, at which
+        point whichever of the two states writes gets its own copy. Player
+        records, decks and the actions log are cheap to copy and change on
+        almost every action, so they are copied right away.
+
+        Returns:
+            State: State fork. Can be modified without repercusions to this one.
+        """
+        state_fork = self.__class__([], None, initialize=False)
+        state_fork.__dict__.update(self.__dict__)  # immutable values
+        state_fork.player_records = [record.copy() for record in self.player_records]
+        state_fork.player_state = PlayerStateView(state_fork.player_records)
+        state_fork.resource_freqdeck = self.resource_freqdeck.copy()
+        state_fork.development_listdeck = self.development_listdeck.copy()
+        state_fork.actions = self.actions.copy()
+
+        # Both sides must copy before writing, since the other one may read.
+        self.forked_attributes = set(FORK_SHARED_ATTRIBUTES)
+        state_fork.forked_attributes = set(FORK_SHARED_ATTRIBUTES)
+        return state_fork
+
+    def own(self, attribute):
+        """Stops sharing attribute with forks, by copying it if needed"""
+        if attribute not in self.forked_attributes:
+            return
+        self.forked_attributes.remove(attribute)
+        if attribute == "board":
+            self.board = self.board.copy()
+        elif attribute == "buildings_by_color":
+            self.buildings_by_color = self.copy_buildings_by_color()
+
 
 def roll_dice():
     """Yields two random numbers
@@ -253,41 +290,39 @@ def yield_resources(board: Board, resource_freqdeck, number):
             Second is an array of resources that couldn't be yieleded
             because they depleted.
     """
-    intented_payout: Dict[Color, Dict[FastResource, int]] = defaultdict(
-        lambda: defaultdict(int)
-    )
-    resource_totals: Dict[FastResource, int] = defaultdict(int)
-    for coordinate, tile in board.map.land_tiles.items():
-        if tile.number != number or board.robber_coordinate == coordinate:
-            continue  # doesn't yield
-
-        for node_id in tile.nodes.values():
+    entry = board.payout_table.get(number, None)
+    if entry is None:
+        return {}, []
+    payouts, totals = entry
+
+    # The table ignores the robber, so take out what the robbed tile would yield.
+    robbed_tile = board.map.land_tiles[board.robber_coordinate]
+    if robbed_tile.number == number:
+        payouts = {color: list(freqdeck) for color, freqdeck in payouts.items()}
+        totals = list(totals)
+        for node_id in robbed_tile.nodes.values():
             building = board.buildings.get(node_id, None)
-            assert tile.resource is not None
-            if building is None:
-                continue
-            elif building[1] == SETTLEMENT:
-                intented_payout[building[0]][tile.resource] += 1
-                resource_totals[tile.resource] += 1
-            elif building[1] == CITY:
-                intented_payout[building[0]][tile.resource] += 2
-                resource_totals[tile.resource] += 2
+            if building is not None:
+                amount = 1 if building[1] == SETTLEMENT else 2
+                freqdeck_replenish(payouts[building[0]], -amount, robbed_tile.resource)
+                freqdeck_replenish(totals, -amount, robbed_tile.resource)
+        payouts = {
+            color: freqdeck for color, freqdeck in payouts.items() if any(freqdeck)
+        }
 
     # for each resource, check enough in deck to yield.
-    depleted = []
-    for resource in RESOURCES:
-        total = resource_totals[resource]
-        if not freqdeck_can_draw(resource_freqdeck, total, resource):
-            depleted.append(resource)
+    depleted = [
+        resource
+        for resource, total, available in zip(RESOURCES, totals, resource_freqdeck)
+        if total > available
+    ]
 
     # build final data color => freqdeck structure
     payout = {}
-    for player, player_payout in intented_payout.items():
-        payout[player] = [0, 0, 0, 0, 0]
-
-        for resource, count in player_payout.items():
-            if resource not in depleted:
-                freqdeck_replenish(payout[player], count, resource)
+    for player, freqdeck in payouts.items():
+        payout[player] = list(freqdeck)
+        for resource in depleted:
+            payout[player][RESOURCE_FREQDECK_INDEXES[resource]] = 0
 
     return payout, depleted
 
@@ -324,6 +359,8 @@ def apply_action(state: State, action: Action):
     Returns:
         Action: Fully-specified action
     """
+    if state.forked_attributes:
+        own_forked_attributes(state, action)
 
     if action.action_type == ActionType.END_TURN:
         player_clean_turn(state, action.color)
@@ -334,17 +371,18 @@ def apply_action(state: State, action: Action):
         node_id = action.value
         if state.is_initial_build_phase:
             state.board.build_settlement(action.color, node_id, True)
+            state.zobrist_hash ^= piece_key(action.color, SETTLEMENT, node_id)
             build_settlement(state, action.color, node_id, True)
             buildings = state.buildings_by_color[action.color][SETTLEMENT]
 
             # yield resources if second settlement
             is_second_house = len(buildings) == 2
             if is_second_house:
-                key = player_key(state, action.color)
+                record = player_record(state, action.color)
                 for tile in state.board.map.adjacent_tiles[node_id]:
                     if tile.resource != None:
                         freqdeck_draw(state.resource_freqdeck, 1, tile.resource)  # type: ignore
-                        state.player_state[f"{key}_{tile.resource}_IN_HAND"] += 1
+                        record[IN_HAND_FIELDS[tile.resource]] += 1
 
             # state.current_player_index stays the same
             state.current_prompt = ActionPrompt.BUILD_INITIAL_ROAD
@@ -355,6 +393,7 @@ def apply_action(state: State, action: Action):
                 road_color,
                 road_lengths,
             ) = state.board.build_settlement(action.color, node_id, False)
+            state.zobrist_hash ^= piece_key(action.color, SETTLEMENT, node_id)
             build_settlement(state, action.color, node_id, False)
             state.resource_freqdeck = freqdeck_add(
                 state.resource_freqdeck, SETTLEMENT_COST_FREQDECK
@@ -365,10 +404,11 @@ def apply_action(state: State, action: Action):
             # state.current_prompt stays as PLAY
             state.playable_actions = generate_playable_actions(state)
     elif action.action_type == ActionType.BUILD_ROAD:
-        edge = action.value
+        edge_id = action.value
         if state.is_initial_build_phase:
-            state.board.build_road(action.color, edge)
-            build_road(state, action.color, edge, True)
+            state.board.build_road(action.color, edge_id)
+            state.zobrist_hash ^= piece_key(action.color, ROAD, edge_id)
+            build_road(state, action.color, edge_id, True)
 
             # state.current_player_index depend on what index are we
             # state.current_prompt too
@@ -393,9 +433,10 @@ def apply_action(state: State, action: Action):
                 state.current_prompt = ActionPrompt.BUILD_INITIAL_SETTLEMENT
             state.playable_actions = generate_playable_actions(state)
         elif state.is_road_building and state.free_roads_available > 0:
-            result = state.board.build_road(action.color, edge)
+            result = state.board.build_road(action.color, edge_id)
             previous_road_color, road_color, road_lengths = result
-            build_road(state, action.color, edge, True)
+            state.zobrist_hash ^= piece_key(action.color, ROAD, edge_id)
+            build_road(state, action.color, edge_id, True)
             maintain_longest_road(state, previous_road_color, road_color, road_lengths)
 
             state.free_roads_available -= 1
@@ -409,9 +450,10 @@ def apply_action(state: State, action: Action):
                 # state.current_prompt stays as PLAY
             state.playable_actions = generate_playable_actions(state)
         else:
-            result = state.board.build_road(action.color, edge)
+            result = state.board.build_road(action.color, edge_id)
             previous_road_color, road_color, road_lengths = result
-            build_road(state, action.color, edge, False)
+            state.zobrist_hash ^= piece_key(action.color, ROAD, edge_id)
+            build_road(state, action.color, edge_id, False)
             maintain_longest_road(state, previous_road_color, road_color, road_lengths)
 
             # state.current_player_index stays the same
@@ -420,6 +462,8 @@ def apply_action(state: State, action: Action):
     elif action.action_type == ActionType.BUILD_CITY:
         node_id = action.value
         state.board.build_city(action.color, node_id)
+        state.zobrist_hash ^= piece_key(action.color, SETTLEMENT, node_id)
+        state.zobrist_hash ^= piece_key(action.color, CITY, node_id)
         build_city(state, action.color, node_id)
         state.resource_freqdeck = freqdeck_add(
             state.resource_freqdeck, CITY_COST_FREQDECK
@@ -450,8 +494,7 @@ def apply_action(state: State, action: Action):
         # state.current_prompt stays as PLAY
         state.playable_actions = generate_playable_actions(state)
     elif action.action_type == ActionType.ROLL:
-        key = player_key(state, action.color)
-        state.player_state[f"{key}_HAS_ROLLED"] = True
+        player_record(state, action.color)[PlayerField.HAS_ROLLED] = True
 
         dices = action.value or roll_dice()
         number = dices[0] + dices[1]
@@ -516,6 +559,8 @@ def apply_action(state: State, action: Action):
         state.playable_actions = generate_playable_actions(state)
     elif action.action_type == ActionType.MOVE_ROBBER:
         (coordinate, robbed_color, robbed_resource) = action.value
+        state.zobrist_hash ^= ROBBER_KEYS[state.board.robber_coordinate]
+        state.zobrist_hash ^= ROBBER_KEYS[coordinate]
         state.board.robber_coordinate = coordinate
         if robbed_color is not None:
             if robbed_resource is None:
@@ -563,9 +608,8 @@ def apply_action(state: State, action: Action):
             raise ValueError("Player cant play monopoly now")
         for color in state.colors:
             if not color == action.color:
-                key = player_key(state, color)
-                number_of_cards_to_steal = state.player_state[
-                    f"{key}_{mono_resource}_IN_HAND"
+                number_of_cards_to_steal = player_record(state, color)[
+                    IN_HAND_FIELDS[mono_resource]
                 ]
                 freqdeck_replenish(
                     cards_stolen, number_of_cards_to_steal, mono_resource
@@ -697,3 +741,179 @@ def reset_trading_state(state):
     state.is_resolving_trade = False
     state.current_trade = (0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
     state.acceptees = tuple(False for _ in state.colors)
+
+
+# State attributes that apply_action may re-assign. Saved by reference
+# (they are immutable or always replaced, never mutated in place).
+UNDO_STATE_ATTRIBUTES = (
+    "zobrist_hash",
+    "num_turns",
+    "current_player_index",
+    "current_turn_index",
+    "current_prompt",
+    "is_initial_build_phase",
+    "is_discarding",
+    "is_moving_knight",
+    "is_road_building",
+    "free_roads_available",
+    "is_resolving_trade",
+    "current_trade",
+    "acceptees",
+    "playable_actions",
+)
+BUILD_ACTION_TYPES = set(
+    [ActionType.BUILD_SETTLEMENT, ActionType.BUILD_ROAD, ActionType.BUILD_CITY]
+)
+
+# State attributes State.fork shares (copy-on-write) instead of copying.
+FORK_SHARED_ATTRIBUTES = ("board", "buildings_by_color")
+
+
+def own_forked_attributes(state: State, action: Action):
+    """Copies the shared attributes that applying (or undoing) action writes"""
+    if action.action_type in BUILD_ACTION_TYPES:
+        state.own("board")
+        state.own("buildings_by_color")
+    elif action.action_type == ActionType.MOVE_ROBBER:
+        state.own("board")
+
+
+class UndoRecord:
+    """Snapshot of the parts of a State an action can change. Created by
+    apply_action_with_undo and consumed by undo_action.
+
+    Attributes:
+        action (Action): Fully-specified action that was applied.
+        attributes (Tuple): Values of UNDO_STATE_ATTRIBUTES before the action.
+        player_records (List[List[Any]]): Copy of player_records. Covers
+            hands, victory points, longest road and largest army.
+        resource_freqdeck (List[int]): Copy of the bank.
+        development_listdeck (List[FastDevCard]): Copy of the dev card bank.
+            Only for BUY_DEVELOPMENT_CARD, None otherwise.
+        robber_coordinate (Coordinate): Robber location.
+        board (Tuple): Board road network (components, road lengths, caches, ...)
+            Only for build actions, None otherwise.
+        settlement_index (int): Position of the upgraded settlement in
+            buildings_by_color. Only for BUILD_CITY.
+    """
+
+    __slots__ = (
+        "action",
+        "attributes",
+        "player_records",
+        "resource_freqdeck",
+        "development_listdeck",
+        "robber_coordinate",
+        "board",
+        "settlement_index",
+    )
+
+    def __init__(self, state: State, action: Action):
+        self.action = action
+        self.attributes = tuple(getattr(state, a) for a in UNDO_STATE_ATTRIBUTES)
+        self.player_records = [record.copy() for record in state.player_records]
+        self.resource_freqdeck = state.resource_freqdeck.copy()
+        self.development_listdeck = None
+        if action.action_type == ActionType.BUY_DEVELOPMENT_CARD:
+            self.development_listdeck = state.development_listdeck.copy()
+
+        board = state.board
+        self.robber_coordinate = board.robber_coordinate
+        self.board = None
+        if action.action_type in BUILD_ACTION_TYPES:
+            self.board = (
+                board.component_masks.copy(),  # values replaced, not mutated
+                board.component_index.copy(),
+                board.road_lengths.copy(),
+                board.road_color,
+                board.road_length,
+                board.board_buildable_mask,
+                board.reachable_masks.copy(),
+                board.buildable_edge_masks.copy(),
+                board.player_port_resources_cache,
+                board.payout_table,  # re-assigned, not mutated, on builds
+            )
+
+        self.settlement_index = None
+        if action.action_type == ActionType.BUILD_CITY:
+            settlements = state.buildings_by_color[action.color][SETTLEMENT]
+            if action.value in settlements:
+                self.settlement_index = settlements.index(action.value)
+
+
+def apply_action_with_undo(state: State, action: Action) -> UndoRecord:
+    """Like apply_action, but returns an UndoRecord that undo_action can use
+    to bring state back to exactly how it was. Allows searching by mutating
+    a single state (make/unmake) instead of copying it at every node.
+
+    If apply_action raises, state is left untouched and the error re-raised.
+
+    Args:
+        state (State): State to mutate
+        action (Action): Action to carry out
+
+    Returns:
+        UndoRecord: Record to pass to undo_action. Its .action attribute
+            is the fully-specified action.
+    """
+    record = UndoRecord(state, action)
+    try:
+        record.action = apply_action(state, action)
+    except Exception:
+        _restore_snapshot(state, record)
+        raise
+    return record
+
+
+def undo_action(state: State, record: UndoRecord):
+    """Reverts the action given to apply_action_with_undo. Records must be
+    undone in reverse order of application (last applied, first undone).
+
+    Args:
+        state (State): State to mutate
+        record (UndoRecord): As returned by apply_action_with_undo
+    """
+    if state.forked_attributes:
+        own_forked_attributes(state, record.action)
+    state.actions.pop()
+
+    action = record.action
+    board = state.board
+    buildings = state.buildings_by_color[action.color]
+    if action.action_type == ActionType.BUILD_SETTLEMENT:
+        del board.buildings[action.value]
+        buildings[SETTLEMENT].remove(action.value)
+    elif action.action_type == ActionType.BUILD_ROAD:
+        board.roads[action.value] = None
+        buildings[ROAD].remove(action.value)
+    elif action.action_type == ActionType.BUILD_CITY:
+        board.buildings[action.value] = (action.color, SETTLEMENT)
+        buildings[CITY].remove(action.value)
+        buildings[SETTLEMENT].insert(record.settlement_index, action.value)
+
+    _restore_snapshot(state, record)
+
+
+def _restore_snapshot(state, record):
+    for attribute, value in zip(UNDO_STATE_ATTRIBUTES, record.attributes):
+        setattr(state, attribute, value)
+    state.player_records[:] = record.player_records  # in place, for player_state
+    state.resource_freqdeck = record.resource_freqdeck
+    if record.development_listdeck is not None:
+        state.development_listdeck = record.development_listdeck
+
+    board = state.board
+    board.robber_coordinate = record.robber_coordinate
+    if record.board is not None:
+        (
+            board.component_masks,
+            board.component_index,
+            board.road_lengths,
+            board.road_color,
+            board.road_length,
+            board.board_buildable_mask,
+            board.reachable_masks,
+            board.buildable_edge_masks,
+            board.player_port_resources_cache,
+            board.payout_table,
+        ) = record.board
@@ -19,27 +19,33 @@ from catanatron.models.enums import (
     ROAD,
     FastResource,
 )
+from catanatron.models.player_state import (
+    HAND_END,
+    HAND_START,
+    IN_HAND_FIELDS,
+    PLAYED_FIELDS,
+    PlayerField,
+)
 
 
 def maintain_longest_road(state, previous_road_color, road_color, road_lengths):
     for color, length in road_lengths.items():
-        key = player_key(state, color)
-        state.player_state[f"{key}_LONGEST_ROAD_LENGTH"] = length
+        player_record(state, color)[PlayerField.LONGEST_ROAD_LENGTH] = length
 
     # If road_color is not set or is the same as before, do nothing.
     if road_color is None or (previous_road_color == road_color):
         return
 
     # Set new longest road player and unset previous if any.
-    winner_key = player_key(state, road_color)
-    state.player_state[f"{winner_key}_HAS_ROAD"] = True
-    state.player_state[f"{winner_key}_VICTORY_POINTS"] += 2
-    state.player_state[f"{winner_key}_ACTUAL_VICTORY_POINTS"] += 2
+    winner = player_record(state, road_color)
+    winner[PlayerField.HAS_ROAD] = True
+    winner[PlayerField.VICTORY_POINTS] += 2
+    winner[PlayerField.ACTUAL_VICTORY_POINTS] += 2
     if previous_road_color is not None:
-        loser_key = player_key(state, previous_road_color)
-        state.player_state[f"{loser_key}_HAS_ROAD"] = False
-        state.player_state[f"{loser_key}_VICTORY_POINTS"] -= 2
-        state.player_state[f"{loser_key}_ACTUAL_VICTORY_POINTS"] -= 2
+        loser = player_record(state, previous_road_color)
+        loser[PlayerField.HAS_ROAD] = False
+        loser[PlayerField.VICTORY_POINTS] -= 2
+        loser[PlayerField.ACTUAL_VICTORY_POINTS] -= 2
 
 
 def maintain_largest_army(state, color, previous_army_color, previous_army_size):
@@ -50,21 +56,21 @@ def maintain_largest_army(state, color, previous_army_color, previous_army_size)
         return
 
     if previous_army_color is None:
-        winner_key = player_key(state, color)
-        state.player_state[f"{winner_key}_HAS_ARMY"] = True
-        state.player_state[f"{winner_key}_VICTORY_POINTS"] += 2
-        state.player_state[f"{winner_key}_ACTUAL_VICTORY_POINTS"] += 2
+        winner = player_record(state, color)
+        winner[PlayerField.HAS_ARMY] = True
+        winner[PlayerField.VICTORY_POINTS] += 2
+        winner[PlayerField.ACTUAL_VICTORY_POINTS] += 2
     elif previous_army_size < candidate_size and previous_army_color != color:
         # switch, remove previous points and award to new king
-        winner_key = player_key(state, color)
-        state.player_state[f"{winner_key}_HAS_ARMY"] = True
-        state.player_state[f"{winner_key}_VICTORY_POINTS"] += 2
-        state.player_state[f"{winner_key}_ACTUAL_VICTORY_POINTS"] += 2
-
-        loser_key = player_key(state, previous_army_color)
-        state.player_state[f"{loser_key}_HAS_ARMY"] = False
-        state.player_state[f"{loser_key}_VICTORY_POINTS"] -= 2
-        state.player_state[f"{loser_key}_ACTUAL_VICTORY_POINTS"] -= 2
+        winner = player_record(state, color)
+        winner[PlayerField.HAS_ARMY] = True
+        winner[PlayerField.VICTORY_POINTS] += 2
+        winner[PlayerField.ACTUAL_VICTORY_POINTS] += 2
+
+        loser = player_record(state, previous_army_color)
+        loser[PlayerField.HAS_ARMY] = False
+        loser[PlayerField.VICTORY_POINTS] -= 2
+        loser[PlayerField.ACTUAL_VICTORY_POINTS] -= 2
     # else: someone else has army and we dont compete
 
 
@@ -73,72 +79,70 @@ def player_key(state, color):
     return f"P{state.color_to_index[color]}"
 
 
+def player_record(state, color):
+    """Returns the player's record (mutable), to be indexed with PlayerField"""
+    return state.player_records[state.color_to_index[color]]
+
+
 def get_enemy_colors(colors, player_color):
     return filter(lambda c: c != player_color, colors)
 
 
 def get_actual_victory_points(state, color):
-    key = player_key(state, color)
-    return state.player_state[f"{key}_ACTUAL_VICTORY_POINTS"]
+    return player_record(state, color)[PlayerField.ACTUAL_VICTORY_POINTS]
 
 
 def get_visible_victory_points(state, color):
-    key = player_key(state, color)
-    return state.player_state[f"{key}_VICTORY_POINTS"]
+    return player_record(state, color)[PlayerField.VICTORY_POINTS]
 
 
 def get_longest_road_color(state):
-    for index in range(len(state.colors)):
-        if state.player_state[f"P{index}_HAS_ROAD"]:
+    for index, record in enumerate(state.player_records):
+        if record[PlayerField.HAS_ROAD]:
             return state.colors[index]
     return None
 
 
 def get_largest_army(state):
-    for index in range(len(state.colors)):
-        if state.player_state[f"P{index}_HAS_ARMY"]:
-            return (
-                state.colors[index],
-                state.player_state[f"P{index}_PLAYED_KNIGHT"],
-            )
+    for index, record in enumerate(state.player_records):
+        if record[PlayerField.HAS_ARMY]:
+            return (state.colors[index], record[PlayerField.PLAYED_KNIGHT])
     return None, None
 
 
 def player_has_rolled(state, color):
-    key = player_key(state, color)
-    return state.player_state[f"{key}_HAS_ROLLED"]
+    return player_record(state, color)[PlayerField.HAS_ROLLED]
 
 
 def get_longest_road_length(state, color):
-    key = player_key(state, color)
-    return state.player_state[key + "_LONGEST_ROAD_LENGTH"]
+    return player_record(state, color)[PlayerField.LONGEST_ROAD_LENGTH]
 
 
 def get_played_dev_cards(state, color, dev_card=None):
-    key = player_key(state, color)
+    record = player_record(state, color)
     if dev_card is None:
         return (
-            state.player_state[f"{key}_PLAYED_KNIGHT"]
-            + state.player_state[f"{key}_PLAYED_MONOPOLY"]
-            + state.player_state[f"{key}_PLAYED_ROAD_BUILDING"]
-            + state.player_state[f"{key}_PLAYED_YEAR_OF_PLENTY"]
+            record[PlayerField.PLAYED_KNIGHT]
+            + record[PlayerField.PLAYED_MONOPOLY]
+            + record[PlayerField.PLAYED_ROAD_BUILDING]
+            + record[PlayerField.PLAYED_YEAR_OF_PLENTY]
         )
     else:
-        return state.player_state[f"{key}_PLAYED_{dev_card}"]
+        return record[PLAYED_FIELDS[dev_card]]
 
 
 def get_dev_cards_in_hand(state, color, dev_card=None):
-    key = player_key(state, color)
+    record = player_record(state, color)
     if dev_card is None:
         return (
-            state.player_state[f"{key}_KNIGHT_IN_HAND"]
-            + state.player_state[f"{key}_MONOPOLY_IN_HAND"]
-            + state.player_state[f"{key}_ROAD_BUILDING_IN_HAND"]
-            + state.player_state[f"{key}_YEAR_OF_PLENTY_IN_HAND"]
-            + state.player_state[f"{key}_VICTORY_POINT_IN_HAND"]
+            record[PlayerField.KNIGHT_IN_HAND]
+            + record[PlayerField.MONOPOLY_IN_HAND]
+            + record[PlayerField.ROAD_BUILDING_IN_HAND]
+            + record[PlayerField.YEAR_OF_PLENTY_IN_HAND]
+            + record[PlayerField.VICTORY_POINT_IN_HAND]
         )
     else:
-        return state.player_state[f"{key}_{dev_card}_IN_HAND"]
+        return record[IN_HAND_FIELDS[dev_card]]
 
 
 def get_player_buildings(state, color_param, building_type_param):
@@ -147,41 +151,34 @@ def get_player_buildings(state, color_param, building_type_param):
 
 def get_player_freqdeck(state, color):
     """Returns a 'freqdeck' of a player's resource hand."""
-    key = player_key(state, color)
-    return [
-        state.player_state[f"{key}_WOOD_IN_HAND"],
-        state.player_state[f"{key}_BRICK_IN_HAND"],
-        state.player_state[f"{key}_SHEEP_IN_HAND"],
-        state.player_state[f"{key}_WHEAT_IN_HAND"],
-        state.player_state[f"{key}_ORE_IN_HAND"],
-    ]
+    return player_record(state, color)[HAND_START:HAND_END]
 
 
 # ===== State Mutators
 def build_settlement(state, color, node_id, is_free):
     state.buildings_by_color[color][SETTLEMENT].append(node_id)
 
-    key = player_key(state, color)
-    state.player_state[f"{key}_SETTLEMENTS_AVAILABLE"] -= 1
+    record = player_record(state, color)
+    record[PlayerField.SETTLEMENTS_AVAILABLE] -= 1
 
-    state.player_state[f"{key}_VICTORY_POINTS"] += 1
-    state.player_state[f"{key}_ACTUAL_VICTORY_POINTS"] += 1
+    record[PlayerField.VICTORY_POINTS] += 1
+    record[PlayerField.ACTUAL_VICTORY_POINTS] += 1
 
     if not is_free:
-        state.player_state[f"{key}_WOOD_IN_HAND"] -= 1
-        state.player_state[f"{key}_BRICK_IN_HAND"] -= 1
-        state.player_state[f"{key}_SHEEP_IN_HAND"] -= 1
-        state.player_state[f"{key}_WHEAT_IN_HAND"] -= 1
+        record[PlayerField.WOOD_IN_HAND] -= 1
+        record[PlayerField.BRICK_IN_HAND] -= 1
+        record[PlayerField.SHEEP_IN_HAND] -= 1
+        record[PlayerField.WHEAT_IN_HAND] -= 1
 
 
-def build_road(state, color, edge, is_free):
-    state.buildings_by_color[color][ROAD].append(edge)
+def build_road(state, color, edge_id, is_free):
+    state.buildings_by_color[color][ROAD].append(edge_id)
 
-    key = player_key(state, color)
-    state.player_state[f"{key}_ROADS_AVAILABLE"] -= 1
+    record = player_record(state, color)
+    record[PlayerField.ROADS_AVAILABLE] -= 1
     if not is_free:
-        state.player_state[f"{key}_WOOD_IN_HAND"] -= 1
-        state.player_state[f"{key}_BRICK_IN_HAND"] -= 1
+        record[PlayerField.WOOD_IN_HAND] -= 1
+        record[PlayerField.BRICK_IN_HAND] -= 1
         state.resource_freqdeck = freqdeck_add(
             state.resource_freqdeck, ROAD_COST_FREQDECK
         )  # replenish bank
@@ -191,125 +188,125 @@ def build_city(state, color, node_id):
     state.buildings_by_color[color][SETTLEMENT].remove(node_id)
     state.buildings_by_color[color][CITY].append(node_id)
 
-    key = player_key(state, color)
-    state.player_state[f"{key}_SETTLEMENTS_AVAILABLE"] += 1
-    state.player_state[f"{key}_CITIES_AVAILABLE"] -= 1
+    record = player_record(state, color)
+    record[PlayerField.SETTLEMENTS_AVAILABLE] += 1
+    record[PlayerField.CITIES_AVAILABLE] -= 1
 
-    state.player_state[f"{key}_VICTORY_POINTS"] += 1
-    state.player_state[f"{key}_ACTUAL_VICTORY_POINTS"] += 1
+    record[PlayerField.VICTORY_POINTS] += 1
+    record[PlayerField.ACTUAL_VICTORY_POINTS] += 1
 
-    state.player_state[f"{key}_WHEAT_IN_HAND"] -= 2
-    state.player_state[f"{key}_ORE_IN_HAND"] -= 3
+    record[PlayerField.WHEAT_IN_HAND] -= 2
+    record[PlayerField.ORE_IN_HAND] -= 3
 
 
 # ===== Deck Functions
 def player_can_afford_dev_card(state, color):
-    key = player_key(state, color)
+    record = player_record(state, color)
     return (
-        state.player_state[f"{key}_SHEEP_IN_HAND"] >= 1
-        and state.player_state[f"{key}_WHEAT_IN_HAND"] >= 1
-        and state.player_state[f"{key}_ORE_IN_HAND"] >= 1
+        record[PlayerField.SHEEP_IN_HAND] >= 1
+        and record[PlayerField.WHEAT_IN_HAND] >= 1
+        and record[PlayerField.ORE_IN_HAND] >= 1
     )
 
 
 def player_resource_freqdeck_contains(state, color, freqdeck):
-    key = player_key(state, color)
+    record = player_record(state, color)
     return (
-        state.player_state[f"{key}_WOOD_IN_HAND"] >= freqdeck[0]
-        and state.player_state[f"{key}_BRICK_IN_HAND"] >= freqdeck[1]
-        and state.player_state[f"{key}_SHEEP_IN_HAND"] >= freqdeck[2]
-        and state.player_state[f"{key}_WHEAT_IN_HAND"] >= freqdeck[3]
-        and state.player_state[f"{key}_ORE_IN_HAND"] >= freqdeck[4]
+        record[PlayerField.WOOD_IN_HAND] >= freqdeck[0]
+        and record[PlayerField.BRICK_IN_HAND] >= freqdeck[1]
+        and record[PlayerField.SHEEP_IN_HAND] >= freqdeck[2]
+        and record[PlayerField.WHEAT_IN_HAND] >= freqdeck[3]
+        and record[PlayerField.ORE_IN_HAND] >= freqdeck[4]
     )
 
 
 def player_can_play_dev(state, color, dev_card):
-    key = player_key(state, color)
+    record = player_record(state, color)
     return (
-        not state.player_state[f"{key}_HAS_PLAYED_DEVELOPMENT_CARD_IN_TURN"]
-        and state.player_state[f"{key}_{dev_card}_IN_HAND"] >= 1
+        not record[PlayerField.HAS_PLAYED_DEVELOPMENT_CARD_IN_TURN]
+        and record[IN_HAND_FIELDS[dev_card]] >= 1
     )
 
 
 def player_freqdeck_add(state, color, freqdeck):
-    key = player_key(state, color)
-    state.player_state[f"{key}_WOOD_IN_HAND"] += freqdeck[0]
-    state.player_state[f"{key}_BRICK_IN_HAND"] += freqdeck[1]
-    state.player_state[f"{key}_SHEEP_IN_HAND"] += freqdeck[2]
-    state.player_state[f"{key}_WHEAT_IN_HAND"] += freqdeck[3]
-    state.player_state[f"{key}_ORE_IN_HAND"] += freqdeck[4]
+    record = player_record(state, color)
+    record[PlayerField.WOOD_IN_HAND] += freqdeck[0]
+    record[PlayerField.BRICK_IN_HAND] += freqdeck[1]
+    record[PlayerField.SHEEP_IN_HAND] += freqdeck[2]
+    record[PlayerField.WHEAT_IN_HAND] += freqdeck[3]
+    record[PlayerField.ORE_IN_HAND] += freqdeck[4]
 
 
 def player_freqdeck_subtract(state, color, freqdeck):
-    key = player_key(state, color)
-    state.player_state[f"{key}_WOOD_IN_HAND"] -= freqdeck[0]
-    state.player_state[f"{key}_BRICK_IN_HAND"] -= freqdeck[1]
-    state.player_state[f"{key}_SHEEP_IN_HAND"] -= freqdeck[2]
-    state.player_state[f"{key}_WHEAT_IN_HAND"] -= freqdeck[3]
-    state.player_state[f"{key}_ORE_IN_HAND"] -= freqdeck[4]
+    record = player_record(state, color)
+    record[PlayerField.WOOD_IN_HAND] -= freqdeck[0]
+    record[PlayerField.BRICK_IN_HAND] -= freqdeck[1]
+    record[PlayerField.SHEEP_IN_HAND] -= freqdeck[2]
+    record[PlayerField.WHEAT_IN_HAND] -= freqdeck[3]
+    record[PlayerField.ORE_IN_HAND] -= freqdeck[4]
 
 
 def buy_dev_card(state, color, dev_card):
-    key = player_key(state, color)
+    record = player_record(state, color)
 
-    assert state.player_state[f"{key}_SHEEP_IN_HAND"] >= 1
-    assert state.player_state[f"{key}_WHEAT_IN_HAND"] >= 1
-    assert state.player_state[f"{key}_ORE_IN_HAND"] >= 1
+    assert record[PlayerField.SHEEP_IN_HAND] >= 1
+    assert record[PlayerField.WHEAT_IN_HAND] >= 1
+    assert record[PlayerField.ORE_IN_HAND] >= 1
 
-    state.player_state[f"{key}_{dev_card}_IN_HAND"] += 1
+    record[IN_HAND_FIELDS[dev_card]] += 1
     if dev_card == VICTORY_POINT:
-        state.player_state[f"{key}_ACTUAL_VICTORY_POINTS"] += 1
+        record[PlayerField.ACTUAL_VICTORY_POINTS] += 1
 
-    state.player_state[f"{key}_SHEEP_IN_HAND"] -= 1
-    state.player_state[f"{key}_WHEAT_IN_HAND"] -= 1
-    state.player_state[f"{key}_ORE_IN_HAND"] -= 1
+    record[PlayerField.SHEEP_IN_HAND] -= 1
+    record[PlayerField.WHEAT_IN_HAND] -= 1
+    record[PlayerField.ORE_IN_HAND] -= 1
 
 
 def player_num_resource_cards(state, color, card: Optional[FastResource] = None):
-    key = player_key(state, color)
+    record = player_record(state, color)
     if card is None:
         return (
-            state.player_state[f"{key}_WOOD_IN_HAND"]
-            + state.player_state[f"{key}_BRICK_IN_HAND"]
-            + state.player_state[f"{key}_SHEEP_IN_HAND"]
-            + state.player_state[f"{key}_WHEAT_IN_HAND"]
-            + state.player_state[f"{key}_ORE_IN_HAND"]
+            record[PlayerField.WOOD_IN_HAND]
+            + record[PlayerField.BRICK_IN_HAND]
+            + record[PlayerField.SHEEP_IN_HAND]
+            + record[PlayerField.WHEAT_IN_HAND]
+            + record[PlayerField.ORE_IN_HAND]
         )
     else:
-        return state.player_state[f"{key}_{card}_IN_HAND"]
+        return record[IN_HAND_FIELDS[card]]
 
 
 def player_num_dev_cards(state, color):
-    key = player_key(state, color)
+    record = player_record(state, color)
     return (
-        state.player_state[f"{key}_YEAR_OF_PLENTY_IN_HAND"]
-        + state.player_state[f"{key}_MONOPOLY_IN_HAND"]
-        + state.player_state[f"{key}_VICTORY_POINT_IN_HAND"]
-        + state.player_state[f"{key}_KNIGHT_IN_HAND"]
-        + state.player_state[f"{key}_ROAD_BUILDING_IN_HAND"]
+        record[PlayerField.YEAR_OF_PLENTY_IN_HAND]
+        + record[PlayerField.MONOPOLY_IN_HAND]
+        + record[PlayerField.VICTORY_POINT_IN_HAND]
+        + record[PlayerField.KNIGHT_IN_HAND]
+        + record[PlayerField.ROAD_BUILDING_IN_HAND]
     )
 
 
 def player_deck_to_array(state, color):
-    key = player_key(state, color)
+    record = player_record(state, color)
     return (
-        state.player_state[f"{key}_WOOD_IN_HAND"] * [WOOD]
-        + state.player_state[f"{key}_BRICK_IN_HAND"] * [BRICK]
-        + state.player_state[f"{key}_SHEEP_IN_HAND"] * [SHEEP]
-        + state.player_state[f"{key}_WHEAT_IN_HAND"] * [WHEAT]
-        + state.player_state[f"{key}_ORE_IN_HAND"] * [ORE]
+        record[PlayerField.WOOD_IN_HAND] * [WOOD]
+        + record[PlayerField.BRICK_IN_HAND] * [BRICK]
+        + record[PlayerField.SHEEP_IN_HAND] * [SHEEP]
+        + record[PlayerField.WHEAT_IN_HAND] * [WHEAT]
+        + record[PlayerField.ORE_IN_HAND] * [ORE]
     )
 
 
 def player_deck_draw(state, color, card, amount=1):
-    key = player_key(state, color)
-    assert state.player_state[f"{key}_{card}_IN_HAND"] >= amount
-    state.player_state[f"{key}_{card}_IN_HAND"] -= amount
+    record = player_record(state, color)
+    field = IN_HAND_FIELDS[card]
+    assert record[field] >= amount
+    record[field] -= amount
 
 
 def player_deck_replenish(state, color, resource, amount=1):
-    key = player_key(state, color)
-    state.player_state[f"{key}_{resource}_IN_HAND"] += amount
+    player_record(state, color)[IN_HAND_FIELDS[resource]] += amount
 
 
 def player_deck_random_draw(state, color):
@@ -322,15 +319,15 @@ def player_deck_random_draw(state, color):
 def play_dev_card(state, color, dev_card):
     if dev_card == "KNIGHT":
         previous_army_color, previous_army_size = get_largest_army(state)
-    key = player_key(state, color)
+    record = player_record(state, color)
     player_deck_draw(state, color, dev_card)
-    state.player_state[f"{key}_HAS_PLAYED_DEVELOPMENT_CARD_IN_TURN"] = True
-    state.player_state[f"{key}_PLAYED_{dev_card}"] += 1
+    record[PlayerField.HAS_PLAYED_DEVELOPMENT_CARD_IN_TURN] = True
+    record[PLAYED_FIELDS[dev_card]] += 1
     if dev_card == "KNIGHT":
         maintain_largest_army(state, color, previous_army_color, previous_army_size)  # type: ignore
 
 
 def player_clean_turn(state, color):
-    key = player_key(state, color)
-    state.player_state[f"{key}_HAS_PLAYED_DEVELOPMENT_CARD_IN_TURN"] = False
-    state.player_state[f"{key}_HAS_ROLLED"] = False
+    record = player_record(state, color)
+    record[PlayerField.HAS_PLAYED_DEVELOPMENT_CARD_IN_TURN] = False
+    record[PlayerField.HAS_ROLLED] = False
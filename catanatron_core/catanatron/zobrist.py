@@ -0,0 +1,71 @@
+"""
+Zobrist-style hashing of States, so that search players can recognize
+states reached through different action orders (e.g. building road A then
+road B, vs B then A).
+
+The board part (pieces and robber) is kept in State.zobrist_hash as a XOR
+of random keys, updated incrementally by apply_action on every build and
+robber move. The rest of the state (hands, flags, whose turn is it) is small
+and changes on almost every action, so get_state_hash combines it in at
+query time instead.
+"""
+import random
+
+from catanatron.models.board import base_map
+from catanatron.models.enums import SETTLEMENT, CITY, ROAD
+from catanatron.models.player import Color
+from catanatron.models.topology import EDGE_IDS, EDGES, NUM_GRAPH_NODES
+
+_rng = random.Random(20210101)  # fixed, so hashes are reproducible
+
+# (color, building_type, node_id or edge_id) => key
+PIECE_KEYS = dict()
+for _color in Color:
+    for _node_id in range(NUM_GRAPH_NODES):
+        for _building_type in [SETTLEMENT, CITY]:
+            PIECE_KEYS[(_color, _building_type, _node_id)] = _rng.getrandbits(64)
+    for _edge in sorted(EDGES):
+        PIECE_KEYS[(_color, ROAD, EDGE_IDS[_edge])] = _rng.getrandbits(64)
+
+# coordinate => key
+ROBBER_KEYS = {
+    coordinate: _rng.getrandbits(64) for coordinate in sorted(base_map.land_tiles)
+}
+
+
+def piece_key(color, building_type, value):
+    """Key of a piece. value is a node_id, or an edge_id for roads."""
+    return PIECE_KEYS[(color, building_type, value)]
+
+
+def compute_zobrist_hash(board):
+    """Computes from scratch what State.zobrist_hash should be for board"""
+    result = ROBBER_KEYS[board.robber_coordinate]
+    for node_id, (color, building_type) in board.buildings.items():
+        result ^= piece_key(color, building_type, node_id)
+    for edge_id, color in enumerate(board.roads):
+        if color is not None:
+            result ^= piece_key(color, ROAD, edge_id)
+    return result
+
+
+def get_state_hash(state):
+    """Hash of everything in state that determines its future (and so its
+    value), except the order of the development card deck."""
+    return hash(
+        (
+            state.zobrist_hash,
+            tuple(tuple(record) for record in state.player_records),
+            state.current_player_index,
+            state.current_turn_index,
+            state.current_prompt,
+            state.is_initial_build_phase,
+            state.is_discarding,
+            state.is_moving_knight,
+            state.is_road_building,
+            state.free_roads_available,
+            state.is_resolving_trade,
+            state.current_trade,
+            state.acceptees,
+        )
+    )
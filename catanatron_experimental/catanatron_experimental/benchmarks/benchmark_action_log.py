@@ -0,0 +1,51 @@
+import random
+import timeit
+
+from catanatron.action_log import ActionLog
+from catanatron.game import Game
+from catanatron.models.player import RandomPlayer, Color
+
+NUMBER = 2000
+
+
+def get_positions(lengths):
+    """Copies of one game at each of the given len(state.actions)"""
+    game = Game(
+        [
+            RandomPlayer(Color.RED),
+            RandomPlayer(Color.BLUE),
+            RandomPlayer(Color.WHITE),
+            RandomPlayer(Color.ORANGE),
+        ],
+        seed=1,
+    )
+    positions = []
+    for length in lengths:
+        while len(game.state.actions) < length and game.winning_color() is None:
+            game.play_tick()
+        positions.append(game.copy())
+    return positions
+
+
+# Copy cost against log length
+for length in [100, 1000, 10000]:
+    as_list = list(range(length))
+    log = ActionLog(as_list)
+    list_result = timeit.timeit(as_list.copy, number=NUMBER) / NUMBER
+    log_result = timeit.timeit(log.copy, number=NUMBER) / NUMBER
+    print(length, "actions:", list_result, "secs; list.copy();", end=" ")
+    print(log_result, "secs; ActionLog.copy()")
+
+# game.copy() along a game (actions are now a small part of it)
+random.seed(1)
+for game in get_positions([100, 300, 600]):
+    result = timeit.timeit(game.copy, number=NUMBER) / NUMBER
+    print(len(game.state.actions), "actions:", result, "secs; game.copy()")
+
+# Results:
+# 100 actions: 1.8150349978895975e-07 secs; list.copy(); 2.9617699965456267e-07 secs; ActionLog.copy()
+# 1000 actions: 3.970477499933622e-06 secs; list.copy(); 3.2443000009152456e-07 secs; ActionLog.copy()
+# 10000 actions: 6.521072850000565e-05 secs; list.copy(); 4.3775199992523993e-07 secs; ActionLog.copy()
+# 100 actions: 0.00023058636899986595 secs; game.copy()
+# 300 actions: 0.0002251362940000945 secs; game.copy()
+# 600 actions: 0.00022104587249987162 secs; game.copy()
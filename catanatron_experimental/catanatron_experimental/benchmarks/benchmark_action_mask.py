@@ -0,0 +1,52 @@
+import timeit
+
+setup = """
+import numpy as np
+from catanatron_gym.envs.catanatron_env import (
+    ACTIONS_ARRAY,
+    ACTION_SPACE_SIZE,
+    CatanatronEnv,
+    normalize_action,
+    to_action_space,
+)
+
+env = CatanatronEnv()
+env.reset(seed=1)  # initial settlement: 54 playable actions
+playable_actions = env.game.state.playable_actions
+
+def old_to_action_space(action):
+    normalized = normalize_action(action)
+    return ACTIONS_ARRAY.index((normalized.action_type, normalized.value))
+
+def old_mask():
+    valid_actions = list(map(old_to_action_space, playable_actions))
+    mask = np.zeros(ACTION_SPACE_SIZE, dtype=bool)
+    mask[valid_actions] = True
+    return mask
+"""
+
+NUMBER = 10000
+result = timeit.timeit(
+    "[old_to_action_space(a) for a in playable_actions]", setup=setup, number=NUMBER
+)
+print(result / NUMBER, "secs; ACTIONS_ARRAY.index for 54 actions (before)")
+result = timeit.timeit(
+    "[to_action_space(a) for a in playable_actions]", setup=setup, number=NUMBER
+)
+print(result / NUMBER, "secs; ACTIONS_INDEX lookup for 54 actions")
+
+result = timeit.timeit("old_mask()", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; mask from get_valid_actions (before)")
+result = timeit.timeit(
+    "env.action_map_source = None; env.get_action_mask()", setup=setup, number=NUMBER
+)
+print(result / NUMBER, "secs; get_action_mask (new state)")
+result = timeit.timeit("env.get_action_mask()", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; get_action_mask (same state, cached map)")
+
+# Results:
+# 0.0006428497670999604 secs; ACTIONS_ARRAY.index for 54 actions (before)
+# 0.00017565382909997426 secs; ACTIONS_INDEX lookup for 54 actions
+# 0.0006216176619999714 secs; mask from get_valid_actions (before)
+# 0.00017828193259992987 secs; get_action_mask (new state)
+# 8.97971159993176e-06 secs; get_action_mask (same state, cached map)
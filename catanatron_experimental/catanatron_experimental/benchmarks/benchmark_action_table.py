@@ -0,0 +1,79 @@
+import timeit
+
+setup = """
+import random
+
+from catanatron.game import Game, is_valid_action
+from catanatron.json import action_from_json
+from catanatron.models.actions import generate_playable_actions
+from catanatron.models.enums import Action
+from catanatron.models.player import Color, RandomPlayer
+from catanatron_gym.envs.catanatron_env import get_action_map
+
+# Every state of a few whole games
+random.seed(1)
+states = []
+for seed in range(5):
+    game = Game([RandomPlayer(color) for color in Color], seed=seed)
+    while game.winning_color() is None and game.state.num_turns < 1000:
+        states.append(game.state.copy())
+        game.play_tick()
+
+# A state with many playable actions, and one of them as the server gets it
+state = max(states, key=lambda s: len(s.playable_actions))
+last_action = Action(*state.playable_actions[-1])
+json_action = [last_action.color.value, last_action.action_type.value, last_action.value]
+"""
+
+NUMBER = 10
+result = timeit.timeit(
+    """
+for state in states:
+    generate_playable_actions(state)
+""",
+    setup=setup,
+    number=NUMBER,
+)
+print(result / NUMBER, "secs; generate_playable_actions on every state of 5 games")
+
+result = timeit.timeit(
+    """
+for state in states:
+    get_action_map(state.playable_actions)
+""",
+    setup=setup,
+    number=NUMBER,
+)
+print(result / NUMBER, "secs; gym get_action_map on every state of 5 games")
+
+NUMBER = 10000
+result = timeit.timeit(
+    "is_valid_action(state, state.playable_actions[-1])", setup=setup, number=NUMBER
+)
+print(result / NUMBER, "secs; is_valid_action (last of many playable actions)")
+result = timeit.timeit(
+    "is_valid_action(state, last_action)", setup=setup, number=NUMBER
+)
+print(result / NUMBER, "secs; is_valid_action (equal plain Action)")
+result = timeit.timeit(
+    "is_valid_action(state, action_from_json(json_action))",
+    setup=setup,
+    number=NUMBER,
+)
+print(result / NUMBER, "secs; action_from_json + is_valid_action")
+
+# Results:
+# Before (new Action namedtuples on every call, membership by list scan):
+# 0.13915286450001077 secs; generate_playable_actions on every state of 5 games
+# 0.07515576309997414 secs; gym get_action_map on every state of 5 games
+# 4.59615269992355e-06 secs; is_valid_action (last of many playable actions)
+# 4.536802300026465e-06 secs; is_valid_action (equal plain Action)
+# 7.707031500012818e-06 secs; action_from_json + is_valid_action
+# After (interned actions with codes, see action_table.py):
+# 0.14438085709998633 secs; generate_playable_actions on every state of 5 games
+# 0.01859950520001803 secs; gym get_action_map on every state of 5 games
+# 1.874348299952544e-06 secs; is_valid_action (last of many playable actions)
+# 4.217016000075091e-06 secs; is_valid_action (equal plain Action)
+# 7.196257399937167e-06 secs; action_from_json + is_valid_action
+# (generate_playable_actions is within noise on this machine: repeated runs
+# of both ranged 0.11-0.14 secs.)
@@ -0,0 +1,70 @@
+import timeit
+
+setup = """
+from catanatron.game import Game
+from catanatron.array_state import ArrayState
+from catanatron.models.player import RandomPlayer, Color
+
+game = Game(
+    [
+        RandomPlayer(Color.RED),
+        RandomPlayer(Color.BLUE),
+        RandomPlayer(Color.WHITE),
+        RandomPlayer(Color.ORANGE),
+    ],
+    seed=1,
+)
+game.play()
+# populate caches, like search players would
+game.state.board.buildable_edges(Color.RED)
+game.state.board.get_player_port_resources(Color.RED)
+
+array_game = game.copy()
+array_game.state = ArrayState.from_state(game.state)
+array_game.state.board.buildable_edges(Color.RED)
+array_game.state.board.get_player_port_resources(Color.RED)
+"""
+
+# Same measurement as benchmark_game_copy.py, for both backends.
+NUMBER = 1000
+result = timeit.timeit("game.copy()", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; game.copy() (State)")
+
+result = timeit.timeit("array_game.copy()", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; game.copy() (ArrayState)")
+
+result = timeit.timeit("game.state.board.copy()", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; board.copy() (Board)")
+
+result = timeit.timeit("array_game.state.board.copy()", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; board.copy() (ArrayBoard)")
+
+# Copy + execute is what search players do on every node.
+NUMBER = 200
+result = timeit.timeit(
+    """
+for action in game.state.playable_actions:
+    game.copy().execute(action, validate_action=False)
+""",
+    setup=setup,
+    number=NUMBER,
+)
+print(result / NUMBER, "secs; copy+execute each playable action (State)")
+
+result = timeit.timeit(
+    """
+for action in array_game.state.playable_actions:
+    array_game.copy().execute(action, validate_action=False)
+""",
+    setup=setup,
+    number=NUMBER,
+)
+print(result / NUMBER, "secs; copy+execute each playable action (ArrayState)")
+
+# Results:
+# 0.0001852828999999474 secs; game.copy() (State)
+# 2.6712769000027947e-05 secs; game.copy() (ArrayState)
+# 0.00011402539100004105 secs; board.copy() (Board)
+# 1.3221698999927866e-05 secs; board.copy() (ArrayBoard)
+# 0.0012861066100003883 secs; copy+execute each playable action (State)
+# 0.00044549076999999214 secs; copy+execute each playable action (ArrayState)
@@ -0,0 +1,43 @@
+import time
+
+from catanatron.game import Game
+from catanatron.models.player import RandomPlayer, Color
+from catanatron_gym.board_tensor_features import create_board_tensor
+
+
+def run(incremental, num_games=20):
+    """create_board_tensor after every tick, like CsvDataAccumulator.step"""
+    num_calls = 0
+    duration = 0
+    for seed in range(num_games):
+        game = Game(
+            [
+                RandomPlayer(Color.RED),
+                RandomPlayer(Color.BLUE),
+                RandomPlayer(Color.WHITE),
+                RandomPlayer(Color.ORANGE),
+            ],
+            seed=seed,
+        )
+        while game.winning_color() is None:
+            game.play_tick()
+            if not incremental:
+                game.state.board.tensor_cache = None  # i.e. build from scratch
+            start = time.time()
+            create_board_tensor(game, game.state.current_color())
+            duration += time.time() - start
+            num_calls += 1
+    print(
+        duration / num_calls,
+        f"secs; create_board_tensor per tick (incremental={incremental})",
+    )
+
+
+run(False)
+run(True)
+
+# Results:
+# 0.000423939712201097 secs; create_board_tensor per tick (incremental=False)
+# 2.4757290922272936e-05 secs; create_board_tensor per tick (incremental=True)
+# Before BoardTensorCache (rebuilding nested lists, then np.array):
+# 0.0015178758375491298 secs; create_board_tensor per tick
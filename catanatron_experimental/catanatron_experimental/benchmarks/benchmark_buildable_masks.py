@@ -0,0 +1,60 @@
+import timeit
+
+setup = """
+import random
+
+from catanatron.game import Game
+from catanatron.models.actions import generate_playable_actions
+from catanatron.models.player import Color, RandomPlayer
+
+# Every state of a few whole games (initial build phase included)
+random.seed(1)
+states = []
+for seed in range(5):
+    game = Game([RandomPlayer(color) for color in Color], seed=seed)
+    while game.winning_color() is None and game.state.num_turns < 1000:
+        states.append(game.state.copy())
+        game.play_tick()
+
+game = Game([RandomPlayer(color) for color in Color], seed=1)
+while game.state.num_turns < 30:
+    game.play_tick()
+board = game.state.board
+color = game.state.colors[0]
+"""
+
+NUMBER = 10
+result = timeit.timeit(
+    """
+for state in states:
+    generate_playable_actions(state)
+""",
+    setup=setup,
+    number=NUMBER,
+)
+print(result / NUMBER, "secs; generate_playable_actions on every state of 5 games")
+
+NUMBER = 10000
+result = timeit.timeit("board.buildable_node_ids(color)", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; buildable_node_ids")
+result = timeit.timeit("board.buildable_edges(color)", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; buildable_edges")
+result = timeit.timeit("board.copy()", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; Board.copy")
+result = timeit.timeit("game.copy().play_tick()", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; Game.copy + play_tick")
+
+# Results:
+# Before (buildable nodes from a set union of components, sorted on every
+# call; buildable edges cache rebuilt after every build):
+# 0.18983770869999717 secs; generate_playable_actions on every state of 5 games
+# 3.589033800017205e-06 secs; buildable_node_ids
+# 8.778716000051645e-07 secs; buildable_edges
+# 0.00017017801230003897 secs; Board.copy
+# 0.0004329684811000334 secs; Game.copy + play_tick
+# After (bitmasks per color, updated on builds):
+# 0.13339605419996586 secs; generate_playable_actions on every state of 5 games
+# 1.0492757000065467e-06 secs; buildable_node_ids
+# 1.032069099983346e-06 secs; buildable_edges
+# 9.754370309992737e-05 secs; Board.copy
+# 0.00032663946980001127 secs; Game.copy + play_tick
@@ -0,0 +1,38 @@
+import timeit
+
+setup = """
+import random
+
+from catanatron.game import Game
+from catanatron.models.player import Color, RandomPlayer
+
+# Late-game board: many roads and components
+random.seed(1)
+game = Game([RandomPlayer(color) for color in Color], seed=1)
+while game.state.num_turns < 120 and game.winning_color() is None:
+    game.play_tick()
+board = game.state.board
+color = game.state.colors[0]
+node_id = max(board.find_connected_components(color)[-1])
+"""
+
+NUMBER = 10000
+result = timeit.timeit(
+    "board._get_connected_component_index(node_id, color)", setup=setup, number=NUMBER
+)
+print(result / NUMBER, "secs; _get_connected_component_index")
+result = timeit.timeit("board.copy()", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; Board.copy")
+result = timeit.timeit("game.state.copy()", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; State.copy")
+
+# Results:
+# Before (components as lists of node sets, searched linearly; pickled on
+# Board.copy, and the port resources cache deep-copied):
+# 1.5830620999622624e-06 secs; _get_connected_component_index
+# 0.00010518614390002767 secs; Board.copy
+# 0.00021762536859996543 secs; State.copy
+# After (component bitmasks plus node => component index, shared by copies):
+# 7.441921999998158e-07 secs; _get_connected_component_index
+# 1.11297082999954e-05 secs; Board.copy
+# 9.656844990004174e-05 secs; State.copy
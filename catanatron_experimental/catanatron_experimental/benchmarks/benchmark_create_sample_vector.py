@@ -5,7 +5,8 @@ from catanatron.game import Game
 from catanatron.models.player import RandomPlayer, Color
 from catanatron_gym.features import (
     create_sample_vector, expansion_features, reachability_features,
-    graph_features, tile_features
+    graph_features, tile_features, create_sample_array, create_sample_matrix,
+    get_feature_ordering
 )
 
 game = Game(
@@ -27,6 +28,36 @@ result = timeit.timeit(
 )
 print("create_sample_vector\t", result / NUMBER, "secs")
 
+result = timeit.timeit(
+    "create_sample_array(game, game.state.colors[0])",
+    setup=setup,
+    number=NUMBER,
+)
+print("create_sample_array\t", result / NUMBER, "secs")
+
+# what CatanatronEnv did per observation, vs now
+result = timeit.timeit(
+    "np.array([float(x) for x in create_sample_vector(game, game.state.colors[0])])",
+    setup=setup + "import numpy as np",
+    number=NUMBER,
+)
+print("env observation (before)", result / NUMBER, "secs")
+
+result = timeit.timeit(
+    "create_sample_array(game, game.state.colors[0], features).astype(float)",
+    setup=setup + "features = get_feature_ordering(4)",
+    number=NUMBER,
+)
+print("env observation (now)\t", result / NUMBER, "secs")
+
+# batch mode: 64 games into one (64, F) matrix (per game)
+result = timeit.timeit(
+    "create_sample_matrix(games, colors)",
+    setup=setup + "games = [game] * 64; colors = [game.state.colors[0]] * 64",
+    number=NUMBER // 64,
+)
+print("create_sample_matrix\t", result / (NUMBER // 64) / 64, "secs per game")
+
 result = timeit.timeit(
     "expansion_features(game, game.state.colors[0])",
     setup=setup,
@@ -67,3 +98,10 @@ print("tile_features\t\t", result / NUMBER, "secs")
 # reachability_features	 0.00039436871399811934 secs
 # graph_features		 1.5904047002550214e-05 secs
 # tile_features		     3.960479953093454e-07 secs
+
+# Results (with compiled FeaturePlan, on a slower machine):
+# create_sample_vector	 0.0006727004399999714 secs
+# create_sample_array	 0.0001899896750001062 secs
+# env observation (before) 0.0008383299210004225 secs
+# env observation (now)	 0.00017540464000012434 secs
+# create_sample_matrix	 0.00013605614999979328 secs per game
@@ -34,3 +34,60 @@ result = timeit.timeit(
     "edge_id[(a,b)]", setup="a = 20; b = 45; edge_id = {(a,b): 1}", number=2_000_000
 )
 print("MAP LOOKUP", result)
+
+# Integer edge ids (see topology.py): roads are a flat list indexed by id.
+result = timeit.timeit(
+    "roads[edge_id]", setup="edge_id = 20; roads = [None] * 132", number=2_000_000
+)
+print("LIST INDEX", result)
+
+setup = """
+import random
+
+from catanatron.game import Game
+from catanatron.models.player import Color, RandomPlayer
+
+random.seed(1)
+game = Game([RandomPlayer(color) for color in Color], seed=1)
+while game.state.num_turns < 30:
+    game.play_tick()
+board = game.state.board
+color = game.state.colors[0]
+"""
+number = 10000
+result = timeit.timeit("board.copy()", setup=setup, number=number)
+print(result / number, "secs; Board.copy")
+result = timeit.timeit(
+    # edge masks are kept up to date on builds, so recompute them to time a cold call
+    "board._update_reachable_masks(color); board.buildable_edges(color)",
+    setup=setup,
+    number=number,
+)
+print(result / number, "secs; buildable_edges (recomputed)")
+result = timeit.timeit(
+    "game.copy().play_tick()",
+    setup=setup,
+    number=number,
+)
+print(result / number, "secs; Game.copy + play_tick")
+
+# Results:
+# TODAY 1.2430354900006932
+# TERNARY 0.19948362700051803
+# FUNC TERNARY 0.5781188199998724
+# FUNC TERNARY 2 PARAMS 0.36609300799955236
+# MIN MAX 1.9674619040006291
+# MAP LOOKUP 0.4747147859998222
+# LIST INDEX 0.0811120819998905
+# Before (roads as dict of (a, b) edges, in both orientations):
+# 0.00016777464850001707 secs; Board.copy
+# 1.787549079999735e-05 secs; buildable_edges
+# 0.00039515018940001025 secs; Game.copy + play_tick
+# After (roads as list by edge id):
+# 0.00016267280089996347 secs; Board.copy
+# 7.2129440000026075e-06 secs; buildable_edges
+# 0.0003630850189999364 secs; Game.copy + play_tick
+# Now (buildable edges kept as bitmasks, recomputed from components above):
+# 5.784766299984767e-06 secs; Board.copy
+# 1.3684264900075504e-05 secs; buildable_edges (recomputed)
+# 8.617858899997373e-05 secs; Game.copy + play_tick
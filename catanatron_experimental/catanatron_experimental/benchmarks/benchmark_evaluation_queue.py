@@ -0,0 +1,87 @@
+import time
+
+import numpy as np
+
+from catanatron.game import Game
+from catanatron.models.player import RandomPlayer, Color
+from catanatron_gym.features import create_sample_vector
+from catanatron_experimental.machine_learning.players.evaluation import (
+    EvaluationQueue,
+    LinearBackend,
+)
+
+
+def get_leaves(num_leaves):
+    game = Game(
+        [
+            RandomPlayer(Color.RED),
+            RandomPlayer(Color.BLUE),
+        ],
+        seed=1,
+    )
+    leaves = []
+    while len(leaves) < num_leaves:
+        if game.winning_color() is not None:
+            game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)])
+        game.play_tick()
+        leaves.append((game.copy(), game.state.current_color()))
+    return leaves
+
+
+class DenseBackend(LinearBackend):
+    """A small MLP, to see the effect on a model where a call costs more"""
+
+    def __init__(self):
+        super().__init__()
+        rng = np.random.default_rng(1)
+        self.hidden = rng.normal(size=(len(self.features), 256)).astype(np.float32)
+        self.output = rng.normal(size=256).astype(np.float32)
+
+    def predict(self, matrix):
+        return np.maximum(matrix @ self.hidden, 0) @ self.output
+
+
+leaves = get_leaves(2000)
+for backend in [LinearBackend(), DenseBackend()]:
+    name = type(backend).__name__
+
+    start = time.time()
+    for game, color in leaves:
+        vector = create_sample_vector(game, color, backend.features)
+        backend.predict(np.array([vector], dtype=np.float32))
+    print(len(leaves) / (time.time() - start), f"leaves/sec; {name} single-sample")
+
+    for batch_size in [8, 64, 256]:
+        queue = EvaluationQueue(backend, batch_size)
+        start = time.time()
+        futures = [queue.submit(game, color) for game, color in leaves]
+        queue.flush()
+        duration = time.time() - start
+        print(len(leaves) / duration, f"leaves/sec; {name} batch_size={batch_size}")
+
+    # model calls alone (without building features)
+    matrix = np.ones((len(leaves), len(backend.features)), dtype=np.float32)
+    start = time.time()
+    for i in range(len(leaves)):
+        backend.predict(matrix[i : i + 1])
+    print(len(leaves) / (time.time() - start), f"rows/sec; {name}.predict 1 row")
+    start = time.time()
+    for i in range(0, len(leaves), 64):
+        backend.predict(matrix[i : i + 64])
+    print(len(leaves) / (time.time() - start), f"rows/sec; {name}.predict 64 rows")
+
+# Results:
+# 3894.434491380915 leaves/sec; LinearBackend single-sample
+# 4157.510036179809 leaves/sec; LinearBackend batch_size=8
+# 4013.703401735509 leaves/sec; LinearBackend batch_size=64
+# 3484.995828943476 leaves/sec; LinearBackend batch_size=256
+# 94756.55159949395 rows/sec; LinearBackend.predict 1 row
+# 2383127.272727273 rows/sec; LinearBackend.predict 64 rows
+# 3758.5743543834983 leaves/sec; DenseBackend single-sample
+# 3820.9059646086225 leaves/sec; DenseBackend batch_size=8
+# 4158.047901324402 leaves/sec; DenseBackend batch_size=64
+# 4028.394569649006 leaves/sec; DenseBackend batch_size=256
+# 51366.47704658041 rows/sec; DenseBackend.predict 1 row
+# 223630.61501959426 rows/sec; DenseBackend.predict 64 rows
+# i.e. batching makes model calls 4-25x cheaper per leaf, but building the
+# features of a leaf (create_sample_vector, ~0.25ms) dominates end to end.
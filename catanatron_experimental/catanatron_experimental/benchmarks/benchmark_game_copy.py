@@ -35,10 +35,10 @@ board = dict()
 board['map'] = game.state.board.map  # for caching speedups
 board['buildings'] = game.state.board.buildings.copy()
 board['roads'] = game.state.board.roads.copy()
-board['connected_components'] = game.state.board.connected_components.copy()
+board['component_masks'] = game.state.board.component_masks.copy()
 
 state_copy = dict()
-state_copy['colors'] = game.state.colors.copy()
+state_copy['colors'] = game.state.colors  # immutable
 state_copy['board'] = board
 state_copy['actions'] = game.state.actions.copy()
 state_copy['resource_freqdeck'] = game.state.resource_freqdeck.copy()
@@ -68,7 +68,7 @@ board = {
     'map': game.state.board.map,
     'buildings': game.state.board.buildings.copy(),
     'roads': game.state.board.roads.copy(),
-    'connected_components': game.state.board.connected_components.copy(),
+    'component_masks': game.state.board.component_masks.copy(),
 }
 
 state_copy = {
@@ -83,8 +83,28 @@ state_copy = {
 )
 print(result / NUMBER, "secs; theoretical-limit? (arrays + dicts + map-reuse)")
 
+# 4 =====
+# Copy-on-write forks. Branching searches apply a few actions to each copy.
+result = timeit.timeit("game.fork()", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; game.fork()")
+for method in ["copy", "fork"]:
+    result = timeit.timeit(
+        f"""
+game_copy = game.{method}()
+game_copy.execute(action, validate_action=False)
+""",
+        setup=setup + "action = game.state.playable_actions[0]",
+        number=NUMBER,
+    )
+    print(result / NUMBER, f"secs; game.{method}() + execute")
+
 
 # Results:
 # 3.558104199999998e-05 secs; game.copy()
 # 5.459833999999997e-06 secs; hand-hydrated
 # 2.3131659999999776e-06 secs; theoretical-limit? (arrays + dicts + map-reuse)
+# On a slower machine, with game.fork():
+# 0.0003127719459998843 secs; game.copy()
+# 1.4656852999905823e-05 secs; game.fork()
+# 0.00037393899600010627 secs; game.copy() + execute
+# 4.108300099960616e-05 secs; game.fork() + execute
@@ -0,0 +1,97 @@
+import random
+import time
+
+from catanatron.game import Game
+from catanatron.models.player import RandomPlayer, Color
+from catanatron_experimental.machine_learning.players.minimax import (
+    AlphaBetaPlayer,
+    DebugStateNode,
+)
+
+
+class CountingAlphaBetaPlayer(AlphaBetaPlayer):
+    num_nodes = 0
+
+    def alphabeta(self, game, depth, alpha, beta, deadline, node):
+        self.num_nodes += 1
+        return super().alphabeta(game, depth, alpha, beta, deadline, node)
+
+
+class FixedDepthAlphaBetaPlayer(CountingAlphaBetaPlayer):
+    """Previous behavior: single search at self.depth, no move ordering"""
+
+    def decide(self, game, playable_actions):
+        node = DebugStateNode("root", self.color)
+        deadline = time.time() + self.time_budget_ms / 1000
+        action, _ = self.alphabeta(
+            game.copy(), self.depth, float("-inf"), float("inf"), deadline, node
+        )
+        return action or playable_actions[0]
+
+    def order_actions(self, game, actions, depth, maximizing, key):
+        return actions
+
+
+def get_positions(num_positions):
+    """Mid-game positions with a handful of actions to choose from"""
+    game = Game(
+        [
+            RandomPlayer(Color.RED),
+            RandomPlayer(Color.BLUE),
+            RandomPlayer(Color.WHITE),
+            RandomPlayer(Color.ORANGE),
+        ],
+        seed=1,
+    )
+    positions = []
+    while len(positions) < num_positions and game.winning_color() is None:
+        game.play_tick()
+        num_actions = len(game.state.actions)
+        if (
+            num_actions > 100
+            and num_actions % 5 == 0
+            and len(game.state.playable_actions) > 3
+        ):
+            positions.append(game.copy())
+    return positions
+
+
+def run(player_class, depth, time_budget_ms=20000):
+    num_nodes = 0
+    max_duration = 0
+    start = time.time()
+    for game in positions:
+        player = player_class(
+            game.state.current_color(), depth, True, time_budget_ms=time_budget_ms
+        )
+        decision_start = time.time()
+        player.decide(game, game.state.playable_actions)
+        max_duration = max(max_duration, time.time() - decision_start)
+        num_nodes += player.num_nodes
+    duration = time.time() - start
+    print(
+        f"{player_class.__name__} depth={depth} budget={time_budget_ms}ms:",
+        num_nodes / len(positions),
+        "nodes/decision;",
+        duration / len(positions),
+        "secs/decision;",
+        max_duration,
+        "max secs/decision",
+    )
+
+
+random.seed(1)
+positions = get_positions(30)
+for depth in [2, 3]:
+    run(FixedDepthAlphaBetaPlayer, depth)
+    run(CountingAlphaBetaPlayer, depth)
+
+# Anytime: deeper searches return around the budget (it is checked at leafs)
+run(CountingAlphaBetaPlayer, 4, time_budget_ms=100)
+
+# Results:
+# FixedDepthAlphaBetaPlayer depth=2 budget=20000ms: 45.37 nodes/decision; 0.01874 secs/decision; 0.1089 max secs/decision
+# CountingAlphaBetaPlayer depth=2 budget=20000ms: 40.2 nodes/decision; 0.01633 secs/decision; 0.1142 max secs/decision
+# FixedDepthAlphaBetaPlayer depth=3 budget=20000ms: 307.6 nodes/decision; 0.1111 secs/decision; 1.1206 max secs/decision
+# CountingAlphaBetaPlayer depth=3 budget=20000ms: 289.8 nodes/decision; 0.1078 secs/decision; 1.3040 max secs/decision
+# CountingAlphaBetaPlayer depth=4 budget=100ms: 178.47 nodes/decision; 0.0676 secs/decision; 0.1179 max secs/decision
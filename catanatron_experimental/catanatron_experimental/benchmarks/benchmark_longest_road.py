@@ -0,0 +1,56 @@
+import timeit
+
+setup = """
+from catanatron.models.board import (
+    Board,
+    longest_acyclic_path,
+    longest_road_length,
+    _longest_trail_length,
+)
+from catanatron.models.player import Color
+
+# Highly branched network: keep adding the lowest buildable edge, which
+# grows a honeycomb (with cycles) around the center of the board. More than
+# 15 roads is not reachable in a game, but shows how both searches scale.
+board = Board()
+board.build_settlement(Color.RED, 0, initial_build_phase=True)
+for _ in range(NUM_ROADS):
+    board.build_road(Color.RED, min(board.buildable_edges(Color.RED)))
+(component,) = board.find_connected_components(Color.RED)
+"""
+
+for num_roads in [15, 25, 35]:
+    number = 3
+    result = timeit.timeit(
+        "longest_acyclic_path(board, component, Color.RED)",
+        setup=setup.replace("NUM_ROADS", str(num_roads)),
+        number=number,
+    )
+    print(result / number, f"secs; longest_acyclic_path ({num_roads} roads)")
+
+    number = 10
+    result = timeit.timeit(
+        "_longest_trail_length.cache_clear(); longest_road_length(board, component, Color.RED)",
+        setup=setup.replace("NUM_ROADS", str(num_roads)),
+        number=number,
+    )
+    print(result / number, f"secs; longest_road_length ({num_roads} roads)")
+
+    number = 1000
+    result = timeit.timeit(
+        "longest_road_length(board, component, Color.RED)",
+        setup=setup.replace("NUM_ROADS", str(num_roads)),
+        number=number,
+    )
+    print(result / number, f"secs; longest_road_length, memoized ({num_roads} roads)")
+
+# Results:
+# 0.0029736553333350457 secs; longest_acyclic_path (15 roads)
+# 0.0005752454000003127 secs; longest_road_length (15 roads)
+# 6.611618600004477e-05 secs; longest_road_length, memoized (15 roads)
+# 0.030388369666676834 secs; longest_acyclic_path (25 roads)
+# 0.003988567399983367 secs; longest_road_length (25 roads)
+# 9.581960300010906e-05 secs; longest_road_length, memoized (25 roads)
+# 0.15613805033331118 secs; longest_acyclic_path (35 roads)
+# 0.02156507550000697 secs; longest_road_length (35 roads)
+# 0.00011265326299985645 secs; longest_road_length, memoized (35 roads)
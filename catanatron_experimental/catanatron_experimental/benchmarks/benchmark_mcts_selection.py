@@ -0,0 +1,74 @@
+import random
+import time
+
+import numpy as np
+
+from catanatron.game import Game
+from catanatron.models.player import RandomPlayer, Color
+from catanatron_experimental.machine_learning.players.mcts import StateNode
+
+
+def get_positions(num_positions):
+    """Initial-placement positions (the widest nodes of the tree)"""
+    positions = []
+    for seed in range(num_positions):
+        game = Game(
+            [
+                RandomPlayer(Color.RED),
+                RandomPlayer(Color.BLUE),
+                RandomPlayer(Color.WHITE),
+                RandomPlayer(Color.ORANGE),
+            ],
+            seed=seed,
+        )
+        for _ in range(seed % 8):  # settlement or road of some player
+            game.play_tick()
+        positions.append(game)
+    return positions
+
+
+def run(num_simulations, **kwargs):
+    duration = 0
+    for game in positions:
+        root = StateNode(game.state.current_color(), game.copy(), None)
+        start = time.time()
+        root.run_simulations(num_simulations, **kwargs)
+        duration += time.time() - start
+    total = num_simulations * len(positions)
+    print(
+        total / duration,
+        f"sims/sec; {num_simulations} simulations per position {kwargs}",
+    )
+
+
+def run_selection(num_selections):
+    """Just choose_best_action at roots with stats, as if after 100 simulations"""
+    duration = 0
+    for game in positions:
+        root = StateNode(game.state.current_color(), game.copy(), None)
+        for _ in range(100):
+            root.run_simulation()
+        start = time.time()
+        for _ in range(num_selections):
+            root.choose_best_action()
+        duration += time.time() - start
+    total = num_selections * len(positions)
+    print(total / duration, "selections/sec; choose_best_action at root")
+
+
+random.seed(1)
+np.random.seed(1)
+positions = get_positions(8)
+run_selection(1000)
+run(100)
+run(100, batch_size=8)
+
+# Results:
+# 99506.63092216081 selections/sec; choose_best_action at root
+# 24.93897169412615 sims/sec; 100 simulations per position {}
+# 25.57738230517516 sims/sec; 100 simulations per position {'batch_size': 8}
+# Before (loop over actions with per-child math.log):
+# 28962.81251753292 selections/sec; choose_best_action at root
+# 28.431747568241587 sims/sec; 100 simulations per position {}
+# Simulations are dominated by random playouts (~40ms each), so sims/sec
+# mostly varies with how long those games are.
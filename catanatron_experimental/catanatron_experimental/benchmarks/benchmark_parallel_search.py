@@ -0,0 +1,87 @@
+import time
+import timeit
+
+from catanatron.game import Game
+from catanatron.models.player import RandomPlayer, Color
+from catanatron_experimental.machine_learning.players.mcts import MCTSPlayer
+from catanatron_experimental.machine_learning.players.minimax import AlphaBetaPlayer
+from catanatron_experimental.machine_learning.players.parallel import (
+    NUM_WORKERS,
+    get_worker_pool,
+)
+
+setup = """
+import pickle
+from catanatron.game import Game
+from catanatron.models.player import RandomPlayer, Color
+from catanatron_experimental.machine_learning.players.parallel import (
+    decode_game,
+    encode_game,
+)
+
+game = Game(
+    [
+        RandomPlayer(Color.RED),
+        RandomPlayer(Color.BLUE),
+        RandomPlayer(Color.WHITE),
+        RandomPlayer(Color.ORANGE),
+    ],
+    seed=1,
+)
+for _ in range(300):
+    game.play_tick()
+"""
+
+# What is sent to workers, per task
+exec(setup)
+print(len(pickle.dumps(game)), "bytes; pickle.dumps(game)")  # type: ignore
+print(len(encode_game(game)), "bytes; encode_game(game)")  # type: ignore
+
+NUMBER = 1000
+result = timeit.timeit("pickle.loads(pickle.dumps(game))", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; pickle round trip")
+result = timeit.timeit("decode_game(encode_game(game))", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; encode_game/decode_game round trip")
+
+# Decision time by number of workers.
+game = Game(
+    [
+        RandomPlayer(Color.RED),
+        RandomPlayer(Color.BLUE),
+        RandomPlayer(Color.WHITE),
+        RandomPlayer(Color.ORANGE),
+    ],
+    seed=1,
+)
+# first settlement has the most actions to choose from
+actions = game.state.playable_actions
+print(NUM_WORKERS, "cpus;", len(actions), "actions")
+for num_workers in sorted(set([1, 2, 4, 8, NUM_WORKERS])):
+    if num_workers > 1:
+        get_worker_pool(num_workers)  # grown once per size, not timed
+
+    player = AlphaBetaPlayer(game.state.current_color(), 2, num_workers=num_workers)
+    start = time.time()
+    player.decide(game, actions)
+    print(time.time() - start, f"secs; AlphaBetaPlayer decide ({num_workers} workers)")
+
+    player = MCTSPlayer(game.state.current_color(), 16, num_workers=num_workers)
+    start = time.time()
+    player.decide(game, actions)
+    print(time.time() - start, f"secs; MCTSPlayer decide ({num_workers} workers)")
+
+# Results (on a 1 cpu machine, so this only shows the pool's overhead;
+# with more cores, work per worker shrinks by the number of workers):
+# 27085 bytes; pickle.dumps(game)
+# 11504 bytes; encode_game(game)
+# 0.0024136399340000027 secs; pickle round trip
+# 0.0011102136710001104 secs; encode_game/decode_game round trip
+# 1 cpus; 54 actions
+# 0.12826156616210938 secs; AlphaBetaPlayer decide (1 workers)
+# 0.7520482540130615 secs; MCTSPlayer decide (1 workers)
+# 0.12194609642028809 secs; AlphaBetaPlayer decide (2 workers)
+# 0.7117304801940918 secs; MCTSPlayer decide (2 workers)
+# 0.15007424354553223 secs; AlphaBetaPlayer decide (4 workers)
+# 0.860541582107544 secs; MCTSPlayer decide (4 workers)
+# 0.14523816108703613 secs; AlphaBetaPlayer decide (8 workers)
+# 0.8113815784454346 secs; MCTSPlayer decide (8 workers)
@@ -0,0 +1,61 @@
+import timeit
+
+setup = """
+from catanatron.game import Game
+from catanatron.models.actions import generate_playable_actions
+from catanatron.models.player import RandomPlayer, Color
+from catanatron.state_functions import player_num_resource_cards
+
+# Sample mid-game states (after initial building phase, before the end)
+states = []
+for seed in range(10):
+    game = Game(
+        [
+            RandomPlayer(Color.RED),
+            RandomPlayer(Color.BLUE),
+            RandomPlayer(Color.WHITE),
+            RandomPlayer(Color.ORANGE),
+        ],
+        seed=seed,
+    )
+    for tick in range(400):
+        if game.winning_color() is not None:
+            break
+        game.play_tick()
+        if tick >= 100 and tick % 10 == 0:
+            states.append(game.state.copy())
+game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)], seed=1)
+game.play()
+"""
+
+NUMBER = 100
+result = timeit.timeit(
+    """
+for state in states:
+    generate_playable_actions(state)
+""",
+    setup=setup,
+    number=NUMBER,
+)
+print(result / NUMBER, "secs; generate_playable_actions on 300 mid-game states")
+
+NUMBER = 100000
+result = timeit.timeit(
+    "player_num_resource_cards(game.state, Color.RED)",
+    setup=setup,
+    number=NUMBER,
+)
+print(result / NUMBER, "secs; player_num_resource_cards")
+
+result = timeit.timeit("game.winning_color()", setup=setup, number=NUMBER)
+print(result / NUMBER, "secs; game.winning_color()")
+
+# Results:
+# Before (player_state as a dict with "P<seat>_<FIELD>" keys):
+# 0.007260671730000468 secs; generate_playable_actions on 300 mid-game states
+# 1.097564860001512e-06 secs; player_num_resource_cards
+# 1.4238064599999233e-06 secs; game.winning_color()
+# After (player_records indexed by PlayerField):
+# 0.0047383666399991855 secs; generate_playable_actions on 300 mid-game states
+# 9.293489600008797e-07 secs; player_num_resource_cards
+# 7.38160670000525e-07 secs; game.winning_color()
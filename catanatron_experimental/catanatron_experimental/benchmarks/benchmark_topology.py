@@ -0,0 +1,55 @@
+import timeit
+
+setup = """
+import random
+
+from catanatron.game import Game
+from catanatron.models.player import Color, RandomPlayer
+from catanatron_gym.features import expansion_features
+
+# Mid-game board: roads and buildings of 4 players.
+random.seed(1)
+game = Game([RandomPlayer(color) for color in Color], seed=1)
+while game.state.num_turns < 30:
+    game.play_tick()
+board = game.state.board
+color = game.state.colors[0]
+(node_id, *_) = board.find_connected_components(color)[0]
+"""
+
+number = 10000
+result = timeit.timeit(
+    # edge masks are kept up to date on builds, so recompute them (cold call)
+    "board._update_reachable_masks(color); board.buildable_edges(color)",
+    setup=setup,
+    number=number,
+)
+print(result / number, "secs; buildable_edges (recomputed)")
+
+result = timeit.timeit(
+    "board.dfs_walk(node_id, color)",
+    setup=setup,
+    number=number,
+)
+print(result / number, "secs; dfs_walk")
+
+number = 1000
+result = timeit.timeit(
+    "expansion_features(game, color)",
+    setup=setup,
+    number=number,
+)
+print(result / number, "secs; expansion_features")
+
+# Results (networkx graphs; buildable_subgraph, edge_subgraph + bfs_edges):
+# 0.00014976943150004444 secs; buildable_edges
+# 1.4842676799980837e-05 secs; dfs_walk
+# 0.0024333519689998867 secs; expansion_features
+# Results (topology.py tables):
+# 1.904404249999061e-05 secs; buildable_edges
+# 1.5049225100028707e-05 secs; dfs_walk
+# 0.0006795174219996625 secs; expansion_features
+# Results (bitmasks per color; buildable edges recomputed from components):
+# 8.010578399989755e-06 secs; buildable_edges (recomputed)
+# 3.753129100005026e-06 secs; dfs_walk
+# 0.0003098092109994468 secs; expansion_features
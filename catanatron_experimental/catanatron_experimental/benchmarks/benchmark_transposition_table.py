@@ -0,0 +1,77 @@
+import random
+import time
+
+from catanatron.game import Game
+from catanatron.models.player import RandomPlayer, Color
+from catanatron_experimental.machine_learning.players.minimax import AlphaBetaPlayer
+
+
+class CountingAlphaBetaPlayer(AlphaBetaPlayer):
+    num_nodes = 0
+
+    def alphabeta(self, game, depth, alpha, beta, deadline, node):
+        self.num_nodes += 1
+        return super().alphabeta(game, depth, alpha, beta, deadline, node)
+
+
+def get_positions(num_positions):
+    """Mid-game positions with a handful of actions to choose from"""
+    game = Game(
+        [
+            RandomPlayer(Color.RED),
+            RandomPlayer(Color.BLUE),
+            RandomPlayer(Color.WHITE),
+            RandomPlayer(Color.ORANGE),
+        ],
+        seed=1,
+    )
+    positions = []
+    while len(positions) < num_positions and game.winning_color() is None:
+        game.play_tick()
+        num_actions = len(game.state.actions)
+        if (
+            num_actions > 100
+            and num_actions % 5 == 0
+            and len(game.state.playable_actions) > 3
+        ):
+            positions.append(game.copy())
+    return positions
+
+
+random.seed(1)
+positions = get_positions(30)
+for depth in [2, 3]:
+    for transposition_table in [False, True]:
+        num_nodes = 0
+        hits, probes = 0, 0
+        start = time.time()
+        for game in positions:
+            player = CountingAlphaBetaPlayer(
+                game.state.current_color(),
+                depth,
+                True,
+                transposition_table=transposition_table,
+            )
+            player.decide(game, game.state.playable_actions)
+            num_nodes += player.num_nodes
+            if player.transposition_table is not None:
+                hits += player.transposition_table.hits
+                probes += player.transposition_table.hits
+                probes += player.transposition_table.misses
+        duration = time.time() - start
+        print(
+            f"depth={depth} transposition_table={transposition_table}:",
+            num_nodes / len(positions),
+            "nodes/decision;",
+            (num_nodes - hits) / len(positions),
+            "searched nodes/decision (not resolved by table);",
+            duration / len(positions),
+            "secs/decision;",
+            f"hit_rate={hits / probes if probes else 0:.3f}",
+        )
+
+# Results (positions vary a bit between runs, because of set iteration order):
+# depth=2 transposition_table=False: 39.67 nodes/decision; 39.67 searched nodes/decision (not resolved by table); 0.01916 secs/decision; hit_rate=0.000
+# depth=2 transposition_table=True: 39.67 nodes/decision; 33.37 searched nodes/decision (not resolved by table); 0.01265 secs/decision; hit_rate=0.159
+# depth=3 transposition_table=False: 252.03 nodes/decision; 252.03 searched nodes/decision (not resolved by table); 0.09420 secs/decision; hit_rate=0.000
+# depth=3 transposition_table=True: 207.17 nodes/decision; 169.83 searched nodes/decision (not resolved by table); 0.06235 secs/decision; hit_rate=0.180
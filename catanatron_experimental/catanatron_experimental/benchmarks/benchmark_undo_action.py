@@ -0,0 +1,44 @@
+import timeit
+
+setup = """
+from catanatron.game import Game
+from catanatron.models.player import RandomPlayer, Color
+
+game = Game(
+    [
+        RandomPlayer(Color.RED),
+        RandomPlayer(Color.BLUE),
+        RandomPlayer(Color.WHITE),
+        RandomPlayer(Color.ORANGE),
+    ],
+    seed=1,
+)
+for _ in range(300):
+    game.play_tick()
+"""
+
+# What search players do on every node: expand each playable action.
+NUMBER = 200
+result = timeit.timeit(
+    """
+for action in game.state.playable_actions:
+    game.copy().execute(action, validate_action=False)
+""",
+    setup=setup,
+    number=NUMBER,
+)
+print(result / NUMBER, "secs; copy+execute each playable action")
+
+result = timeit.timeit(
+    """
+for action in game.state.playable_actions:
+    game.undo(game.execute_with_undo(action, validate_action=False))
+""",
+    setup=setup,
+    number=NUMBER,
+)
+print(result / NUMBER, "secs; execute_with_undo+undo each playable action")
+
+# Results:
+# 0.00273340014500036 secs; copy+execute each playable action
+# 0.0011990919449999637 secs; execute_with_undo+undo each playable action
@@ -0,0 +1,80 @@
+import timeit
+
+setup = """
+import random
+from collections import defaultdict
+
+from catanatron.game import Game
+from catanatron.state import yield_resources
+from catanatron.models.enums import RESOURCES, SETTLEMENT, CITY, ActionType
+from catanatron.models.decks import freqdeck_can_draw, freqdeck_replenish
+from catanatron.models.player import RandomPlayer, Color
+
+# Previous implementation, walking every tile on every roll.
+def tile_walk_yield_resources(board, resource_freqdeck, number):
+    intented_payout = defaultdict(lambda: defaultdict(int))
+    resource_totals = defaultdict(int)
+    for coordinate, tile in board.map.land_tiles.items():
+        if tile.number != number or board.robber_coordinate == coordinate:
+            continue
+        for node_id in tile.nodes.values():
+            building = board.buildings.get(node_id, None)
+            if building is None:
+                continue
+            elif building[1] == SETTLEMENT:
+                intented_payout[building[0]][tile.resource] += 1
+                resource_totals[tile.resource] += 1
+            elif building[1] == CITY:
+                intented_payout[building[0]][tile.resource] += 2
+                resource_totals[tile.resource] += 2
+    depleted = []
+    for resource in RESOURCES:
+        if not freqdeck_can_draw(resource_freqdeck, resource_totals[resource], resource):
+            depleted.append(resource)
+    payout = {}
+    for player, player_payout in intented_payout.items():
+        payout[player] = [0, 0, 0, 0, 0]
+        for resource, count in player_payout.items():
+            if resource not in depleted:
+                freqdeck_replenish(payout[player], count, resource)
+    return payout, depleted
+
+game = Game(
+    [
+        RandomPlayer(Color.RED),
+        RandomPlayer(Color.BLUE),
+        RandomPlayer(Color.WHITE),
+        RandomPlayer(Color.ORANGE),
+    ],
+    seed=1,
+)
+game.play()
+board = game.state.board
+bank = game.state.resource_freqdeck
+
+# The rolls of a full game
+rolls = [
+    sum(a.value)
+    for a in game.state.actions
+    if a.action_type == ActionType.ROLL
+]
+"""
+
+NUMBER = 1000
+result = timeit.timeit(
+    "for number in rolls: tile_walk_yield_resources(board, bank, number)",
+    setup=setup,
+    number=NUMBER,
+)
+print(result / NUMBER, "secs; yield_resources for a game's rolls (tile walk)")
+
+result = timeit.timeit(
+    "for number in rolls: yield_resources(board, bank, number)",
+    setup=setup,
+    number=NUMBER,
+)
+print(result / NUMBER, "secs; yield_resources for a game's rolls (payout table)")
+
+# Results (a 4-player random game has ~400-600 rolls):
+# 0.002725983731999804 secs; yield_resources for a game's rolls (tile walk)
+# 0.0009340091250001024 secs; yield_resources for a game's rolls (payout table)
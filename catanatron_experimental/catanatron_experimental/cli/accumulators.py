@@ -18,6 +18,7 @@ from catanatron.models.enums import VICTORY_POINT, SETTLEMENT, CITY
 from catanatron_server.models import database_session, upsert_game_state
 from catanatron_server.utils import ensure_link
 from catanatron_experimental.utils import formatSecs
+from catanatron_experimental.cli.summaries import Histogram, RunningStats
 from catanatron_experimental.machine_learning.utils import (
     get_discounted_return,
     get_tournament_return,
@@ -68,6 +69,23 @@ class VpDistributionAccumulator(GameAccumulator):
 
         self.num_games += 1
 
+    def partial(self):
+        return dict(
+            cities=dict(self.cities),
+            settlements=dict(self.settlements),
+            devvps=dict(self.devvps),
+            longest=dict(self.longest),
+            largest=dict(self.largest),
+            num_games=self.num_games,
+        )
+
+    def merge(self, partial):
+        for key in ["cities", "settlements", "devvps", "longest", "largest"]:
+            counts = getattr(self, key)
+            for color, count in partial[key].items():
+                counts[color] += count
+        self.num_games += partial["num_games"]
+
     def get_avg_cities(self, color=None):
         if color is None:
             return sum(self.cities.values()) / self.num_games
@@ -100,13 +118,17 @@ class VpDistributionAccumulator(GameAccumulator):
 
 
 class StatisticsAccumulator(GameAccumulator):
+    """
+    Wins per player, and running summaries (in constant memory) of the
+    turns, ticks, durations and victory points of finished games.
+    """
+
     def __init__(self):
         self.wins = defaultdict(int)
-        self.turns = []
-        self.ticks = []
-        self.durations = []
-        self.games = []
-        self.results_by_player = defaultdict(list)
+        self.turns = RunningStats()
+        self.ticks = RunningStats()
+        self.durations = RunningStats()
+        self.results_by_player = defaultdict(Histogram)  # color => VPs
 
     def before(self, game):
         self.start = time.time()
@@ -118,23 +140,40 @@ class StatisticsAccumulator(GameAccumulator):
             return  # do not track
 
         self.wins[winning_color] += 1
-        self.turns.append(game.state.num_turns)
-        self.ticks.append(len(game.state.actions))
-        self.durations.append(duration)
-        self.games.append(game)
+        self.turns.add(game.state.num_turns)
+        self.ticks.add(len(game.state.actions))
+        self.durations.add(duration)
 
         for color in game.state.colors:
             points = get_actual_victory_points(game.state, color)
-            self.results_by_player[color].append(points)
+            self.results_by_player[color].add(points)
+
+    def partial(self):
+        return dict(
+            wins=dict(self.wins),
+            turns=self.turns,
+            ticks=self.ticks,
+            durations=self.durations,
+            results_by_player=dict(self.results_by_player),
+        )
+
+    def merge(self, partial):
+        for color, wins in partial["wins"].items():
+            self.wins[color] += wins
+        self.turns.merge(partial["turns"])
+        self.ticks.merge(partial["ticks"])
+        self.durations.merge(partial["durations"])
+        for color, histogram in partial["results_by_player"].items():
+            self.results_by_player[color].merge(histogram)
 
     def get_avg_ticks(self):
-        return sum(self.ticks) / len(self.ticks)
+        return self.ticks.mean
 
     def get_avg_turns(self):
-        return sum(self.turns) / len(self.turns)
+        return self.turns.mean
 
     def get_avg_duration(self):
-        return sum(self.durations) / len(self.durations)
+        return self.durations.mean
 
 
 class StepDatabaseAccumulator(GameAccumulator):
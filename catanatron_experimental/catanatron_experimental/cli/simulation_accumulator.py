@@ -2,6 +2,13 @@ from catanatron.game import GameAccumulator
 
 
 class SimulationAccumulator(GameAccumulator):
+    """GameAccumulator with hooks around a whole catanatron-play simulation.
+
+    With --parallel, games are accumulated in worker processes (which call
+    before_all, but not after_all) and only their .partial() reach the
+    parent's accumulator, through .merge. Then its after_all is called.
+    """
+
     def before_all(self):
         """Called before all games in a catanatron-play simulation."""
         pass
@@ -0,0 +1,76 @@
+"""
+Streaming summaries for accumulators: constant memory no matter how many
+games are played, and mergeable (e.g. across worker processes).
+"""
+from collections import defaultdict
+
+
+class RunningStats:
+    """Count, mean, variance, min and max of a stream of numbers.
+    Uses Welford's algorithm (and Chan et al.'s to merge)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared differences from the mean
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """Population variance (0 if empty)"""
+        return self.m2 / self.count if self.count > 0 else 0.0
+
+    @property
+    def std(self):
+        return self.variance**0.5
+
+
+class Histogram:
+    """Number of times each value was seen. For discrete values with a few
+    possibilities (e.g. victory points)."""
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+
+    def add(self, value):
+        self.counts[value] += 1
+
+    def merge(self, other):
+        for value, count in other.counts.items():
+            self.counts[value] += count
+
+    @property
+    def count(self):
+        return sum(self.counts.values())
+
+    @property
+    def mean(self):
+        """Mean value (0 if empty)"""
+        count = self.count
+        return sum(v * c for v, c in self.counts.items()) / count if count else 0.0
+
+    def __eq__(self, other):
+        return isinstance(other, Histogram) and dict(self.counts) == dict(other.counts)
+
+    def __repr__(self):
+        return f"Histogram({dict(sorted(self.counts.items()))})"
@@ -0,0 +1,128 @@
+"""
+Batched evaluation of search leaves.
+
+Searches submit leaf states to an EvaluationQueue and get a Future back.
+When the queue has batch_size leaves (or is flushed, or one of its futures
+is asked for its result), it builds the feature matrix of all pending
+leaves and makes one call to its backend, instead of one model call per
+leaf. Several searches (e.g. threads, or one MCTS batch descending many
+paths) can share a queue.
+
+A backend is anything with a predict(matrix) method returning one value per
+row. LinearBackend (NumPy) is the default; KerasBackend wraps a model of
+reinforcement.py's kind.
+"""
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+from catanatron_gym.features import create_sample_matrix, get_feature_ordering
+
+BATCH_SIZE = 64
+
+# Value of a state for P0, as a win probability. Features not here weigh 0.
+DEFAULT_LINEAR_WEIGHTS = {
+    "P0_ACTUAL_VPS": 0.05,
+    "P1_PUBLIC_VPS": -0.05,
+    "P0_HAS_ROAD": 0.02,
+    "P0_HAS_ARMY": 0.02,
+}
+DEFAULT_LINEAR_BIAS = 0.3
+
+
+class LinearBackend:
+    """value = clip(features @ weights + bias, 0, 1)"""
+
+    def __init__(self, weights=None, bias=DEFAULT_LINEAR_BIAS, features=None):
+        self.features = features or get_feature_ordering(num_players=2)
+        weights = weights if weights is not None else DEFAULT_LINEAR_WEIGHTS
+        if isinstance(weights, dict):
+            weights = [weights.get(feature, 0) for feature in self.features]
+        self.weights = np.array(weights, dtype=np.float32)
+        self.bias = bias
+
+    def predict(self, matrix):
+        return np.clip(matrix @ self.weights + self.bias, 0, 1)
+
+
+class KerasBackend:
+    """For models that take a float32 (batch, features) tensor, like
+    reinforcement.py's value models."""
+
+    def __init__(self, model, features):
+        self.model = model
+        self.features = features
+
+    def predict(self, matrix):
+        return np.asarray(self.model(matrix)).reshape(-1)
+
+
+class LeafFuture(Future):
+    """Future that flushes its queue when asked for a result, so that
+    single-threaded searches don't wait for a batch that won't fill up."""
+
+    def __init__(self, queue):
+        super().__init__()
+        self.queue = queue
+
+    def result(self, timeout=None):
+        if not self.done():
+            self.queue.flush()
+        return super().result(timeout)
+
+
+class EvaluationQueue:
+    """Collects (game, p0_color) leaves and evaluates them in batches.
+
+    Games are featurized at flush time, so they must not change until their
+    futures are done (submit copies if the search keeps mutating them).
+    """
+
+    def __init__(self, backend=None, batch_size=BATCH_SIZE):
+        self.backend = backend or LinearBackend()
+        self.batch_size = batch_size
+        self.pending = []  # (game, p0_color, future)
+        self.lock = threading.Lock()
+
+        self.num_leaves = 0
+        self.num_batches = 0
+
+    def submit(self, game, p0_color):
+        future = LeafFuture(self)
+        with self.lock:
+            self.pending.append((game, p0_color, future))
+            is_full = len(self.pending) >= self.batch_size
+        if is_full:
+            self.flush()
+        return future
+
+    def flush(self):
+        """Evaluates all pending leaves with one backend call"""
+        with self.lock:
+            pending, self.pending = self.pending, []
+        if len(pending) == 0:
+            return
+
+        try:
+            matrix = build_feature_matrix(
+                [(game, p0_color) for game, p0_color, _ in pending],
+                self.backend.features,
+            )
+            values = self.backend.predict(matrix)
+        except Exception as exception:
+            for _, _, future in pending:
+                future.set_exception(exception)
+            return
+
+        for (_, _, future), value in zip(pending, values):
+            future.set_result(float(value))
+        self.num_leaves += len(pending)
+        self.num_batches += 1
+
+
+def build_feature_matrix(leaves, features):
+    """float32 (len(leaves), len(features)) matrix of (game, p0_color) leaves"""
+    games = [game for game, _ in leaves]
+    p0_colors = [p0_color for _, p0_color in leaves]
+    return create_sample_matrix(games, p0_colors, features)
@@ -1,123 +1,294 @@
 import math
 import time
+import random
+import itertools
 from collections import defaultdict
+from concurrent.futures import Future
 
 import numpy as np
 
 from catanatron.game import Game
+from catanatron.models.enums import Action, ActionType
 from catanatron.models.player import Player
+from catanatron_experimental.machine_learning.players.parallel import (
+    decode_game,
+    encode_game,
+    get_worker_pool,
+)
 from catanatron_experimental.machine_learning.players.playouts import run_playout
 from catanatron_experimental.machine_learning.players.tree_search_utils import (
-    execute_spectrum,
+    IMAGINED_OUTCOME_ACTIONS,
     list_prunned_actions,
+    list_spectrum_outcomes,
 )
 
 SIMULATIONS = 10
+MAX_NODES = 50_000
 epsilon = 1e-8
 EXP_C = 2**0.5
 
+_clock = itertools.count()  # for LRU stamps
+
 
 class StateNode:
-    def __init__(self, color, game, parent, prunning=False):
+    """Node of the search tree. Only the root keeps a game; other nodes keep
+    the fully-specified outcome action that leads to them from their parent,
+    and their state is rebuilt by replaying outcomes from the root while
+    descending (see descend).
+
+    Stats of children are kept in arrays (one slot per child, children of
+    the same action in consecutive slots), so that UCB scores of all actions
+    are computed in one step. Nodes also keep their own wins and visits,
+    which is what root's stats and re-rooting use."""
+
+    def __init__(self, color, game, parent, prunning=False, outcome=None):
         self.level = 0 if parent is None else parent.level + 1
         self.color = color  # color of player carrying out MCTS
         self.parent = parent
-        self.game = game  # state
-        self.children = []
+        self.game = game  # state (only for root)
+        self.outcome = outcome  # action from parent's state to this one
+        self.index = 0  # slot in parent's arrays
         self.prunning = prunning
+        self.clear_children()
 
         self.wins = 0
         self.visits = 0
-        self.result = None  # set if terminal
+        self.last_visited = 0  # LRU stamp
+
+    def clear_children(self):
+        self.actions = []
+        self.child_nodes = []  # StateNode per slot
+        self.offsets = np.zeros(1, dtype=np.int64)  # action i has [o[i], o[i+1])
+        self.child_action = np.zeros(0, dtype=np.int64)  # action index per slot
+        self.child_proba = np.zeros(0)
+        self.child_cumproba = np.zeros(0)  # cumulative proba within action
+        self.child_wins = np.zeros(0)
+        self.child_visits = np.zeros(0)
+
+    @property
+    def children(self):
+        """action => (StateNode, proba)[]"""
+        return {
+            action: [
+                (self.child_nodes[j], self.child_proba[j])
+                for j in range(self.offsets[i], self.offsets[i + 1])
+            ]
+            for i, action in enumerate(self.actions)
+        }
 
     def run_simulation(self):
+        self.run_simulations(1)
+
+    def run_simulations(
+        self, num_simulations, batch_size=1, virtual_loss=1, evaluation_queue=None
+    ):
+        """Runs num_simulations, descending batch_size of them at once.
+        While a descended path waits for its result, it counts virtual_loss
+        extra lost visits, so that the next descents of the batch prefer
+        other paths.
+
+        Leafs are valued with a random playout, or if evaluation_queue is
+        given, with its estimate of self.color's win probability (evaluated
+        in one batch per descended batch)."""
+        while num_simulations > 0:
+            size = min(batch_size, num_simulations)
+            loss = virtual_loss if size > 1 else 0
+            leafs = [self.descend(loss) for _ in range(size)]
+            results = []
+            for leaf, game in leafs:
+                winning_color = game.winning_color()
+                if winning_color is not None:
+                    results.append(winning_color == self.color)
+                elif evaluation_queue is not None:
+                    results.append(evaluation_queue.submit(game, self.color))
+                else:
+                    results.append(run_playout(game) == self.color)
+            for (leaf, _), result in zip(leafs, results):
+                if isinstance(result, Future):
+                    result = result.result()
+                leaf.backpropagate(result, loss)
+            num_simulations -= size
+
+    def descend(self, virtual_loss=0):
+        """Selects (expanding if needed) a leaf to play out from, and counts
+        a visit to all nodes in its path.
+
+        Returns:
+            (StateNode, Game): The leaf and a game in its state
+        """
+        game = self.game.fork()
+        tick = next(_clock)
+
         # select
         tmp = self
-        tmp.visits += 1
+        tmp.visit(tick, virtual_loss)
         while not tmp.is_leaf():
-            tmp = tmp.select()
-            tmp.visits += 1
+            tmp = tmp.select(game)
+            tmp.visit(tick, virtual_loss)
 
-        if not tmp.is_terminal():
+        if game.winning_color() is None:
             # expand
-            tmp.expand()
-            tmp = tmp.select()
-            tmp.visits += 1
+            tmp.expand(game)
+            tmp = tmp.select(game)
+            tmp.visit(tick, virtual_loss)
+        return tmp, game
 
-            # playout
-            result = tmp.playout()
-        else:
-            result = self.game.winning_color()
-
-        # backpropagate
-        tmp.backpropagate(result == self.color)
+    def visit(self, tick, virtual_loss=0):
+        self.visits += 1 + virtual_loss
+        self.last_visited = tick
+        if self.parent is not None:
+            self.parent.child_visits[self.index] += 1 + virtual_loss
 
     def is_leaf(self):
-        return len(self.children) == 0
-
-    def is_terminal(self):
-        return self.game.winning_color() is not None
-
-    def expand(self):
-        children = defaultdict(list)
-        playable_actions = self.game.state.playable_actions
-        actions = list_prunned_actions(self.game) if self.prunning else playable_actions
-        for action in actions:
-            outcomes = execute_spectrum(self.game, action)
-            for state, proba in outcomes:
-                children[action].append(
-                    (StateNode(self.color, state, self, self.prunning), proba)
-                )
-        self.children = children
-
-    def select(self):
-        """select a child StateNode"""
-        action = self.choose_best_action()
+        return len(self.child_nodes) == 0
 
-        # Idea: Allow randomness to guide to next children too
-        children = self.children[action]
-        children_states = list(map(lambda c: c[0], children))
-        children_probas = list(map(lambda c: c[1], children))
-        return np.random.choice(children_states, 1, p=children_probas)[0]
+    def expand(self, game):
+        """Adds children for given game, which must be this node's state"""
+        playable_actions = game.state.playable_actions
+        actions = list_prunned_actions(game) if self.prunning else playable_actions
 
-    def choose_best_action(self):
-        scores = []
-        for action in self.game.state.playable_actions:
-            score = self.action_children_expected_score(action)
-            scores.append(score)
+        child_nodes, child_action, child_proba, offsets = [], [], [], [0]
+        for i, action in enumerate(actions):
+            for outcome, proba in list_spectrum_outcomes(game, action):
+                child = StateNode(self.color, None, self, self.prunning, outcome)
+                child.index = len(child_nodes)
+                child_nodes.append(child)
+                child_action.append(i)
+                child_proba.append(proba)
+            offsets.append(len(child_nodes))
 
-        idx = max(range(len(scores)), key=lambda i: scores[i])
-        action = self.game.state.playable_actions[idx]
-        return action
+        self.actions = list(actions)
+        self.child_nodes = child_nodes
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.child_action = np.array(child_action, dtype=np.int64)
+        self.child_proba = np.array(child_proba, dtype=np.float64)
+        self.child_cumproba = np.array(
+            [
+                p
+                for start, end in zip(offsets, offsets[1:])
+                for p in itertools.accumulate(child_proba[start:end])
+            ],
+            dtype=np.float64,
+        )
+        self.child_wins = np.zeros(len(child_nodes))
+        self.child_visits = np.zeros(len(child_nodes))
 
-    def action_children_expected_score(self, action):
-        score = 0
-        for child, proba in self.children[action]:
-            score += proba * (
-                child.wins / (child.visits + epsilon)
-                + EXP_C
-                * (math.log(self.visits + epsilon) / (child.visits + epsilon)) ** 0.5
+    def select(self, game):
+        """select a child StateNode, and advance game to its state"""
+        i = self.choose_best_action_index()
+
+        # Idea: Allow randomness to guide to next children too
+        start, end = self.offsets[i], self.offsets[i + 1]
+        if end - start == 1:
+            j = start
+        else:
+            cumproba = self.child_cumproba[start:end]
+            j = start + min(
+                np.searchsorted(cumproba, random.random() * cumproba[-1], "right"),
+                end - start - 1,
             )
-        return score
+        child = self.child_nodes[j]
+        child.apply_outcome(game)
+        return child
 
-    def playout(self):
-        return run_playout(self.game)
+    def apply_outcome(self, game):
+        if self.outcome.action_type not in IMAGINED_OUTCOME_ACTIONS:
+            # Outcomes that apply_action resolves at random (DISCARD with no
+            # value) are pinned to what they turned into the first time, so
+            # that every replay reaches the state this node's subtree has.
+            self.outcome = game.execute(self.outcome, validate_action=False)
+            return
 
-    def backpropagate(self, value):
-        self.wins += value
+        try:
+            game.execute_with_undo(self.outcome, validate_action=False)
+        except Exception:
+            # Imagined outcome that can't happen (like in execute_spectrum).
+            # game is left as it was, so this node has its parent's state.
+            pass
 
+    def choose_best_action(self):
+        return self.actions[self.choose_best_action_index()]
+
+    def choose_best_action_index(self):
+        return int(np.argmax(self.action_scores()))
+
+    def action_scores(self):
+        """Expected UCB score of each action (over its outcomes)"""
+        visits = self.child_visits + epsilon
+        scores = self.child_proba * (
+            self.child_wins / visits
+            + EXP_C * np.sqrt(math.log(self.visits + epsilon) / visits)
+        )
+        return np.bincount(self.child_action, scores, minlength=len(self.actions))
+
+    def backpropagate(self, value, virtual_loss=0):
         tmp = self
-        while tmp.parent is not None:
+        while tmp is not None:
+            tmp.wins += value
+            tmp.visits -= virtual_loss
+            if tmp.parent is not None:
+                tmp.parent.child_wins[tmp.index] += value
+                tmp.parent.child_visits[tmp.index] -= virtual_loss
             tmp = tmp.parent
 
-            tmp.wins += value
+    def find_child(self, played_action):
+        """Returns child reached by played_action (as logged by Game), or None"""
+        key = outcome_key(played_action)
+        for child in self.child_nodes:
+            if outcome_key(child.outcome) == key:
+                return child
+        return None
+
+    def action_stats(self):
+        """Returns action => (wins, visits) of root children"""
+        num_actions = len(self.actions)
+        wins = np.bincount(self.child_action, self.child_wins, minlength=num_actions)
+        visits = np.bincount(
+            self.child_action, self.child_visits, minlength=num_actions
+        )
+        return {
+            action: (float(wins[i]), int(visits[i]))
+            for i, action in enumerate(self.actions)
+        }
 
 
 class MCTSPlayer(Player):
-    def __init__(self, color, num_simulations=SIMULATIONS, prunning=False):
+    """The tree is kept across decisions of the same game (reuse_tree=True):
+    each decision re-roots it on the subtree of the actions played since.
+    After each decision, least recently visited subtrees are collapsed so
+    that the tree has at most max_nodes nodes.
+
+    With batch_size > 1, simulations descend the tree batch_size at a time
+    (with virtual loss), before playing them out. With an evaluation_queue
+    (see evaluation.py), leafs are valued by its model instead of playouts.
+
+    With num_workers > 1, builds that many independent trees in worker
+    processes (root parallelization), splitting num_simulations among them,
+    and picks the action most visited across all trees."""
+
+    def __init__(
+        self,
+        color,
+        num_simulations=SIMULATIONS,
+        prunning=False,
+        num_workers=1,
+        reuse_tree=True,
+        max_nodes=MAX_NODES,
+        batch_size=1,
+        evaluation_queue=None,
+    ):
         super().__init__(color)
         self.num_simulations = int(num_simulations)
         self.prunning = bool(prunning)
+        self.num_workers = int(num_workers)
+        self.reuse_tree = str(reuse_tree).lower() != "false"
+        self.max_nodes = int(max_nodes)
+        self.batch_size = int(batch_size)
+        self.evaluation_queue = evaluation_queue
+
+        self.root = None
+        self.root_game_id = None
+        self.root_num_actions = 0  # len(game.state.actions) at root
 
     def decide(self, game: Game, playable_actions):
         # if len(game.state.actions) > 10:
@@ -129,15 +300,123 @@ class MCTSPlayer(Player):
             return actions[0]
 
         start = time.time()
-        root = StateNode(self.color, game.copy(), None, self.prunning)
-        for _ in range(self.num_simulations):
-            root.run_simulation()
+        if self.num_workers > 1:
+            action = self.decide_in_parallel(game)
+        else:
+            root = self.get_root(game)
+            root.run_simulations(
+                self.num_simulations,
+                self.batch_size,
+                evaluation_queue=self.evaluation_queue,
+            )
+            action = root.choose_best_action()
+            prune_tree(root, self.max_nodes)
 
         print(
             f"{str(self)} took {time.time() - start} secs to decide {len(playable_actions)}"
         )
 
-        return root.choose_best_action()
+        return action
+
+    def get_root(self, game):
+        """Returns the node of the kept tree for game's state (if any), or
+        a new tree otherwise."""
+        root = None
+        if (
+            self.reuse_tree
+            and self.root is not None
+            and self.root_game_id == game.id
+            and len(game.state.actions) >= self.root_num_actions
+        ):
+            root = self.root
+            for action in game.state.actions[self.root_num_actions :]:
+                root = root.find_child(action)
+                if root is None:
+                    break  # played outcome not in tree (e.g. a discard)
+
+        if root is None:
+            root = StateNode(self.color, None, None, self.prunning)
+        root.parent = None  # so that the rest of the tree can be collected
+        root.outcome = None
+        root.game = game.copy()
+
+        self.root = root
+        self.root_game_id = game.id
+        self.root_num_actions = len(game.state.actions)
+        return root
+
+    def decide_in_parallel(self, game):
+        data = encode_game(game)
+        tasks = []
+        for i in range(self.num_workers):
+            num_simulations = self.num_simulations // self.num_workers + (
+                i < self.num_simulations % self.num_workers
+            )
+            if num_simulations > 0:
+                seed = random.randrange(2**32)
+                tasks.append((data, self.color, num_simulations, self.prunning, seed))
+
+        results = get_worker_pool(self.num_workers).map(run_tree_task, tasks)
+        wins, visits = defaultdict(int), defaultdict(int)
+        for action_stats in results:
+            for action, (action_wins, action_visits) in action_stats.items():
+                wins[action] += action_wins
+                visits[action] += action_visits
+        return max(visits.keys(), key=lambda a: (visits[a], wins[a]))
 
     def __repr__(self):
         return super().__repr__() + f"({self.num_simulations}:{self.prunning})"
+
+
+def run_tree_task(args):
+    """Worker side of MCTSPlayer.decide_in_parallel"""
+    data, color, num_simulations, prunning, seed = args
+    random.seed(seed)  # workers are forked with the same random state
+    np.random.seed(seed)
+    root = StateNode(color, decode_game(data), None, prunning)
+    root.run_simulations(num_simulations)
+    return root.action_stats()
+
+
+def outcome_key(action):
+    """Rolls with the same sum lead to the same state"""
+    if action.action_type == ActionType.ROLL and action.value is not None:
+        return Action(action.color, action.action_type, sum(action.value))
+    return action
+
+
+def prune_tree(root, max_nodes):
+    """Collapses least recently visited subtrees (their roots become leafs
+    again, keeping their stats) until the tree has at most max_nodes nodes.
+
+    Returns:
+        int: Number of nodes left in tree
+    """
+    nodes = list(iter_subtree(root))
+    num_nodes = len(nodes)
+    if num_nodes <= max_nodes:
+        return num_nodes
+
+    internal_nodes = [node for node in nodes if node.child_nodes and node is not root]
+    internal_nodes.sort(key=lambda node: node.last_visited)
+    removed = set()
+    for node in internal_nodes:
+        if num_nodes <= max_nodes:
+            break
+        if id(node) in removed:
+            continue  # already collapsed with an ancestor
+
+        for descendant in iter_subtree(node):
+            if descendant is not node:
+                removed.add(id(descendant))
+                num_nodes -= 1
+        node.clear_children()
+    return num_nodes
+
+
+def iter_subtree(node):
+    agenda = [node]
+    while len(agenda) > 0:
+        node = agenda.pop()
+        yield node
+        agenda.extend(node.child_nodes)
@@ -1,12 +1,27 @@
+import copy
 import time
 import random
+from concurrent.futures import Future
 from typing import Any
 
 from catanatron.game import Game
 from catanatron.models.player import Player
+from catanatron.zobrist import get_state_hash
 from catanatron_experimental.machine_learning.players.tree_search_utils import (
-    expand_spectrum,
+    iter_spectrum_in_place,
     list_prunned_actions,
+    list_spectrum_outcomes,
+)
+from catanatron_experimental.machine_learning.players.parallel import (
+    decode_game,
+    encode_game,
+    get_worker_pool,
+)
+from catanatron_experimental.machine_learning.players.transposition import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
 )
 from catanatron_experimental.machine_learning.players.value import (
     DEFAULT_WEIGHTS,
@@ -24,6 +39,28 @@ class AlphaBetaPlayer(Player):
     is taken to be the expected value (using the probability of rolls, etc...)
     of its children. At leafs we simply use the heuristic function given.
 
+    The search walks a single copy of the game, applying and undoing
+    actions (see iter_spectrum_in_place) instead of copying at every node.
+
+    With transposition_table=True, results are cached by state hash, so
+    states reached through different action orders are searched once.
+    With keep_transposition_table=True, the table is also kept across
+    decide calls within the same game.
+
+    Searches with iterative deepening (depth 1, 2, ... up to depth), within
+    a time budget of time_budget_ms per decision. Returns the best action
+    of the deepest completed iteration. Each iteration tries the best
+    actions of the previous one first, and then the rest sorted by value
+    function, so that cutoffs happen early.
+
+    With num_workers > 1, root actions are split across that many worker
+    processes (see parallel.get_worker_pool), each searching its share.
+
+    With an evaluation_queue (see evaluation.py), leafs are valued by its
+    model (as self.color's win probability) instead of the value function.
+    All leafs below a node of depth 1 are submitted together, so that they
+    are evaluated in one batch (at the cost of not pruning among them).
+
     NOTE: More than 3 levels seems to take much longer, it would be
     interesting to see this with prunning.
     """
@@ -36,6 +73,11 @@ class AlphaBetaPlayer(Player):
         value_fn_builder_name=None,
         params=DEFAULT_WEIGHTS,
         epsilon=None,
+        transposition_table=False,
+        keep_transposition_table=False,
+        time_budget_ms=MAX_SEARCH_TIME_SECS * 1000,
+        num_workers=1,
+        evaluation_queue=None,
     ):
         super().__init__(color)
         self.depth = int(depth)
@@ -46,6 +88,17 @@ class AlphaBetaPlayer(Player):
         self.params = params
         self.use_value_function = None
         self.epsilon = epsilon
+        self.transposition_table = None
+        if str(transposition_table).lower() != "false":
+            self.transposition_table = TranspositionTable()
+        self.keep_transposition_table = str(keep_transposition_table).lower() != "false"
+        self.transposition_table_game_id = None
+        self.time_budget_ms = int(time_budget_ms)
+        self.best_actions = dict()  # state_hash => best action found so far
+        self.num_workers = int(num_workers)
+        if evaluation_queue is not None and self.num_workers > 1:
+            raise ValueError("An evaluation_queue can't be shared with workers")
+        self.evaluation_queue = evaluation_queue
 
     def value_function(self, game, p0_color):
         raise NotImplementedError
@@ -63,20 +116,133 @@ class AlphaBetaPlayer(Player):
         if self.epsilon is not None and random.random() < self.epsilon:
             return random.choice(playable_actions)
 
+        table = self.transposition_table
+        if table is not None and (
+            not self.keep_transposition_table
+            or self.transposition_table_game_id != game.id
+        ):
+            table.clear()
+            self.transposition_table_game_id = game.id
+
         start = time.time()
-        state_id = str(len(game.state.actions))
-        node = DebugStateNode(state_id, self.color)  # i think it comes from outside
-        deadline = start + MAX_SEARCH_TIME_SECS
-        result = self.alphabeta(
-            game.copy(), self.depth, float("-inf"), float("inf"), deadline, node
-        )
-        # print("Decision Results:", self.depth, len(actions), time.time() - start)
+        deadline = start + self.time_budget_ms / 1000
+        if self.num_workers > 1:
+            best_action = self.decide_in_parallel(game, actions, deadline)
+            return best_action or playable_actions[0]
+
+        self.best_actions = dict()
+        game_copy = game.copy()  # search applies and undoes actions on it
+        best_action = None
+        for depth in range(1, self.depth + 1):
+            state_id = str(len(game.state.actions))
+            node = DebugStateNode(state_id, self.color)
+            action, _ = self.alphabeta(
+                game_copy, depth, float("-inf"), float("inf"), deadline, node
+            )
+            if time.time() >= deadline:
+                # Interrupted iterations only count if nothing else completed
+                best_action = best_action or action
+                break
+            best_action = action
+        # print("Decision Results:", depth, len(actions), time.time() - start)
         # if game.state.num_turns > 10:
         #     render_debug_tree(node)
         #     breakpoint()
-        if result[0] is None:
+        if best_action is None:
             return playable_actions[0]
-        return result[0]
+        return best_action
+
+    def decide_in_parallel(self, game, actions, deadline):
+        """Splits actions among workers. Each searches its share with
+        search_root_actions. Returns the best action of the deepest
+        iteration all workers completed."""
+        data = encode_game(game)
+        searcher = copy.copy(self)
+        searcher.num_workers = 1
+        searcher.best_actions = dict()
+        if self.transposition_table is not None:
+            searcher.transposition_table = TranspositionTable()
+        shares = [actions[i :: self.num_workers] for i in range(self.num_workers)]
+        tasks = [(searcher, data, share, deadline) for share in shares if share]
+
+        results = get_worker_pool(self.num_workers).map(search_root_actions_task, tasks)
+        depths = set.intersection(
+            *[set(values_by_depth) for values_by_depth in results]
+        )
+        if len(depths) == 0:
+            return None
+        depth = max(depths)
+        best_value, best_action = float("-inf"), None
+        for (_, _, share, _), values_by_depth in zip(tasks, results):
+            for action, value in zip(share, values_by_depth[depth]):
+                if value > best_value:
+                    best_value, best_action = value, action
+        return best_action
+
+    def search_root_actions(self, game, actions, deadline):
+        """Iterative deepening, considering only given actions at the root
+        (where it is self.color's turn).
+
+        Returns:
+            Dict[int, List[float]]: depth => value of each action, for
+                completed iterations (and the first one, even if interrupted).
+                Values of actions that can't be the best might be upper bounds.
+        """
+        values_by_depth = dict()
+        for depth in range(1, self.depth + 1):
+            alpha = float("-inf")
+            values = []
+            for action in actions:
+                expected_value = 0
+                outcomes = list_spectrum_outcomes(game, action)
+                window = outcome_window(outcomes, alpha, float("inf"))
+                for outcome, proba in iter_spectrum_in_place(game, action, outcomes):
+                    node = DebugStateNode("", outcome.state.current_color())
+                    _, value = self.alphabeta(
+                        outcome, depth - 1, *window, deadline, node
+                    )
+                    expected_value += proba * value
+                values.append(expected_value)
+                alpha = max(alpha, expected_value)
+
+            if time.time() >= deadline and len(values_by_depth) > 0:
+                break
+            values_by_depth[depth] = values
+            if time.time() >= deadline:
+                break
+        return values_by_depth
+
+    def order_actions(self, game, actions, depth, maximizing, key):
+        """Sorts actions so that the most promising are searched first: the
+        best action found for this state in a previous iteration, followed
+        by the rest sorted by the value of their most likely outcome.
+        Near the leafs (depth=1) sorting would cost as much as searching,
+        so only the former is done."""
+        if depth >= 2 and len(actions) > 1:
+            value_fn = get_value_fn(
+                self.value_fn_builder_name,
+                self.params,
+                self.value_function if self.use_value_function else None,
+            )
+            scores = []
+            for action in actions:
+                outcome = max(list_spectrum_outcomes(game, action), key=lambda o: o[1])
+                try:
+                    record = game.execute_with_undo(outcome[0], validate_action=False)
+                except Exception:
+                    scores.append(value_fn(game, self.color))  # game untouched
+                    continue
+                scores.append(value_fn(game, self.color))
+                game.undo(record)
+            order = sorted(
+                range(len(actions)), key=scores.__getitem__, reverse=maximizing
+            )
+            actions = [actions[i] for i in order]
+
+        best_action = self.best_actions.get(key)
+        if best_action is not None and best_action in actions:
+            actions = [best_action] + [a for a in actions if a != best_action]
+        return actions
 
     def __repr__(self) -> str:
         return (
@@ -93,35 +259,59 @@ class AlphaBetaPlayer(Player):
 
         {'value', 'action'|None if leaf, 'node' }
         """
+        table = self.transposition_table
+        key = get_state_hash(game.state)
+        if table is not None:
+            entry = table.probe(key, depth, alpha, beta)
+            if entry is not None:
+                node.expected_value = entry.value
+                return entry.action, entry.value
+
         if depth == 0 or game.winning_color() is not None or time.time() >= deadline:
-            value_fn = get_value_fn(
-                self.value_fn_builder_name,
-                self.params,
-                self.value_function if self.use_value_function else None,
-            )
-            value = value_fn(game, self.color)
+            if self.evaluation_queue is not None:
+                value = get_leaf_value(self.submit_leaf(game))
+            else:
+                value_fn = get_value_fn(
+                    self.value_fn_builder_name,
+                    self.params,
+                    self.value_function if self.use_value_function else None,
+                )
+                value = value_fn(game, self.color)
 
             node.expected_value = value
+            if table is not None:
+                table.store(key, 0, value, EXACT)
             return None, value
 
+        original_alpha, original_beta = alpha, beta
         maximizingPlayer = game.state.current_color() == self.color
         actions = self.get_actions(game)  # list of actions.
-        action_outcomes = expand_spectrum(game, actions)  # action => (game, proba)[]
+        actions = self.order_actions(game, actions, depth, maximizingPlayer, key)
+        leaf_values = None  # (proba, value)[] of each action, if evaluated at once
+        if depth == 1 and self.evaluation_queue is not None:
+            leaf_values = self.evaluate_actions_leafs(game, actions)
 
         if maximizingPlayer:
             best_action = None
             best_value = float("-inf")
-            for i, (action, outcomes) in enumerate(action_outcomes.items()):
+            for i, action in enumerate(actions):
                 action_node = DebugActionNode(action)
-
-                expected_value = 0
+                if leaf_values is not None:
+                    outcomes = []
+                    expected_value = sum(p * value for p, value in leaf_values[i])
+                else:
+                    # Walks outcomes by applying and undoing them on game
+                    outcomes = list_spectrum_outcomes(game, action)
+                    window = outcome_window(outcomes, alpha, beta)
+                    outcomes = iter_spectrum_in_place(game, action, outcomes)
+                    expected_value = 0
                 for j, (outcome, proba) in enumerate(outcomes):
                     out_node = DebugStateNode(
                         f"{node.label} {i} {j}", outcome.state.current_color()
                     )
 
                     result = self.alphabeta(
-                        outcome, depth - 1, alpha, beta, deadline, out_node
+                        outcome, depth - 1, *window, deadline, out_node
                     )
                     value = result[1]
                     expected_value += proba * value
@@ -140,21 +330,37 @@ class AlphaBetaPlayer(Player):
                     break  # beta cutoff
 
             node.expected_value = best_value
+            self.store_result(
+                key,
+                depth,
+                original_alpha,
+                original_beta,
+                deadline,
+                best_action,
+                best_value,
+            )
             return best_action, best_value
         else:
             best_action = None
             best_value = float("inf")
-            for i, (action, outcomes) in enumerate(action_outcomes.items()):
+            for i, action in enumerate(actions):
                 action_node = DebugActionNode(action)
-
-                expected_value = 0
+                if leaf_values is not None:
+                    outcomes = []
+                    expected_value = sum(p * value for p, value in leaf_values[i])
+                else:
+                    # Walks outcomes by applying and undoing them on game
+                    outcomes = list_spectrum_outcomes(game, action)
+                    window = outcome_window(outcomes, alpha, beta)
+                    outcomes = iter_spectrum_in_place(game, action, outcomes)
+                    expected_value = 0
                 for j, (outcome, proba) in enumerate(outcomes):
                     out_node = DebugStateNode(
                         f"{node.label} {i} {j}", outcome.state.current_color()
                     )
 
                     result = self.alphabeta(
-                        outcome, depth - 1, alpha, beta, deadline, out_node
+                        outcome, depth - 1, *window, deadline, out_node
                     )
                     value = result[1]
                     expected_value += proba * value
@@ -173,8 +379,80 @@ class AlphaBetaPlayer(Player):
                     break  # alpha cutoff
 
             node.expected_value = best_value
+            self.store_result(
+                key,
+                depth,
+                original_alpha,
+                original_beta,
+                deadline,
+                best_action,
+                best_value,
+            )
             return best_action, best_value
 
+    def submit_leaf(self, game):
+        """Submits leaf game (a copy, as the search keeps mutating it) to
+        self.evaluation_queue. Returns a Future of its value for self.color,
+        or the value itself for finished games (1 if won, 0 if lost)."""
+        winning_color = game.winning_color()
+        if winning_color is not None:
+            return float(winning_color == self.color)
+        return self.evaluation_queue.submit(game.copy(), self.color)
+
+    def evaluate_actions_leafs(self, game, actions):
+        """(proba, value)[] of the outcomes of each action, with all the
+        outcomes submitted before waiting for their values (one batch)"""
+        leafs = []
+        for action in actions:
+            leafs.append(
+                [
+                    (proba, self.submit_leaf(outcome))
+                    for outcome, proba in iter_spectrum_in_place(game, action)
+                ]
+            )
+        return [
+            [(proba, get_leaf_value(value)) for proba, value in action_leafs]
+            for action_leafs in leafs
+        ]
+
+    def store_result(self, key, depth, alpha, beta, deadline, action, value):
+        """Saves search result for move ordering, and in transposition table
+        (if any) flagged according to the (alpha, beta) window the search
+        started with."""
+        if action is not None:
+            self.best_actions[key] = action  # for move ordering
+        if self.transposition_table is None or time.time() >= deadline:
+            return  # results of interrupted searches are not trustworthy
+
+        if value <= alpha:
+            flag = UPPER_BOUND
+        elif value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.transposition_table.store(key, depth, value, flag, action)
+
+
+def get_leaf_value(value):
+    """Value of a leaf given by AlphaBetaPlayer.submit_leaf"""
+    return value.result() if isinstance(value, Future) else value
+
+
+def outcome_window(outcomes, alpha, beta):
+    """(alpha, beta) window to search the outcomes of an action with. Values
+    of chance outcomes are added up (weighted by proba), so they have to be
+    exact: a bound outside the window could still move the sum inside it,
+    and be taken (and stored in the transposition table) as exact."""
+    if len(outcomes) == 1:
+        return alpha, beta
+    return float("-inf"), float("inf")
+
+
+def search_root_actions_task(args):
+    """Worker side of AlphaBetaPlayer.decide_in_parallel"""
+    player, data, actions, deadline = args
+    return player.search_root_actions(decode_game(data), actions, deadline)
+
 
 class DebugStateNode:
     def __init__(self, label, color):
@@ -258,13 +536,14 @@ class SameTurnAlphaBetaPlayer(AlphaBetaPlayer):
             return None, value
 
         actions = self.get_actions(game)  # list of actions.
-        action_outcomes = expand_spectrum(game, actions)  # action => (game, proba)[]
 
         best_action = None
         best_value = float("-inf")
-        for i, (action, outcomes) in enumerate(action_outcomes.items()):
+        for i, action in enumerate(actions):
             action_node = DebugActionNode(action)
 
+            # Walks outcomes by applying and undoing them on game (no copies)
+            outcomes = iter_spectrum_in_place(game, action)
             expected_value = 0
             for j, (outcome, proba) in enumerate(outcomes):
                 out_node = DebugStateNode(
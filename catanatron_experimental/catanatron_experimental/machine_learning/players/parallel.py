@@ -0,0 +1,105 @@
+"""
+Process pool shared by the search players, to split their work across cores.
+
+The pool is created on first use (with a process per core) and kept for the
+life of the process, so that deciding does not pay for spawning processes
+every time. Callers get parallelism by splitting their work in as many tasks
+as workers they want, not by asking for pools of different sizes. Games are sent
+to workers with encode_game, which leaves out what workers don't need for
+searching (Player objects, the action log, derived caches).
+"""
+import atexit
+import multiprocessing
+import pickle
+
+from catanatron.action_log import ActionLog
+from catanatron.game import Game
+from catanatron.models.player import Player
+from catanatron.models.player_state import PlayerStateView
+
+NUM_WORKERS = multiprocessing.cpu_count()
+
+_pool = None
+_pool_size = None
+
+
+def get_worker_pool(num_workers=NUM_WORKERS):
+    """Returns the process-wide pool, with at least num_workers processes.
+    It is only replaced (by a bigger one) if asked for more than it has."""
+    global _pool, _pool_size
+    if _pool is None or _pool_size < num_workers:
+        if _pool is not None:
+            _pool.terminate()
+        _pool_size = max(num_workers, NUM_WORKERS, _pool_size or 0)
+        _pool = multiprocessing.Pool(_pool_size)
+    return _pool
+
+
+def close_worker_pool():
+    global _pool, _pool_size
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+    _pool = None
+    _pool_size = None
+
+
+atexit.register(close_worker_pool)
+
+
+def encode_game(game: Game) -> bytes:
+    """Compact bytes representation of game, for sending to workers.
+    Players are replaced by plain Player(color) and the action log is dropped.
+    """
+    state = game.state
+    state_fields = {
+        k: v
+        for k, v in state.__dict__.items()
+        if k not in ("players", "player_state", "actions", "board")
+    }
+    board_fields = {
+        k: v for k, v in state.board.__dict__.items() if k != "tensor_cache"
+    }
+    return pickle.dumps(
+        (
+            game.seed,
+            game.id,
+            game.vps_to_win,
+            type(state),
+            state_fields,
+            type(state.board),
+            board_fields,
+        ),
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+
+
+def decode_game(data: bytes) -> Game:
+    """Inverse of encode_game (except for dropped parts)"""
+    (
+        seed,
+        game_id,
+        vps_to_win,
+        state_class,
+        state_fields,
+        board_class,
+        board_fields,
+    ) = pickle.loads(data)
+
+    board = board_class(initialize=False)
+    board.__dict__.update(board_fields)
+    board.tensor_cache = None
+
+    state = state_class([], initialize=False)
+    state.__dict__.update(state_fields)
+    state.board = board
+    state.players = [Player(color) for color in state.colors]
+    state.player_state = PlayerStateView(state.player_records)
+    state.actions = ActionLog()
+
+    game = Game(players=[], initialize=False)
+    game.seed = seed
+    game.id = game_id
+    game.vps_to_win = vps_to_win
+    game.state = state
+    return game
@@ -1,14 +1,18 @@
 import time
 import random
-import multiprocessing
 from collections import Counter
 
 from catanatron.game import Game
 from catanatron.models.player import Player
+from catanatron_experimental.machine_learning.players.parallel import (
+    NUM_WORKERS,
+    decode_game,
+    encode_game,
+    get_worker_pool,
+)
 
 DEFAULT_NUM_PLAYOUTS = 25
 USE_MULTIPROCESSING = True
-NUM_WORKERS = multiprocessing.cpu_count()
 
 PLAYOUTS_BUDGET = 100
 
@@ -36,7 +40,7 @@ class GreedyPlayoutsPlayer(Player):
         best_action = None
         max_wins = None
         for action in playable_actions:
-            action_applied_game_copy = game.copy()
+            action_applied_game_copy = game.fork()
             action_applied_game_copy.execute(action)
 
             counter = run_playouts(action_applied_game_copy, num_playouts)
@@ -55,25 +59,39 @@ class GreedyPlayoutsPlayer(Player):
 
 def run_playouts(action_applied_game_copy, num_playouts):
     start = time.time()
-    params = []
-    for _ in range(num_playouts):
-        params.append(action_applied_game_copy)
-    if USE_MULTIPROCESSING:
-        with multiprocessing.Pool(NUM_WORKERS) as p:
-            counter = Counter(p.map(run_playout, params))
+    if USE_MULTIPROCESSING and NUM_WORKERS > 1:
+        # One batch of playouts per worker
+        data = encode_game(action_applied_game_copy)
+        tasks = [
+            (data, num_playouts // NUM_WORKERS + (i < num_playouts % NUM_WORKERS))
+            for i in range(NUM_WORKERS)
+        ]
+        tasks = [(data, n, random.randrange(2**32)) for data, n in tasks if n > 0]
+        results = get_worker_pool().map(run_playouts_task, tasks)
+        counter = Counter(winner for winners in results for winner in winners)
     else:
-        counter = Counter(map(run_playout, params))
+        counter = Counter(
+            run_playout(action_applied_game_copy) for _ in range(num_playouts)
+        )
     duration = time.time() - start
     # print(f"{num_playouts} playouts took: {duration}. Results: {counter}")
     return counter
 
 
 def run_playout(action_applied_game_copy):
-    game_copy = action_applied_game_copy.copy()
+    game_copy = action_applied_game_copy.fork()
     game_copy.play(decide_fn=decide_fn)
     return game_copy.winning_color()
 
 
+def run_playouts_task(args):
+    """Worker side of run_playouts. Returns the winner of each playout"""
+    data, num_playouts, seed = args
+    random.seed(seed)  # workers are forked with the same random state
+    game = decode_game(data)
+    return [run_playout(game) for _ in range(num_playouts)]
+
+
 def decide_fn(self, game, playable_actions):
     index = random.randrange(0, len(playable_actions))
     return playable_actions[index]
@@ -11,7 +11,11 @@ from catanatron_gym.features import (
     create_sample_vector,
     get_feature_ordering,
 )
-from catanatron_gym.envs.catanatron_env import ACTIONS_ARRAY, ACTION_SPACE_SIZE
+from catanatron_gym.envs.catanatron_env import (
+    ACTIONS_ARRAY,
+    ACTIONS_INDEX,
+    ACTION_SPACE_SIZE,
+)
 from catanatron_gym.board_tensor_features import (
     NUMERIC_FEATURES,
     create_board_tensor,
@@ -109,7 +113,7 @@ def get_t_model(model_path):
 
 def hot_one_encode_action(action):
     normalized = normalize_action(action)
-    index = ACTIONS_ARRAY.index((normalized.action_type, normalized.value))
+    index = ACTIONS_INDEX[(normalized.action_type, normalized.value)]
     vector = np.zeros(ACTION_SPACE_SIZE, dtype=int)
     vector[index] = 1
     return vector
@@ -121,8 +125,6 @@ def normalize_action(action):
         return Action(action.color, action.action_type, None)
     elif normalized.action_type == ActionType.MOVE_ROBBER:
         return Action(action.color, action.action_type, action.value[0])
-    elif normalized.action_type == ActionType.BUILD_ROAD:
-        return Action(action.color, action.action_type, tuple(sorted(action.value)))
     elif normalized.action_type == ActionType.BUY_DEVELOPMENT_CARD:
         return Action(action.color, action.action_type, None)
     elif normalized.action_type == ActionType.DISCARD:
@@ -149,7 +151,7 @@ class PRLPlayer(Player):
         # Create array like [0,0,1,0,0,0,1,...] representing possible actions
         normalized_playable = [normalize_action(a) for a in playable_actions]
         possibilities = [(a.action_type, a.value) for a in normalized_playable]
-        possible_indices = [ACTIONS_ARRAY.index(x) for x in possibilities]
+        possible_indices = [ACTIONS_INDEX[x] for x in possibilities]
         mask = np.zeros(ACTION_SPACE_SIZE, dtype=np.int)
         mask[possible_indices] = 1
 
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+
+# Entry flags. Search with a (alpha, beta) window only gives the exact value
+# of a node when the value falls inside it; otherwise it is a bound.
+EXACT = 0
+LOWER_BOUND = 1  # value >= stored value (search failed high)
+UPPER_BOUND = 2  # value <= stored value (search failed low)
+
+DEFAULT_CAPACITY = 2**17
+
+
+class TranspositionEntry:
+    __slots__ = ("depth", "value", "flag", "action")
+
+    def __init__(self, depth, value, flag, action):
+        self.depth = depth
+        self.value = value
+        self.flag = flag
+        self.action = action
+
+
+class TranspositionTable:
+    """Bounded state_hash => TranspositionEntry mapping for search players.
+    See catanatron.zobrist.get_state_hash.
+
+    When full, the least recently used entry is evicted. Storing a result for
+    a state already in the table only replaces it if the new result comes
+    from an equally deep or deeper search.
+
+    Keeps hits / misses / stores / evictions counters, to measure how many
+    nodes it saves.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def probe(self, key, depth, alpha, beta):
+        """Returns the entry for key if it resolves a search of given depth
+        and (alpha, beta) window. None otherwise."""
+        entry = self.entries.get(key)
+        if entry is not None and entry.depth >= depth:
+            self.entries.move_to_end(key)
+            if (
+                entry.flag == EXACT
+                or (entry.flag == LOWER_BOUND and entry.value >= beta)
+                or (entry.flag == UPPER_BOUND and entry.value <= alpha)
+            ):
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def get(self, key):
+        """Returns entry for key (regardless of depth), or None"""
+        return self.entries.get(key)
+
+    def store(self, key, depth, value, flag, action=None):
+        entry = self.entries.get(key)
+        if entry is not None and entry.depth > depth:
+            return  # keep result of deeper search
+        self.entries[key] = TranspositionEntry(depth, value, flag, action)
+        self.entries.move_to_end(key)
+        self.stores += 1
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    @property
+    def hit_rate(self):
+        probes = self.hits + self.misses
+        return self.hits / probes if probes > 0 else 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return (
+            f"TranspositionTable(size={len(self)},hits={self.hits},"
+            + f"misses={self.misses},hit_rate={self.hit_rate:.3f})"
+        )
@@ -38,20 +38,25 @@ DETERMINISTIC_ACTIONS = set(
 )
 
 
+# Outcomes of these actions are imagined by the searching player, and so
+# might be impossible (e.g. stealing a card the opponent doesnt have).
+IMAGINED_OUTCOME_ACTIONS = set(
+    [ActionType.BUY_DEVELOPMENT_CARD, ActionType.MOVE_ROBBER]
+)
+
+
 def execute_deterministic(game, action):
-    copy = game.copy()
+    copy = game.fork()
     copy.execute(action, validate_action=False)
     return [(copy, 1)]
 
 
-def execute_spectrum(game, action):
-    """Returns [(game_copy, proba), ...] tuples for result of given action.
-    Result probas should add up to 1. Does not modify self"""
+def list_spectrum_outcomes(game, action):
+    """Returns [(outcome_action, proba), ...] tuples with the fully-specified
+    actions given action can turn into. Result probas should add up to 1."""
     if action.action_type in DETERMINISTIC_ACTIONS:
-        return execute_deterministic(game, action)
+        return [(action, 1)]
     elif action.action_type == ActionType.BUY_DEVELOPMENT_CARD:
-        results = []
-
         # Get the possible deck from the perspective of the current player
         # by getting all face down cards
         current_deck = game.state.development_listdeck.copy()
@@ -60,60 +65,90 @@ def execute_spectrum(game, action):
                 number = get_dev_cards_in_hand(game.state, color, card)
                 current_deck += [card] * number
 
-        for card in set(current_deck):
-            option_action = Action(action.color, action.action_type, card)
-            option_game = game.copy()
-            try:
-                option_game.execute(option_action, validate_action=False)
-            except Exception:
-                # ignore exceptions, since player might imagine impossible outcomes.
-                # ignoring means the value function of this node will be flattened,
-                # to the one before.
-                pass
-            results.append((option_game, current_deck.count(card) / len(current_deck)))
-        return results
+        return [
+            (
+                Action(action.color, action.action_type, card),
+                current_deck.count(card) / len(current_deck),
+            )
+            for card in set(current_deck)
+        ]
     elif action.action_type == ActionType.ROLL:
         results = []
         for roll in range(2, 13):
             outcome = (roll // 2, math.ceil(roll / 2))
-
             option_action = Action(action.color, action.action_type, outcome)
-            option_game = game.copy()
-            option_game.execute(option_action, validate_action=False)
-            results.append((option_game, number_probability(roll)))
+            results.append((option_action, number_probability(roll)))
         return results
     elif action.action_type == ActionType.MOVE_ROBBER:
         (coordinate, robbed_color, _) = action.value
         if robbed_color is None:  # no one to steal, then deterministic
-            return execute_deterministic(game, action)
+            return [(action, 1)]
 
-        results = []
         opponent_hand = get_player_freqdeck(game.state, robbed_color)
         opponent_hand_size = sum(opponent_hand)
         if opponent_hand_size == 0:
             # Nothing to steal
-            return execute_deterministic(game, action)
-
-        for card in RESOURCES:
-            option_action = Action(
-                action.color,
-                action.action_type,
-                (coordinate, robbed_color, card),
+            return [(action, 1)]
+
+        return [
+            (
+                Action(
+                    action.color,
+                    action.action_type,
+                    (coordinate, robbed_color, card),
+                ),
+                1 / 5.0,
             )
-            option_game = game.copy()
-            try:
-                option_game.execute(option_action, validate_action=False)
-            except Exception:
-                # ignore exceptions, since player might imagine impossible outcomes.
-                # ignoring means the value function of this node will be flattened,
-                # to the one before.
-                pass
-            results.append((option_game, 1 / 5.0))
-        return results
+            for card in RESOURCES
+        ]
     else:
         raise RuntimeError("Unknown ActionType " + str(action.action_type))
 
 
+def execute_spectrum(game, action):
+    """Returns [(game_copy, proba), ...] tuples for result of given action.
+    Result probas should add up to 1. Does not modify self"""
+    results = []
+    for outcome, proba in list_spectrum_outcomes(game, action):
+        option_game = game.fork()
+        try:
+            option_game.execute(outcome, validate_action=False)
+        except Exception:
+            if action.action_type not in IMAGINED_OUTCOME_ACTIONS:
+                raise
+            # ignore exceptions, since player might imagine impossible outcomes.
+            # ignoring means the value function of this node will be flattened,
+            # to the one before. execute might have partially applied the
+            # outcome (e.g. moved the robber), so start from a clean copy.
+            option_game = game.fork()
+        results.append((option_game, proba))
+    return results
+
+
+def iter_spectrum_in_place(game, action, outcomes=None):
+    """Like execute_spectrum, but without copies. Applies each outcome to the
+    given game, yields (game, proba) and undoes it before the next one.
+    Consumers must exhaust the generator, and not keep references to the
+    game's state across iterations. outcomes defaults to
+    list_spectrum_outcomes(game, action)."""
+    if outcomes is None:
+        outcomes = list_spectrum_outcomes(game, action)
+    for outcome, proba in outcomes:
+        try:
+            record = game.execute_with_undo(outcome, validate_action=False)
+        except Exception:
+            if action.action_type not in IMAGINED_OUTCOME_ACTIONS:
+                raise
+            # same as in execute_spectrum; game was left untouched.
+            yield game, proba
+            continue
+
+        try:
+            yield game, proba
+        finally:
+            game.undo(record)
+
+
 def expand_spectrum(game, actions):
     """Consumes game if playable_actions not specified"""
     children = defaultdict(list)
@@ -178,7 +213,7 @@ def prune_robber_actions(current_color, game, actions):
     production_features = build_production_features(True)
 
     def impact(action):
-        game_copy = game.copy()
+        game_copy = game.fork()
         game_copy.execute(action)
 
         our_production_sample = production_features(game_copy, current_color)
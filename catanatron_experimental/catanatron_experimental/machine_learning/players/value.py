@@ -168,7 +168,7 @@ class ValueFunctionPlayer(Player):
         best_value = float("-inf")
         best_action = None
         for action in playable_actions:
-            game_copy = game.copy()
+            game_copy = game.fork()
             game_copy.execute(action)
 
             value_fn = get_value_fn(self.value_fn_builder_name, self.params)
@@ -40,8 +40,7 @@ def objective(trial):
         ValueFunctionPlayer(Color.BLUE, "C", params=weights),
     ]
     wins, results_by_player = play_batch(200, players)
-    vps = results_by_player[players[1].color]
-    avg_vps = sum(vps) / len(vps)
+    avg_vps = results_by_player[players[1].color].mean
     return 1000 * wins[players[1].color] + avg_vps
 
 
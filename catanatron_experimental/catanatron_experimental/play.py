@@ -1,7 +1,10 @@
 import os
 import importlib.util
+import multiprocessing
+import random
+import sys
 from dataclasses import dataclass
-from typing import Literal, Union
+from typing import Dict, Literal, Optional, Tuple, Union
 
 import click
 from rich.console import Console
@@ -115,6 +118,20 @@ class CustomTimeRemainingColumn(TimeRemainingColumn):
     type=click.Choice(["BASE", "MINI", "TOURNAMENT"], case_sensitive=False),
     help="Sets Map to use. MINI is a 7-tile smaller version. TOURNAMENT uses a fixed balanced map.",
 )
+@click.option(
+    "--parallel",
+    default=0,
+    help="""
+        Number of processes to play games in (0 plays them in this one).
+        Workers build their own players and merge their results at the end.
+        """,
+)
+@click.option(
+    "--seed",
+    default=None,
+    type=int,
+    help="Seed games (game i uses SEED + i), for results that can be reproduced, with any --parallel.",
+)
 @click.option(
     "--quiet",
     default=False,
@@ -139,6 +156,8 @@ def simulate(
     config_discard_limit,
     config_vps_to_win,
     config_map,
+    parallel,
+    seed,
     quiet,
     help_players,
 ):
@@ -151,7 +170,8 @@ def simulate(
         catanatron-play --players=R,R,R,R --num=1000\n
         catanatron-play --players=W,W,R,R --num=50000 --output=data/ --csv\n
         catanatron-play --players=VP,F --num=10 --output=data/ --json\n
-        catanatron-play --players=W,F,AB:3 --num=1 --csv --json --db --quiet
+        catanatron-play --players=W,F,AB:3 --num=1 --csv --json --db --quiet\n
+        catanatron-play --players=AB:2,AB:2 --num=100 --parallel=4 --seed=1
     """
     if code:
         abspath = os.path.abspath(code)
@@ -164,8 +184,28 @@ def simulate(
         return Console().print(player_help_table())
     if output and not (json or csv):
         return print("--output requires either --json or --csv to be set")
+    if csv and parallel:
+        return print("--csv can't be used with --parallel")
 
     player_keys = players.split(",")
+    players = build_players(player_keys)
+
+    output_options = OutputOptions(output, csv, json, db)
+    game_config = GameConfigOptions(config_discard_limit, config_vps_to_win, config_map)
+    play_batch(
+        num,
+        players,
+        output_options,
+        game_config,
+        quiet,
+        num_workers=parallel,
+        seed=seed,
+        player_keys=player_keys,
+    )
+
+
+def build_players(player_keys):
+    """Creates players from CLI codes (e.g. ["R", "AB:2"]), one per Color"""
     players = []
     colors = [c for c in Color]
     for i, key in enumerate(player_keys):
@@ -177,16 +217,7 @@ def simulate(
                 player = cli_player.import_fn(*params)
                 players.append(player)
                 break
-
-    output_options = OutputOptions(output, csv, json, db)
-    game_config = GameConfigOptions(config_discard_limit, config_vps_to_win, config_map)
-    play_batch(
-        num,
-        players,
-        output_options,
-        game_config,
-        quiet,
-    )
+    return players
 
 
 @dataclass(frozen=True)
@@ -206,6 +237,35 @@ class GameConfigOptions:
     catan_map: Literal["BASE", "TOURNAMENT", "MINI"] = "BASE"
 
 
+@dataclass(frozen=True)
+class GameSummary:
+    """What the CLI shows of a finished game (small enough to send across
+    processes, unlike Game)"""
+
+    colors: Tuple[Color]
+    num_turns: int
+    victory_points: Dict[Color, int]
+    winning_color: Optional[Color]
+    link: Optional[str] = None  # if saved to database
+
+    @staticmethod
+    def from_game(game, accumulators=[]):
+        link = None
+        for accumulator in accumulators:
+            if isinstance(accumulator, DatabaseAccumulator):
+                link = accumulator.link
+        return GameSummary(
+            game.state.colors,
+            game.state.num_turns,
+            {
+                color: get_actual_victory_points(game.state, color)
+                for color in game.state.colors
+            },
+            game.winning_color(),
+            link,
+        )
+
+
 COLOR_TO_RICH_STYLE = {
     Color.RED: "red",
     Color.BLUE: "blue",
@@ -226,17 +286,22 @@ def rich_color(color):
     return f"[{style}]{color.value}[/{style}]"
 
 
-def play_batch_core(num_games, players, game_config, accumulators=[]):
-    for accumulator in accumulators:
-        if isinstance(accumulator, SimulationAccumulator):
-            accumulator.before_all()
-
-    for _ in range(num_games):
+def play_games(game_indices, players, game_config, accumulators=[], seed=None):
+    """Plays (and yields) a game per index. With seed, game i uses seed + i
+    for its map and Game seed, so it plays out the same regardless of which
+    other games this process plays (for players that use the random module).
+    """
+    for i in game_indices:
         for player in players:
             player.reset_state()
+        game_seed = None
+        if seed is not None:
+            game_seed = seed + i
+            random.seed(game_seed)
         catan_map = build_map(game_config.catan_map)
         game = Game(
             players,
+            seed=game_seed,
             discard_limit=game_config.discard_limit,
             vps_to_win=game_config.vps_to_win,
             catan_map=catan_map,
@@ -244,26 +309,83 @@ def play_batch_core(num_games, players, game_config, accumulators=[]):
         game.play(accumulators)
         yield game
 
+
+def play_batch_core(num_games, players, game_config, accumulators=[], seed=None):
+    for accumulator in accumulators:
+        if isinstance(accumulator, SimulationAccumulator):
+            accumulator.before_all()
+
+    yield from play_games(range(num_games), players, game_config, accumulators, seed)
+
     for accumulator in accumulators:
         if isinstance(accumulator, SimulationAccumulator):
             accumulator.after_all()
 
 
-def play_batch(
+TASKS_PER_WORKER = 4  # smaller tasks, for a smoother progress bar
+
+
+def play_batch_parallel_core(
     num_games,
-    players,
+    player_keys,
+    game_config,
+    accumulators,
+    num_workers,
+    seed,
     output_options=None,
-    game_config=None,
-    quiet=False,
 ):
+    """Like play_batch_core, but plays games in num_workers processes and
+    yields GameSummary-s (in game order).
+
+    Each worker builds its own players (from player_keys) and accumulators
+    (per build_accumulators) and plays a range of games. The .partial() of
+    its accumulators are sent back and merged into the given ones, which
+    must have been built the same way. Those that can't be merged (e.g.
+    JSON output) only live in workers. Workers call before_all (to set up)
+    but not after_all, which is only called on the given ones.
+    """
     output_options = output_options or OutputOptions()
-    game_config = game_config or GameConfigOptions()
+    for accumulator in accumulators:
+        if isinstance(accumulator, SimulationAccumulator):
+            accumulator.before_all()
 
-    statistics_accumulator = StatisticsAccumulator()
-    vp_accumulator = VpDistributionAccumulator()
-    accumulators = [statistics_accumulator, vp_accumulator]
-    if output_options.output:
-        ensure_dir(output_options.output)
+    num_tasks = max(1, min(num_games, num_workers * TASKS_PER_WORKER))
+    bounds = [num_games * k // num_tasks for k in range(num_tasks + 1)]
+    tasks = [
+        (player_keys, game_config, output_options, seed, range(start, end))
+        for start, end in zip(bounds[:-1], bounds[1:])
+    ]
+    with multiprocessing.Pool(num_workers) as pool:
+        for summaries, partials in pool.imap(play_games_task, tasks):
+            for accumulator, partial in zip(accumulators, partials):
+                if partial is not None:
+                    accumulator.merge(partial)
+            yield from summaries
+
+    for accumulator in accumulators:
+        if isinstance(accumulator, SimulationAccumulator):
+            accumulator.after_all()
+
+
+def play_games_task(args):
+    """Worker side of play_batch_parallel_core. Returns the GameSummary-s
+    and the .partial() of each accumulator"""
+    player_keys, game_config, output_options, seed, game_indices = args
+    players = build_players(player_keys)
+    accumulators = build_accumulators(players, output_options, game_config)
+    for accumulator in accumulators:
+        if isinstance(accumulator, SimulationAccumulator):
+            accumulator.before_all()
+    summaries = [
+        GameSummary.from_game(game, accumulators)
+        for game in play_games(game_indices, players, game_config, accumulators, seed)
+    ]
+    return summaries, [accumulator.partial() for accumulator in accumulators]
+
+
+def build_accumulators(players, output_options, game_config):
+    """Statistics and VP distribution accumulators first, then output ones"""
+    accumulators = [StatisticsAccumulator(), VpDistributionAccumulator()]
     if output_options.output and output_options.csv:
         accumulators.append(CsvDataAccumulator(output_options.output))
     if output_options.output and output_options.json:
@@ -272,14 +394,66 @@ def play_batch(
         accumulators.append(DatabaseAccumulator())
     for accumulator_class in CUSTOM_ACCUMULATORS:
         accumulators.append(accumulator_class(players=players, game_config=game_config))
+    return accumulators
+
+
+def play_batch(
+    num_games,
+    players,
+    output_options=None,
+    game_config=None,
+    quiet=False,
+    num_workers=0,
+    seed=None,
+    player_keys=None,
+):
+    """Plays num_games games. With num_workers > 0, plays them in that many
+    processes, which build their players from player_keys (CLI codes, e.g.
+    ["R", "AB:2"]).
+
+    Returns:
+        (Dict[Color, int], Dict[Color, Histogram]): Wins and victory points
+            (of finished games) per color.
+    """
+    output_options = output_options or OutputOptions()
+    game_config = game_config or GameConfigOptions()
+
+    if output_options.output:
+        ensure_dir(output_options.output)
+    accumulators = build_accumulators(players, output_options, game_config)
+    statistics_accumulator, vp_accumulator = accumulators[:2]
+
+    if num_workers > 0:
+        if player_keys is None:
+            raise ValueError("Playing in parallel needs player_keys")
+        if output_options.output and output_options.csv:
+            # workers would append to the same CSV files
+            raise ValueError("CSV output can't be written in parallel")
+        if seed is None:  # else forked workers would play the same games
+            seed = random.randrange(sys.maxsize)
+        summaries = play_batch_parallel_core(
+            num_games,
+            player_keys,
+            game_config,
+            accumulators,
+            num_workers,
+            seed,
+            output_options,
+        )
+    else:
+        summaries = (
+            GameSummary.from_game(game, accumulators)
+            for game in play_batch_core(
+                num_games, players, game_config, accumulators, seed
+            )
+        )
 
     if quiet:
-        for _ in play_batch_core(num_games, players, game_config, accumulators):
+        for _ in summaries:
             pass
         return (
             dict(statistics_accumulator.wins),
             dict(statistics_accumulator.results_by_player),
-            statistics_accumulator.games,
         )
 
     # ===== Game Details
@@ -310,24 +484,21 @@ def play_batch(
             for player in players
         ]
 
-        for i, game in enumerate(
-            play_batch_core(num_games, players, game_config, accumulators)
-        ):
-            winning_color = game.winning_color()
+        for i, summary in enumerate(summaries):
+            winning_color = summary.winning_color
 
             if (num_games - last_n) < (i + 1):
-                seating = ",".join([rich_color(c) for c in game.state.colors])
+                seating = ",".join([rich_color(c) for c in summary.colors])
                 row = [
                     str(i + 1),
                     seating,
-                    str(game.state.num_turns),
+                    str(summary.num_turns),
                 ]
                 for player in players:  # should be in column order
-                    points = get_actual_victory_points(game.state, player.color)
-                    row.append(str(points))
+                    row.append(str(summary.victory_points[player.color]))
                 row.append(rich_color(winning_color))
                 if output_options.db:
-                    row.append(accumulators[-1].link)
+                    row.append(summary.link)
 
                 table.add_row(*row)
 
@@ -352,8 +523,7 @@ def play_batch(
     table.add_column("AVG ARMY", justify="right")
     table.add_column("AVG DEV VP", justify="right")
     for player in players:
-        vps = statistics_accumulator.results_by_player[player.color]
-        avg_vps = sum(vps) / len(vps)
+        avg_vps = statistics_accumulator.results_by_player[player.color].mean
         avg_settlements = vp_accumulator.get_avg_settlements(player.color)
         avg_cities = vp_accumulator.get_avg_cities(player.color)
         avg_largest = vp_accumulator.get_avg_largest(player.color)
@@ -388,7 +558,6 @@ def play_batch(
     return (
         dict(statistics_accumulator.wins),
         dict(statistics_accumulator.results_by_player),
-        statistics_accumulator.games,
     )
 
 
@@ -19,8 +19,7 @@ def objective(config):
         ValueFunctionPlayer(Color.BLUE, "C", params=config),
     ]
     wins, results_by_player = play_batch(100, players)
-    vps = results_by_player[players[1].color]
-    avg_vps = sum(vps) / len(vps)
+    avg_vps = results_by_player[players[1].color].mean
     score = 100 * wins[players[1].color] + avg_vps
 
     tune.report(score=score)  # This sends the score to Tune.
@@ -1,19 +1,15 @@
-import networkx as nx
 import numpy as np
 
-from catanatron.state_functions import get_player_buildings
 from catanatron.models.player import Color
 from catanatron.game import Game
 from catanatron.models.enums import (
     RESOURCES,
-    SETTLEMENT,
     CITY,
-    ROAD,
 )
 from catanatron.models.coordinate_system import offset_to_cube
-from catanatron.models.board import STATIC_GRAPH
+from catanatron.models.topology import EDGE_IDS, NUM_GRAPH_EDGES, shortest_path
 from catanatron.models.map import number_probability
-from catanatron_gym.features import get_feature_ordering, iter_players
+from catanatron_gym.features import get_feature_ordering
 
 # These assume 4 players
 WIDTH = 21
@@ -65,7 +61,7 @@ def get_tile_coordinate_map():
     return TILE_COORDINATE_MAP
 
 
-# Create mapping of node_id => i,j and edge => i,j. Respecting (WIDTH, HEIGHT)
+# Create mapping of node_id => i,j and edge_id => i,j. Respecting (WIDTH, HEIGHT)
 def init_board_tensor_map():
     # These are node-pairs (start,end) for the lines that go from left to right
     pairs = [
@@ -76,7 +72,7 @@ def init_board_tensor_map():
         (73, 59),
         (72, 60),
     ]
-    paths = [nx.shortest_path(STATIC_GRAPH, a, b) for (a, b) in pairs]
+    paths = [shortest_path(a, b) for (a, b) in pairs]
 
     node_map = {}
     edge_map = {}
@@ -87,15 +83,10 @@ def init_board_tensor_map():
             node_has_down_edge = (i + j) % 2 == 0
             if node_has_down_edge and i + 1 < len(pairs):
                 next_path = paths[i + 1]
-                edge_map[(node, next_path[j])] = (2 * j, 2 * i + 1)
-                edge_map[(next_path[j], node)] = (
-                    2 * j,
-                    2 * i + 1,
-                )
+                edge_map[EDGE_IDS[(node, next_path[j])]] = (2 * j, 2 * i + 1)
 
             if j + 1 < len(path):
-                edge_map[(node, path[j + 1])] = (2 * j + 1, 2 * i)
-                edge_map[(path[j + 1], node)] = (2 * j + 1, 2 * i)
+                edge_map[EDGE_IDS[(node, path[j + 1])]] = (2 * j + 1, 2 * i)
 
     return node_map, edge_map
 
@@ -130,69 +121,121 @@ def create_board_tensor(game: Game, p0_color: Color, channels_first=False):
     1 robber plane (to note nodes blocked by robber).
     6 port planes (one for each resource and one for the 3:1 ports)
 
+    Planes are kept in a BoardTensorCache attached to the board (and shared
+    with its copies), that only updates the cells that changed since the
+    last board it saw. Result is a new array (safe to modify).
+
     Example:
         - To see WHEAT plane: tf.transpose(board_tensor[:,:,3])
     """
-    # add n hot-encoded color multiplier planes (nodes), and n edge planes. 2*n planes
-    n = len(game.state.colors)
-    channels = 2 * n + 5 + 1 + 6
-    planes = [
-        [[0.0 for i in range(HEIGHT)] for j in range(WIDTH)] for _ in range(channels)
-    ]
-    node_map, edge_map = get_node_and_edge_maps()
-    for i, color in iter_players(tuple(game.state.colors), p0_color):
-        for node_id in get_player_buildings(game.state, color, SETTLEMENT):
-            indices = node_map[node_id]
-            planes[2 * i][indices[0]][indices[1]] = 1.0
-        for node_id in get_player_buildings(game.state, color, CITY):
-            indices = node_map[node_id]
-            planes[2 * i][indices[0]][indices[1]] = 2.0
-
-        for edge in get_player_buildings(game.state, color, ROAD):
-            indices = edge_map[edge]
-            planes[2 * i + 1][indices[0]][indices[1]] = 1.0
-
-    # set 5 node-resource probas
-    resources = [i for i in RESOURCES]
-    tile_map = get_tile_coordinate_map()
-    for coordinate, tile in game.state.board.map.land_tiles.items():
-        if tile.resource is None:
-            continue  # there is already a 3x5 zeros matrix there (everything started as a 0!).
-
-        # Tile looks like:
-        # [0.33, 0, 0.33, 0, 0.33]
-        # [   0, 0,    0, 0,    0]
-        # [0.33, 0, 0.33, 0, 0.33]
-        proba = 0 if tile.number is None else number_probability(tile.number)
-        (y, x) = tile_map[coordinate]  # returns values in (row, column) math def
-        channel_idx = 2 * n + resources.index(tile.resource)
-        planes[channel_idx][x][y] += proba
-        planes[channel_idx][x + 2][y] += proba
-        planes[channel_idx][x + 4][y] += proba
-        planes[channel_idx][x][y + 2] += proba
-        planes[channel_idx][x + 2][y + 2] += proba
-        planes[channel_idx][x + 4][y + 2] += proba
-
-    # set 1 robber channel
-    (y, x) = tile_map[game.state.board.robber_coordinate]
-    planes[2 * n + 5][x][y] = 1
-    planes[2 * n + 5][x + 2][y] = 1
-    planes[2 * n + 5][x + 4][y] = 1
-    planes[2 * n + 5][x][y + 2] = 1
-    planes[2 * n + 5][x + 2][y + 2] = 1
-    planes[2 * n + 5][x + 4][y + 2] = 1
-
-    # Q: Would this be simpler as boolean features for each player?
-    # add 6 port channels (5 resources + 1 for 3:1 ports)
-    # for each port, take index and take node_id coordinates
-    for resource, node_ids in game.state.board.map.port_nodes.items():
-        channel_idx_delta = 5 if resource is None else resources.index(resource)
-        channel_idx = 2 * n + 5 + 1 + channel_idx_delta
-        for node_id in node_ids:
-            (x, y) = node_map[node_id]
-            planes[channel_idx][x][y] = 1
-
-    result = np.array(planes)
+    state = game.state
+    board = state.board
+    n = len(state.colors)
+    cache = board.tensor_cache
+    if cache is None or cache.map is not board.map or cache.num_players != n:
+        cache = BoardTensorCache(board.map, n)
+        board.tensor_cache = cache
+    cache.sync(board, state)
+
+    result = cache.planes[cache.get_channel_order(state.color_to_index[p0_color])]
     if not channels_first:
         return np.transpose(result, (1, 2, 0))
     return result
+
+
+class BoardTensorCache:
+    """create_board_tensor planes, with player planes by seat (instead of
+    relative to p0). Kept in sync with boards by diffing their buildings,
+    roads and robber against the ones it last saw, so it works for any
+    board of the game (copies, undos) and is cheap for similar boards."""
+
+    def __init__(self, catan_map, num_players):
+        self.map = catan_map
+        self.num_players = num_players
+        channels = 2 * num_players + 5 + 1 + 6
+        self.planes = np.zeros((channels, WIDTH, HEIGHT))
+        self.channel_orders = dict()  # p0 seat => channel permutation
+
+        # What planes reflect
+        self.buildings = dict()
+        self.roads = [None] * NUM_GRAPH_EDGES
+        self.robber_coordinate = None
+
+        # set 5 node-resource probas
+        n = num_players
+        resources = [i for i in RESOURCES]
+        tile_map = get_tile_coordinate_map()
+        for coordinate, tile in catan_map.land_tiles.items():
+            if tile.resource is None:
+                continue  # there is already a 3x5 zeros matrix there (everything started as a 0!).
+
+            # Tile looks like:
+            # [0.33, 0, 0.33, 0, 0.33]
+            # [   0, 0,    0, 0,    0]
+            # [0.33, 0, 0.33, 0, 0.33]
+            proba = 0 if tile.number is None else number_probability(tile.number)
+            (y, x) = tile_map[coordinate]  # returns values in (row, column) math def
+            channel_idx = 2 * n + resources.index(tile.resource)
+            self.planes[channel_idx, x : x + 5 : 2, y : y + 3 : 2] += proba
+
+        # Q: Would this be simpler as boolean features for each player?
+        # add 6 port channels (5 resources + 1 for 3:1 ports)
+        # for each port, take index and take node_id coordinates
+        node_map, _ = get_node_and_edge_maps()
+        for resource, node_ids in catan_map.port_nodes.items():
+            channel_idx_delta = 5 if resource is None else resources.index(resource)
+            channel_idx = 2 * n + 5 + 1 + channel_idx_delta
+            for node_id in node_ids:
+                (x, y) = node_map[node_id]
+                self.planes[channel_idx, x, y] = 1
+
+    def sync(self, board, state):
+        """Updates planes to match board (of given state)"""
+        node_map, edge_map = get_node_and_edge_maps()
+        seats = state.color_to_index
+
+        if board.buildings != self.buildings:
+            old, new = self.buildings.items(), board.buildings.items()
+            for node_id, (color, _) in old - new:
+                (x, y) = node_map[node_id]
+                self.planes[2 * seats[color], x, y] = 0.0
+            for node_id, (color, building_type) in new - old:
+                (x, y) = node_map[node_id]
+                value = 2.0 if building_type == CITY else 1.0
+                self.planes[2 * seats[color], x, y] = value
+            self.buildings = board.buildings.copy()
+
+        if board.roads != self.roads:
+            for edge_id, (old, new) in enumerate(zip(self.roads, board.roads)):
+                if old == new:
+                    continue
+                (x, y) = edge_map[edge_id]
+                if old is not None:
+                    self.planes[2 * seats[old] + 1, x, y] = 0.0
+                if new is not None:
+                    self.planes[2 * seats[new] + 1, x, y] = 1.0
+            self.roads = list(board.roads)
+
+        if board.robber_coordinate != self.robber_coordinate:
+            tile_map = get_tile_coordinate_map()
+            channel_idx = 2 * self.num_players + 5
+            if self.robber_coordinate is not None:
+                (y, x) = tile_map[self.robber_coordinate]
+                self.planes[channel_idx, x : x + 5 : 2, y : y + 3 : 2] = 0
+            (y, x) = tile_map[board.robber_coordinate]
+            self.planes[channel_idx, x : x + 5 : 2, y : y + 3 : 2] = 1
+            self.robber_coordinate = board.robber_coordinate
+
+    def get_channel_order(self, p0_seat):
+        """Channel permutation that puts p0's planes first (see iter_players)"""
+        order = self.channel_orders.get(p0_seat)
+        if order is None:
+            n = self.num_players
+            order = []
+            for i in range(n):
+                seat = (p0_seat + i) % n
+                order.extend([2 * seat, 2 * seat + 1])
+            order.extend(range(2 * n, len(self.planes)))
+            order = np.array(order)
+            self.channel_orders[p0_seat] = order
+        return order
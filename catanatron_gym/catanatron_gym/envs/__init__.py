@@ -1 +1,2 @@
 from catanatron_gym.envs.catanatron_env import CatanatronEnv
+from catanatron_gym.envs.catanatron_vec_env import CatanatronVecEnv
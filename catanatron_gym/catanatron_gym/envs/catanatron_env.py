@@ -6,9 +6,10 @@ from catanatron.game import Game, TURNS_LIMIT
 from catanatron.models.player import Color, Player, RandomPlayer
 from catanatron.models.map import BASE_MAP_TEMPLATE, NUM_NODES, LandTile, build_map
 from catanatron.models.enums import RESOURCES, Action, ActionType
-from catanatron.models.board import get_edges
+from catanatron.models.action_table import ACTIONS
+from catanatron.models.board import get_edge_ids
 from catanatron_gym.features import (
-    create_sample,
+    create_sample_array,
     get_feature_ordering,
 )
 from catanatron_gym.board_tensor_features import (
@@ -25,7 +26,7 @@ ACTIONS_ARRAY = [
     # TODO: One for each tile (and abuse 1v1 setting).
     *[(ActionType.MOVE_ROBBER, tile) for tile in TILE_COORDINATES],
     (ActionType.DISCARD, None),
-    *[(ActionType.BUILD_ROAD, tuple(sorted(edge))) for edge in get_edges()],
+    *[(ActionType.BUILD_ROAD, edge_id) for edge_id in get_edge_ids()],
     *[(ActionType.BUILD_SETTLEMENT, node_id) for node_id in range(NUM_NODES)],
     *[(ActionType.BUILD_CITY, node_id) for node_id in range(NUM_NODES)],
     (ActionType.BUY_DEVELOPMENT_CARD, None),
@@ -62,6 +63,7 @@ ACTIONS_ARRAY = [
     (ActionType.END_TURN, None),
 ]
 ACTION_SPACE_SIZE = len(ACTIONS_ARRAY)
+ACTIONS_INDEX = {action: i for i, action in enumerate(ACTIONS_ARRAY)}
 ACTION_TYPES = [i for i in ActionType]
 
 
@@ -75,8 +77,6 @@ def normalize_action(action):
         return Action(action.color, action.action_type, None)
     elif normalized.action_type == ActionType.MOVE_ROBBER:
         return Action(action.color, action.action_type, action.value[0])
-    elif normalized.action_type == ActionType.BUILD_ROAD:
-        return Action(action.color, action.action_type, tuple(sorted(action.value)))
     elif normalized.action_type == ActionType.BUY_DEVELOPMENT_CARD:
         return Action(action.color, action.action_type, None)
     elif normalized.action_type == ActionType.DISCARD:
@@ -86,25 +86,38 @@ def normalize_action(action):
 
 def to_action_space(action):
     """maps action to space_action equivalent integer"""
+    code = getattr(action, "code", None)  # interned actions (see action_table.py)
+    if code is not None and ACTION_SPACE_INDICES[code] is not None:
+        return ACTION_SPACE_INDICES[code]
     normalized = normalize_action(action)
-    return ACTIONS_ARRAY.index((normalized.action_type, normalized.value))
+    return ACTIONS_INDEX[(normalized.action_type, normalized.value)]
 
 
 def from_action_space(action_int, playable_actions):
     """maps action_int to catantron.models.actions.Action"""
     # Get "catan_action" based on space action.
     # i.e. Take first action in playable that matches ACTIONS_ARRAY blueprint
-    (action_type, value) = ACTIONS_ARRAY[action_int]
-    catan_action = None
-    for action in playable_actions:
-        normalized = normalize_action(action)
-        if normalized.action_type == action_type and normalized.value == value:
-            catan_action = action
-            break  # return the first one
-    assert catan_action is not None
+    catan_action = get_action_map(playable_actions).get(action_int)
+    if catan_action is None:
+        raise ValueError(f"Action {action_int} is not playable right now")
     return catan_action
 
 
+# interned action code => its action space integer (None if not in the space)
+ACTION_SPACE_INDICES = [
+    ACTIONS_INDEX.get((normalized.action_type, normalized.value))
+    for normalized in map(normalize_action, ACTIONS)
+]
+
+
+def get_action_map(playable_actions):
+    """Returns action_int => first action in playable_actions with that int"""
+    action_map = dict()
+    for action in playable_actions:
+        action_map.setdefault(to_action_space(action), action)
+    return action_map
+
+
 FEATURES = get_feature_ordering(num_players=2)
 NUM_FEATURES = len(FEATURES)
 
@@ -147,6 +160,8 @@ class CatanatronEnv(gym.Env):
         self.features = get_feature_ordering(len(self.players), self.map_type)
         self.invalid_actions_count = 0
         self.max_invalid_actions = 10
+        self.action_map = dict()
+        self.action_map_source = None  # playable_actions action_map is for
 
         # TODO: Make self.action_space smaller if possible (per map_type)
         # self.action_space = spaces.Discrete(ACTION_SPACE_SIZE)
@@ -183,38 +198,60 @@ class CatanatronEnv(gym.Env):
         """
         return list(map(to_action_space, self.game.state.playable_actions))
 
+    def get_action_mask(self, out=None):
+        """
+        Args:
+            out (np.ndarray, optional): Where to write the mask
+        Returns:
+            np.ndarray: bool array of ACTION_SPACE_SIZE, True for valid actions
+        """
+        mask = np.zeros(ACTION_SPACE_SIZE, dtype=bool) if out is None else out
+        mask[:] = False
+        mask[list(self.get_action_map())] = True
+        return mask
+
+    def get_action_map(self):
+        """action_int => Action, for the current playable actions (cached)"""
+        playable_actions = self.game.state.playable_actions
+        if self.action_map_source is not playable_actions:
+            self.action_map = get_action_map(playable_actions)
+            self.action_map_source = playable_actions
+        return self.action_map
+
+    def get_info(self):
+        return dict(
+            valid_actions=self.get_valid_actions(),
+            action_mask=self.get_action_mask(),
+        )
+
     def step(self, action):
-        try:
-            catan_action = from_action_space(action, self.game.state.playable_actions)
-        except Exception as e:
+        reward, terminated, truncated = self._step(action)
+        observation = self._get_observation()
+        info = self.get_info()
+        return observation, reward, terminated, truncated, info
+
+    def _step(self, action):
+        """Plays action (and enemies until p0's turn). Returns reward and flags"""
+        catan_action = self.get_action_map().get(action)
+        if catan_action is None:
             self.invalid_actions_count += 1
 
-            observation = self._get_observation()
             winning_color = self.game.winning_color()
-            done = (
-                winning_color is not None
-                or self.invalid_actions_count > self.max_invalid_actions
-            )
             terminated = winning_color is not None
             truncated = (
                 self.invalid_actions_count > self.max_invalid_actions
                 or self.game.state.num_turns >= TURNS_LIMIT
             )
-            info = dict(valid_actions=self.get_valid_actions())
-            return observation, self.invalid_action_reward, terminated, truncated, info
+            return self.invalid_action_reward, terminated, truncated
 
         self.game.execute(catan_action)
         self._advance_until_p0_decision()
 
-        observation = self._get_observation()
-        info = dict(valid_actions=self.get_valid_actions())
-
         winning_color = self.game.winning_color()
         terminated = winning_color is not None
         truncated = self.game.state.num_turns >= TURNS_LIMIT
         reward = self.reward_function(self.game, self.p0.color)
-
-        return observation, reward, terminated, truncated, info
+        return reward, terminated, truncated
 
     def reset(
         self,
@@ -222,7 +259,14 @@ class CatanatronEnv(gym.Env):
         options=None,
     ):
         super().reset(seed=seed)
+        self._reset(seed)
+
+        observation = self._get_observation()
+        info = self.get_info()
 
+        return observation, info
+
+    def _reset(self, seed=None):
         catan_map = build_map(self.map_type)
         for player in self.players:
             player.reset_state()
@@ -236,21 +280,21 @@ class CatanatronEnv(gym.Env):
 
         self._advance_until_p0_decision()
 
-        observation = self._get_observation()
-        info = dict(valid_actions=self.get_valid_actions())
-
-        return observation, info
-
-    def _get_observation(self):
-        sample = create_sample(self.game, self.p0.color)
+    def _get_observation(self, out=None):
+        """out (optional): Where to write a "vector" observation"""
         if self.representation == "mixed":
             board_tensor = create_board_tensor(
                 self.game, self.p0.color, channels_first=True
             )
-            numeric = np.array([float(sample[i]) for i in self.numeric_features])
-            return {"board": board_tensor, "numeric": numeric}
+            numeric = create_sample_array(
+                self.game, self.p0.color, self.numeric_features
+            )
+            return {"board": board_tensor, "numeric": numeric.astype(float)}
 
-        return np.array([float(sample[i]) for i in self.features])
+        if out is not None:
+            return create_sample_array(self.game, self.p0.color, self.features, out)
+        sample = create_sample_array(self.game, self.p0.color, self.features)
+        return sample.astype(float)
 
     def _advance_until_p0_decision(self):
         while (
@@ -0,0 +1,214 @@
+import copy
+import multiprocessing
+import random
+
+import numpy as np
+from gymnasium.vector import VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from catanatron_gym.envs.catanatron_env import ACTION_SPACE_SIZE, CatanatronEnv
+
+
+class CatanatronVecEnv(VectorEnv):
+    """N CatanatronEnv games stepped together, writing into preallocated
+    (N, ...) arrays instead of stacking per-env results.
+
+    step(actions) returns observations, rewards, terminated, truncated and
+    info, where info["action_mask"] is a (N, ACTION_SPACE_SIZE) bool
+    array (the masks CatanatronEnv gives under the same key). Finished games are reset automatically (as in gymnasium's vector
+    envs, their last observation and info are in info["final_observation"]
+    and info["final_info"]).
+
+    With num_workers > 0, games are split among that many processes, which
+    write their results straight into shared memory. Only the "vector"
+    representation is supported.
+
+    Note: Returned arrays are reused by the next step; copy them to keep them.
+    """
+
+    def __init__(self, num_envs, config=None, num_workers=0):
+        config = config or dict()
+        assert config.get("representation", "vector") == "vector"
+        env = CatanatronEnv(copy.deepcopy(config))
+        super().__init__(num_envs, env.observation_space, env.action_space)
+        self.single_observation_space = env.observation_space
+        self.single_action_space = env.action_space
+        self.observation_space = batch_space(env.observation_space, num_envs)
+        self.num_features = env.observation_space.shape[0]
+        self.num_workers = min(num_workers, num_envs)
+
+        shapes = get_buffer_shapes(num_envs, self.num_features)
+        if self.num_workers == 0:
+            self.buffers = {
+                name: np.zeros(shape, dtype) for name, (shape, dtype) in shapes.items()
+            }
+            envs = [env] + [
+                CatanatronEnv(copy.deepcopy(config)) for _ in range(num_envs - 1)
+            ]
+            self.batch = EnvBatch(envs, self.buffers)
+        else:
+            self.raw_buffers = {
+                name: multiprocessing.RawArray(
+                    np.ctypeslib.as_ctypes_type(dtype), int(np.prod(shape))
+                )
+                for name, (shape, dtype) in shapes.items()
+            }
+            self.buffers = get_buffer_views(self.raw_buffers, shapes, 0, num_envs)
+            self.slices = np.array_split(np.arange(num_envs), self.num_workers)
+            self.pipes = []
+            self.processes = []
+            for indices in self.slices:
+                parent_conn, child_conn = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=worker,
+                    args=(
+                        child_conn,
+                        config,
+                        self.raw_buffers,
+                        shapes,
+                        indices[0],
+                        indices[-1] + 1,
+                    ),
+                    daemon=True,
+                )
+                process.start()
+                child_conn.close()
+                self.pipes.append(parent_conn)
+                self.processes.append(process)
+        self.actions = None
+
+    def reset_async(self, seed=None, options=None):
+        if seed is None:
+            seeds = [None] * self.num_envs
+        elif isinstance(seed, int):
+            seeds = [seed + i for i in range(self.num_envs)]
+        else:
+            seeds = list(seed)
+        self.seeds = seeds
+
+        if self.num_workers > 0:
+            for pipe, indices in zip(self.pipes, self.slices):
+                pipe.send(("reset", [seeds[i] for i in indices]))
+
+    def reset_wait(self, seed=None, options=None):
+        if self.num_workers == 0:
+            self.batch.reset(self.seeds)
+        else:
+            for pipe in self.pipes:
+                pipe.recv()
+        return self.buffers["observations"], self.get_info(dict())
+
+    def step_async(self, actions):
+        self.actions = np.asarray(actions)
+        if self.num_workers > 0:
+            for pipe, indices in zip(self.pipes, self.slices):
+                pipe.send(("step", self.actions[indices]))
+
+    def step_wait(self):
+        if self.num_workers == 0:
+            finals = self.batch.step(self.actions)
+        else:
+            finals = dict()
+            for pipe, indices in zip(self.pipes, self.slices):
+                for i, final in pipe.recv().items():
+                    finals[indices[0] + i] = final
+        return (
+            self.buffers["observations"],
+            self.buffers["rewards"],
+            self.buffers["terminated"],
+            self.buffers["truncated"],
+            self.get_info(finals),
+        )
+
+    def get_info(self, finals):
+        """finals: env index => (final observation, final info)"""
+        info = dict(action_mask=self.buffers["action_mask"])
+        if len(finals) > 0:
+            final_observation = np.full(self.num_envs, None, dtype=object)
+            final_info = np.full(self.num_envs, None, dtype=object)
+            has_final = np.zeros(self.num_envs, dtype=bool)
+            for i, (observation, env_info) in finals.items():
+                final_observation[i] = observation
+                final_info[i] = env_info
+                has_final[i] = True
+            info["final_observation"] = final_observation
+            info["final_info"] = final_info
+            info["_final_observation"] = has_final
+            info["_final_info"] = has_final
+        return info
+
+    def close_extras(self, **kwargs):
+        if self.num_workers > 0:
+            for pipe in self.pipes:
+                pipe.send(("close", None))
+            for process in self.processes:
+                process.join()
+
+
+def get_buffer_shapes(num_envs, num_features):
+    return {
+        "observations": ((num_envs, num_features), np.float64),
+        "rewards": ((num_envs,), np.float64),
+        "terminated": ((num_envs,), np.bool_),
+        "truncated": ((num_envs,), np.bool_),
+        "action_mask": ((num_envs, ACTION_SPACE_SIZE), np.bool_),
+    }
+
+
+def get_buffer_views(raw_buffers, shapes, start, end):
+    """np views of rows [start, end) of shared raw_buffers"""
+    return {
+        name: np.frombuffer(raw_buffers[name], dtype).reshape(shape)[start:end]
+        for name, (shape, dtype) in shapes.items()
+    }
+
+
+class EnvBatch:
+    """Steps envs, writing results into rows of buffers (one per env)"""
+
+    def __init__(self, envs, buffers):
+        self.envs = envs
+        self.buffers = buffers
+
+    def reset(self, seeds):
+        for i, (env, seed) in enumerate(zip(self.envs, seeds)):
+            env._reset(seed)
+            self.write(i, env)
+        self.buffers["rewards"][:] = 0
+        self.buffers["terminated"][:] = False
+        self.buffers["truncated"][:] = False
+
+    def step(self, actions):
+        """Returns: index => (final observation, final info) of finished games"""
+        finals = dict()
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            reward, terminated, truncated = env._step(int(action))
+            self.buffers["rewards"][i] = reward
+            self.buffers["terminated"][i] = terminated
+            self.buffers["truncated"][i] = truncated
+            if terminated or truncated:
+                finals[i] = (env._get_observation(), env.get_info())
+                env._reset()
+            self.write(i, env)
+        return finals
+
+    def write(self, i, env):
+        env._get_observation(out=self.buffers["observations"][i])
+        env.get_action_mask(out=self.buffers["action_mask"][i])
+
+
+def worker(conn, config, raw_buffers, shapes, start, end):
+    """Process owning envs [start, end) of a CatanatronVecEnv"""
+    random.seed()  # else forked workers would play the same games
+    envs = [CatanatronEnv(copy.deepcopy(config)) for _ in range(start, end)]
+    batch = EnvBatch(envs, get_buffer_views(raw_buffers, shapes, start, end))
+    while True:
+        command, data = conn.recv()
+        if command == "reset":
+            batch.reset(data)
+            conn.send(None)
+        elif command == "step":
+            conn.send(batch.step(data))
+        elif command == "close":
+            conn.close()
+            break
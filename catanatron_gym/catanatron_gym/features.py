@@ -3,7 +3,7 @@ import functools
 from collections import Counter
 from catanatron.models.decks import freqdeck_count
 
-import networkx as nx
+import numpy as np
 
 from catanatron.state_functions import (
     get_player_buildings,
@@ -11,7 +11,21 @@ from catanatron.state_functions import (
     player_num_dev_cards,
     player_num_resource_cards,
 )
-from catanatron.models.board import STATIC_GRAPH, get_edges, get_node_distances
+from catanatron.models.player_state import (
+    HAND_END,
+    HAND_START,
+    IN_HAND_FIELDS,
+    NUM_PLAYER_FIELDS,
+    PLAYED_FIELDS,
+    PlayerField,
+)
+from catanatron.models.board import get_edge_ids, get_edges, get_node_distances
+from catanatron.models.topology import (
+    EDGES,
+    INCIDENT_EDGES,
+    get_land_edges,
+    mask_to_ids,
+)
 from catanatron.models.map import NUM_TILES, CatanMap, build_map
 from catanatron.models.player import Color, SimplePlayer
 from catanatron.models.enums import (
@@ -36,8 +50,8 @@ def is_building(game, node_id, color, building_type):
         return building[0] == color and building[1] == building_type
 
 
-def is_road(game, edge, color):
-    return game.state.board.get_edge_color(edge) == color
+def is_road(game, edge_id, color):
+    return game.state.board.get_edge_color(edge_id) == color
 
 
 @functools.lru_cache(1024)
@@ -165,6 +179,16 @@ def port_features(game, p0_color):
     return map_port_features(game.state.board.map)
 
 
+def map_layout(catan_map):
+    """Hashable summary of what map tile and port features depend on"""
+    tiles = tuple(
+        (coordinate, tile.id, tile.resource, tile.number)
+        for coordinate, tile in catan_map.land_tiles.items()
+    )
+    ports = tuple((port.id, port.resource) for port in catan_map.ports_by_id.values())
+    return tiles, ports
+
+
 @functools.lru_cache(4)
 def initialize_graph_features_template(num_players, catan_map: CatanMap):
     features = {}
@@ -185,8 +209,8 @@ def get_node_hot_encoded(player_index, colors, settlements, cities, roads):
         features[f"NODE{node_id}_P{player_index}_SETTLEMENT"] = True
     for node_id in cities:
         features[f"NODE{node_id}_P{player_index}_CITY"] = True
-    for edge in roads:
-        features[f"EDGE{tuple(sorted(edge))}_P{player_index}_ROAD"] = True
+    for edge_id in roads:
+        features[f"EDGE{EDGES[edge_id]}_P{player_index}_ROAD"] = True
 
     return features
 
@@ -267,11 +291,7 @@ REACHABLE_FEATURES_MAX = 2  # inclusive
 
 
 def get_zero_nodes(game, color):
-    zero_nodes = set()
-    for component in game.state.board.connected_components[color]:
-        for node_id in component:
-            zero_nodes.add(node_id)
-    return zero_nodes
+    return set(mask_to_ids(game.state.board.reachable_masks[color]))
 
 
 @functools.lru_cache(maxsize=2000)
@@ -280,10 +300,10 @@ def iter_level_nodes(enemy_nodes, enemy_roads, num_roads, zero_nodes):
 
     Args:
         enemy_nodes (frozenset[NodeId]): node_ids owned by enemy colors
-        enemy_roads (frozenset[EdgeId]): edge_ids owned by enemy colors
+        enemy_roads (frozenset[EdgeId]): edge ids owned by enemy colors
         num_roads (int): Max-depth of BFS (inclusive). e.g. 2 will yield
             possible expansions with up to 2 roads.
-        zero_nodes (frozenset[NodeId]): Nodes reachable per board.connected_components
+        zero_nodes (frozenset[NodeId]): Nodes in board.find_connected_components
 
     Yields:
         Tuple[int, Set[NodeId], Dict[NodeId, List[EdgeId]]:
@@ -303,13 +323,12 @@ def iter_level_nodes(enemy_nodes, enemy_roads, num_roads, zero_nodes):
 
             # here we can assume node is empty or owned
             expandable = []
-            for neighbor_id in STATIC_GRAPH.neighbors(node_id):
-                edge = (node_id, neighbor_id)
-                can_follow_edge = edge not in enemy_roads
+            for neighbor_id, edge_id in INCIDENT_EDGES[node_id]:
+                can_follow_edge = edge_id not in enemy_roads
                 if can_follow_edge:
                     expandable.append(neighbor_id)
                     if neighbor_id not in paths:
-                        paths[neighbor_id] = paths[node_id] + [(node_id, neighbor_id)]
+                        paths[neighbor_id] = paths[node_id] + [edge_id]
 
             level_nodes.update(expandable)
 
@@ -351,7 +370,9 @@ def reachability_features(game: Game, p0_color: Color, levels=REACHABLE_FEATURES
             if v is not None and v[0] != color
         )
         enemy_roads = frozenset(
-            k for k, v in game.state.board.roads.items() if v is not None and v != color
+            edge_id
+            for edge_id, road_color in enumerate(game.state.board.roads)
+            if road_color is not None and road_color != color
         )
         for level, level_nodes, paths in iter_level_nodes(
             enemy_nodes, enemy_roads, levels, frozenset(zero_nodes)
@@ -381,25 +402,21 @@ def expansion_features(game: Game, p0_color: Color):
 
     features = {}
 
-    # For each connected component node, bfs_edges (skipping enemy edges and nodes nodes)
-    empty_edges = set(get_edges(game.state.board.map.land_nodes))
-    for i, color in iter_players(game.state.colors, p0_color):
-        empty_edges.difference_update(get_player_buildings(game.state, color, ROAD))
-    searchable_subgraph = STATIC_GRAPH.edge_subgraph(empty_edges)
+    # For each connected component node, bfs (skipping enemy edges and nodes nodes)
+    board = game.state.board
+    empty_edges = set(
+        edge_id
+        for edge_id in get_land_edges(board.map.land_nodes)
+        if board.roads[edge_id] is None
+    )
 
-    board_buildable_node_ids = game.state.board.buildable_node_ids(
-        p0_color, True
+    board_buildable_node_ids = set(
+        board.buildable_node_ids(p0_color, True)
     )  # this should be the same for all players. TODO: Can maintain internally (instead of re-compute).
 
     for i, color in iter_players(game.state.colors, p0_color):
         expandable_node_ids = get_player_expandable_nodes(game, color)
 
-        def skip_blocked_by_enemy(neighbor_ids):
-            for node_id in neighbor_ids:
-                node_color = game.state.board.get_node_color(node_id)
-                if node_color is None or node_color == color:
-                    yield node_id  # not owned by enemy, can explore
-
         # owned_edges = get_player_buildings(state, color, ROAD)
         dis_res_prod = {
             distance: {k: 0 for k in RESOURCES}
@@ -415,32 +432,31 @@ def expansion_features(game: Game, p0_color: Color):
                         production, dis_res_prod[0][resource]
                     )
 
-            if node_id not in searchable_subgraph.nodes():
-                continue  # must be internal node, no need to explore
-
-            bfs_iteration = nx.bfs_edges(
-                searchable_subgraph,
-                node_id,
-                depth_limit=MAX_EXPANSION_DISTANCE - 1,
-                sort_neighbors=skip_blocked_by_enemy,
-            )
-
-            paths = {node_id: []}
-            for edge in bfs_iteration:
-                a, b = edge
-                path_until_now = paths[a]
-                distance = len(path_until_now) + 1
-                paths[b] = paths[a] + [b]
-
-                if b not in board_buildable_node_ids:
-                    continue
-
-                # means we can get to node b, at distance=d, starting from path[0]
-                for resource in RESOURCES:
-                    production = get_node_production(game.state.board.map, b, resource)
-                    dis_res_prod[distance][resource] = max(
-                        production, dis_res_prod[distance][resource]
-                    )
+            # bfs over empty edges, up to MAX_EXPANSION_DISTANCE - 1 roads away
+            visited = {node_id}
+            frontier = [node_id]
+            for distance in range(1, MAX_EXPANSION_DISTANCE):
+                next_frontier = []
+                for a in frontier:
+                    for b, edge_id in INCIDENT_EDGES[a]:
+                        if b in visited or edge_id not in empty_edges:
+                            continue
+                        node_color = board.get_node_color(b)
+                        if node_color is not None and node_color != color:
+                            continue  # owned by enemy, can't explore
+                        visited.add(b)
+                        next_frontier.append(b)
+
+                        if b not in board_buildable_node_ids:
+                            continue
+
+                        # means we can get to node b, at distance=d, from node_id
+                        for resource in RESOURCES:
+                            production = get_node_production(board.map, b, resource)
+                            dis_res_prod[distance][resource] = max(
+                                production, dis_res_prod[distance][resource]
+                            )
+                frontier = next_frontier
 
         for distance, res_prod in dis_res_prod.items():
             for resource, prod in res_prod.items():
@@ -537,3 +553,203 @@ def get_feature_ordering(
     game = Game(players, catan_map=build_map(map_type))
     sample = create_sample(game, players[0].color)
     return sorted(sample.keys())
+
+
+# ===== Compiled features
+# Columns derived from player records, past the record fields (see fill)
+NUM_RESOURCES_COLUMN = NUM_PLAYER_FIELDS
+NUM_DEVS_COLUMN = NUM_PLAYER_FIELDS + 1
+DEV_IN_HAND_FIELDS = [IN_HAND_FIELDS[card] for card in DEVELOPMENT_CARDS]
+
+# P{i}_<name> features read from player records (by relative player i)
+PLAYER_COLUMNS = {
+    "ACTUAL_VPS": PlayerField.ACTUAL_VICTORY_POINTS,
+    "PUBLIC_VPS": PlayerField.VICTORY_POINTS,
+    "HAS_ARMY": PlayerField.HAS_ARMY,
+    "HAS_ROAD": PlayerField.HAS_ROAD,
+    "ROADS_LEFT": PlayerField.ROADS_AVAILABLE,
+    "SETTLEMENTS_LEFT": PlayerField.SETTLEMENTS_AVAILABLE,
+    "CITIES_LEFT": PlayerField.CITIES_AVAILABLE,
+    "HAS_ROLLED": PlayerField.HAS_ROLLED,
+    "LONGEST_ROAD_LENGTH": PlayerField.LONGEST_ROAD_LENGTH,
+    "HAS_PLAYED_DEVELOPMENT_CARD_IN_TURN": PlayerField.HAS_PLAYED_DEVELOPMENT_CARD_IN_TURN,
+    **{f"{card}_IN_HAND": field for card, field in IN_HAND_FIELDS.items()},
+    **{f"{card}_PLAYED": field for card, field in PLAYED_FIELDS.items()},
+    "NUM_RESOURCES_IN_HAND": NUM_RESOURCES_COLUMN,
+    "NUM_DEVS_IN_HAND": NUM_DEVS_COLUMN,
+}
+
+
+class FeaturePlan:
+    """Compiled create_sample_vector for a feature ordering and a kind of
+    game (number of players and map type). Writes features straight into a
+    float32 buffer, at precomputed positions, instead of building a dict.
+
+    Features not known here are filled from create_sample (slow path).
+    """
+
+    def __init__(self, game, features):
+        colors = game.state.colors
+        catan_map = game.state.board.map
+        sample = create_sample(game, colors[0])
+        self.features = [f for f in features if f in sample]  # like vector
+        self.num_features = len(self.features)
+        index = {feature: i for i, feature in enumerate(self.features)}
+        done = set()
+
+        def lookup(feature):
+            if feature in index:
+                done.add(feature)
+                return index[feature]
+            return None
+
+        dests, relatives, columns = [], [], []
+        for i in range(len(colors)):
+            for name, column in PLAYER_COLUMNS.items():
+                dest = lookup(f"P{i}_{name}")
+                if dest is not None:
+                    dests.append(dest)
+                    relatives.append(i)
+                    columns.append(column)
+        self.player_dests = np.array(dests, dtype=np.int64)
+        self.player_relatives = np.array(relatives, dtype=np.int64)
+        self.player_columns = np.array(columns, dtype=np.int64)
+
+        # Tiles and ports only change with the map and robber
+        self.map_names = [
+            name
+            for name in [
+                *map_tile_features(catan_map, game.state.board.robber_coordinate),
+                *map_port_features(catan_map),
+            ]
+            if lookup(name) is not None
+        ]
+        self.map_dests = np.array([index[n] for n in self.map_names], dtype=np.int64)
+        # robber_coordinate => values, for the layout of the last map seen
+        self.map_values = dict()
+        self.map_layout = None
+        self.last_map = None
+
+        self.node_dests = dict()  # (i, building_type) => node_id => dest
+        self.edge_dests = dict()  # i => edge (both orientations) => dest
+        graph_dests = []
+        for i in range(len(colors)):
+            for building_type in [SETTLEMENT, CITY]:
+                self.node_dests[(i, building_type)] = dict()
+                for node_id in range(len(catan_map.land_nodes)):
+                    dest = lookup(f"NODE{node_id}_P{i}_{building_type}")
+                    if dest is not None:
+                        self.node_dests[(i, building_type)][node_id] = dest
+                        graph_dests.append(dest)
+            self.edge_dests[i] = dict()
+            for edge_id in get_edge_ids(catan_map.land_nodes):
+                dest = lookup(f"EDGE{EDGES[edge_id]}_P{i}_ROAD")
+                if dest is not None:
+                    self.edge_dests[i][edge_id] = dest
+                    graph_dests.append(dest)
+        self.graph_dests = np.array(graph_dests, dtype=np.int64)
+
+        self.bank_dests = [
+            (lookup(f"BANK_{resource}"), i) for i, resource in enumerate(RESOURCES)
+        ]
+        self.bank_dests = [(d, i) for d, i in self.bank_dests if d is not None]
+        self.dev_cards_dest = lookup("BANK_DEV_CARDS")
+        self.moving_robber_dest = lookup("IS_MOVING_ROBBER")
+        self.discarding_dest = lookup("IS_DISCARDING")
+
+        self.slow_features = [(index[f], f) for f in self.features if f not in done]
+
+    def fill(self, game, p0_color, out):
+        """Writes features of game (from p0_color's perspective) into out"""
+        state = game.state
+        board = state.board
+        num_players = len(state.colors)
+
+        records = np.empty((num_players, NUM_PLAYER_FIELDS + 2), dtype=np.float32)
+        records[:, :NUM_PLAYER_FIELDS] = state.player_records
+        records[:, NUM_RESOURCES_COLUMN] = records[:, HAND_START:HAND_END].sum(1)
+        records[:, NUM_DEVS_COLUMN] = records[:, DEV_IN_HAND_FIELDS].sum(1)
+        seats = (state.color_to_index[p0_color] + self.player_relatives) % num_players
+        out[self.player_dests] = records[seats, self.player_columns]
+
+        if board.map is not self.last_map:
+            layout = map_layout(board.map)
+            if layout != self.map_layout:
+                self.map_values.clear()
+                self.map_layout = layout
+            self.last_map = board.map
+        values = self.map_values.get(board.robber_coordinate)
+        if values is None:
+            features = {
+                **map_tile_features(board.map, board.robber_coordinate),
+                **map_port_features(board.map),
+            }
+            values = np.array([features[n] for n in self.map_names], np.float32)
+            self.map_values[board.robber_coordinate] = values
+        out[self.map_dests] = values
+
+        out[self.graph_dests] = 0
+        ones = []
+        for i, color in iter_players(state.colors, p0_color):
+            buildings = state.buildings_by_color[color]
+            for building_type in [SETTLEMENT, CITY]:
+                node_dests = self.node_dests[(i, building_type)]
+                ones.extend(
+                    node_dests[n] for n in buildings[building_type] if n in node_dests
+                )
+            edge_dests = self.edge_dests[i]
+            ones.extend(edge_dests[e] for e in buildings[ROAD] if e in edge_dests)
+        out[ones] = 1
+
+        for dest, i in self.bank_dests:
+            out[dest] = state.resource_freqdeck[i]
+        if self.dev_cards_dest is not None:
+            out[self.dev_cards_dest] = len(state.development_listdeck)
+        if self.moving_robber_dest is not None or self.discarding_dest is not None:
+            possibilities = set(a.action_type for a in state.playable_actions)
+            if self.moving_robber_dest is not None:
+                out[self.moving_robber_dest] = ActionType.MOVE_ROBBER in possibilities
+            if self.discarding_dest is not None:
+                out[self.discarding_dest] = ActionType.DISCARD in possibilities
+
+        if len(self.slow_features) > 0:
+            sample = create_sample(game, p0_color)
+            for dest, feature in self.slow_features:
+                out[dest] = sample[feature]
+        return out
+
+
+_feature_plans = dict()
+
+
+def get_feature_plan(game, features=None):
+    """Returns the (cached) FeaturePlan for games like game"""
+    num_players = len(game.state.colors)
+    features = tuple(features or get_feature_ordering(num_players))
+    key = (features, num_players, len(game.state.board.map.land_nodes))
+    plan = _feature_plans.get(key)
+    if plan is None:
+        plan = FeaturePlan(game, features)
+        _feature_plans[key] = plan
+    return plan
+
+
+def create_sample_array(game, p0_color, features=None, out=None):
+    """Same values as create_sample_vector, as a float32 np.array"""
+    plan = get_feature_plan(game, features)
+    if out is None:
+        out = np.empty(plan.num_features, dtype=np.float32)
+    return plan.fill(game, p0_color, out)
+
+
+def create_sample_matrix(games, p0_colors, features=None, out=None):
+    """(len(games), F) float32 matrix with create_sample_array of each game.
+    Games must have the same number of players and map type."""
+    if len(games) == 0:
+        return np.empty((0, 0), dtype=np.float32)
+    plan = get_feature_plan(games[0], features)
+    if out is None:
+        out = np.empty((len(games), plan.num_features), dtype=np.float32)
+    for i, (game, p0_color) in enumerate(zip(games, p0_colors)):
+        plan.fill(game, p0_color, out[i])
+    return out
@@ -3,6 +3,10 @@ import os
 from flask import Flask
 from flask_cors import CORS
 
+from catanatron_experimental.machine_learning.players.minimax import (
+    MAX_SEARCH_TIME_SECS,
+)
+
 
 def create_app(test_config=None):
     """Create and configure an instance of the Flask application."""
@@ -14,10 +18,15 @@ def create_app(test_config=None):
     if database_url.startswith("postgres://"):
         database_url = database_url.replace("postgres://", "postgresql://", 1)
     secret_key = os.environ.get("SECRET_KEY", "dev")
+    # Time the "CATANATRON" bot can think per decision (latency SLA)
+    bot_time_budget_ms = int(
+        os.environ.get("BOT_TIME_BUDGET_MS", MAX_SEARCH_TIME_SECS * 1000)
+    )
     app.config.from_mapping(
         SECRET_KEY=secret_key,
         SQLALCHEMY_DATABASE_URI=database_url,
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        BOT_TIME_BUDGET_MS=bot_time_budget_ms,
     )
     if test_config is not None:
         app.config.update(test_config)
@@ -1,6 +1,6 @@
 import json
 
-from flask import Response, Blueprint, jsonify, abort, request
+from flask import Response, Blueprint, jsonify, abort, request, current_app
 
 from catanatron_server.models import upsert_game_state, get_game_state
 from catanatron.json import GameEncoder, action_from_json
@@ -15,7 +15,12 @@ bp = Blueprint("api", __name__, url_prefix="/api")
 
 def player_factory(player_key):
     if player_key[0] == "CATANATRON":
-        return AlphaBetaPlayer(player_key[1], 2, True)
+        return AlphaBetaPlayer(
+            player_key[1],
+            2,
+            True,
+            time_budget_ms=current_app.config["BOT_TIME_BUDGET_MS"],
+        )
     elif player_key[0] == "RANDOM":
         return RandomPlayer(player_key[1])
     elif player_key[0] == "HUMAN":
@@ -11,6 +11,7 @@ from catanatron.state_functions import (
     get_longest_road_color,
     get_player_buildings,
 )
+from catanatron.models.topology import EDGE_IDS
 
 
 def test_play_many_games():
@@ -64,7 +65,7 @@ def test_execute_action_on_copies_doesnt_conflict():
     p0_color = game.state.colors[0]
     game.execute(Action(p0_color, ActionType.BUILD_SETTLEMENT, 0))
 
-    action = Action(p0_color, ActionType.BUILD_ROAD, (0, 1))
+    action = Action(p0_color, ActionType.BUILD_ROAD, EDGE_IDS[(0, 1)])
 
     game_copy = game.copy()
     game_copy.execute(action)
@@ -3,6 +3,9 @@ import json
 
 from catanatron_server import create_app
 from catanatron_server.models import db
+from catanatron_experimental.machine_learning.players.minimax import (
+    MAX_SEARCH_TIME_SECS,
+)
 
 
 @pytest.fixture
@@ -61,3 +64,9 @@ def test_create_game_get_game_and_run_action(client):
 def test_game_not_exists(client):
     response = client.get("/api/games/123")
     assert response.status_code == 404
+
+
+def test_bot_time_budget_defaults_to_max_search_time(monkeypatch):
+    monkeypatch.delenv("BOT_TIME_BUDGET_MS", raising=False)
+    app = create_app({"TESTING": True})
+    assert app.config["BOT_TIME_BUDGET_MS"] == MAX_SEARCH_TIME_SECS * 1000
@@ -0,0 +1,74 @@
+import pickle
+import random
+
+from catanatron.game import Game, is_valid_action
+from catanatron.models.action_table import (
+    ACTIONS,
+    InternedAction,
+    PlayableActions,
+    action_code,
+    get_action,
+    intern_action,
+)
+from catanatron.models.enums import Action, ActionType
+from catanatron.models.map import build_map
+from catanatron.models.player import Color, RandomPlayer
+
+
+def test_interned_actions_are_like_plain_actions():
+    for code, action in enumerate(ACTIONS):
+        plain = Action(*action)
+        assert action.code == code
+        assert action == plain and hash(action) == hash(plain)
+        assert repr(action) == repr(plain)
+        assert intern_action(plain) is action
+        assert action_code(plain) == code
+        assert pickle.loads(pickle.dumps(action)) is action
+
+    action = get_action(0)
+    assert type(action._replace(value=(2, 3))) == Action
+    assert action_code(Action(Color.RED, ActionType.OFFER_TRADE, (1,) * 10)) is None
+    assert action_code(Action(Color.RED, ActionType.MOVE_ROBBER, [0, 0])) is None
+
+
+def test_playable_actions_are_interned():
+    for map_type in ["BASE", "MINI", "TOURNAMENT"]:
+        random.seed(0)
+        players = [RandomPlayer(color) for color in Color]
+        game = Game(players, seed=0, catan_map=build_map(map_type))
+        while game.winning_color() is None and game.state.num_turns < 1000:
+            playable_actions = game.state.playable_actions
+            assert isinstance(playable_actions, PlayableActions)
+            for action, code in zip(playable_actions, playable_actions.codes):
+                assert isinstance(action, InternedAction)
+                assert code == action.code
+                assert Action(*action) in playable_actions
+                assert is_valid_action(game.state, Action(*action))
+            game.play_tick()
+
+
+def test_playable_actions_membership():
+    roll = intern_action(Action(Color.RED, ActionType.ROLL, None))
+    end_turn = intern_action(Action(Color.RED, ActionType.END_TURN, None))
+    trade = Action(Color.RED, ActionType.REJECT_TRADE, (1,) * 10)
+    playable_actions = PlayableActions([roll, trade])
+    assert list(playable_actions.codes) == [roll.code, -1]
+    assert Action(Color.RED, ActionType.ROLL, None) in playable_actions
+    assert Action(Color.RED, ActionType.REJECT_TRADE, (1,) * 10) in playable_actions
+    assert end_turn not in playable_actions
+
+    playable_actions.append(end_turn)
+    assert end_turn in playable_actions
+
+    # codes follow in-place changes that keep the length
+    playable_actions[0] = end_turn
+    assert list(playable_actions.codes) == [end_turn.code, -1, end_turn.code]
+    assert roll not in playable_actions
+    playable_actions[2] = roll
+    playable_actions.reverse()
+    assert list(playable_actions.codes) == [roll.code, -1, end_turn.code]
+    playable_actions[:] = [roll]
+    assert list(playable_actions.codes) == [roll.code]
+
+    copied = pickle.loads(pickle.dumps(playable_actions))
+    assert copied == playable_actions and list(copied.codes) == [roll.code]
@@ -28,6 +28,7 @@ from catanatron.models.decks import (
     SETTLEMENT_COST_FREQDECK,
     starting_resource_bank,
 )
+from catanatron.models.topology import EDGE_IDS
 
 
 def test_playable_actions():
@@ -79,14 +80,14 @@ def test_settlement_possible_actions():
     assert len(settlement_possibilities(state, Color.RED)) == 0  # no money or place
 
     state.board.build_settlement(Color.RED, 3, initial_build_phase=True)
-    state.board.build_road(Color.RED, (3, 4))
-    state.board.build_road(Color.RED, (4, 5))
+    state.board.build_road(Color.RED, EDGE_IDS[(3, 4)])
+    state.board.build_road(Color.RED, EDGE_IDS[(4, 5)])
     assert len(settlement_possibilities(state, Color.RED)) == 0  # no money
 
     player_freqdeck_add(state, player.color, SETTLEMENT_COST_FREQDECK)
     assert len(settlement_possibilities(state, Color.RED)) == 1
 
-    state.board.build_road(Color.RED, (5, 0))
+    state.board.build_road(Color.RED, EDGE_IDS[(5, 0)])
     assert len(settlement_possibilities(state, Color.RED)) == 2
 
 
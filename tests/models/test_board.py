@@ -1,9 +1,24 @@
+import random
+from collections import defaultdict
+
 import pytest
 
 from catanatron.models.map import MINI_MAP_TEMPLATE, CatanMap
 from catanatron.models.enums import RESOURCES
-from catanatron.models.board import Board, get_node_distances
+from catanatron.models.board import (
+    Board,
+    get_node_distances,
+    longest_acyclic_path,
+    longest_road_length,
+)
 from catanatron.models.player import Color
+from catanatron.models.topology import (
+    EDGE_IDS,
+    EDGES,
+    INCIDENT_EDGES,
+    NEIGHBORS,
+    get_land_incident_edges,
+)
 
 
 def test_initial_build_phase_bypasses_restrictions():
@@ -11,7 +26,7 @@ def test_initial_build_phase_bypasses_restrictions():
     with pytest.raises(ValueError):  # not connected and not initial-placement
         board.build_settlement(Color.RED, 3)
     with pytest.raises(ValueError):  # not connected to settlement
-        board.build_road(Color.RED, (3, 2))
+        board.build_road(Color.RED, EDGE_IDS[(3, 2)])
 
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
 
@@ -21,16 +36,16 @@ def test_roads_must_always_be_connected():
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
 
     with pytest.raises(ValueError):  # not connected to settlement
-        board.build_road(Color.RED, (2, 1))
-    board.build_road(Color.RED, (3, 2))
-    board.build_road(Color.RED, (2, 1))
-    board.build_road(Color.RED, (3, 4))
+        board.build_road(Color.RED, EDGE_IDS[(2, 1)])
+    board.build_road(Color.RED, EDGE_IDS[(3, 2)])
+    board.build_road(Color.RED, EDGE_IDS[(2, 1)])
+    board.build_road(Color.RED, EDGE_IDS[(3, 4)])
 
 
 def test_must_build_distance_two():
     board = Board()
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
-    board.build_road(Color.RED, (3, 2))
+    board.build_road(Color.RED, EDGE_IDS[(3, 2)])
 
     with pytest.raises(ValueError):  # distance less than 2
         board.build_settlement(Color.BLUE, 4, initial_build_phase=True)
@@ -40,14 +55,14 @@ def test_must_build_distance_two():
 def test_placements_must_be_connected():
     board = Board()
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
-    board.build_road(Color.RED, (3, 2))
+    board.build_road(Color.RED, EDGE_IDS[(3, 2)])
 
     with pytest.raises(ValueError):  # distance less than 2 (even if connected)
         board.build_settlement(Color.RED, 2)
     with pytest.raises(ValueError):  # not connected
         board.build_settlement(Color.RED, 1)
 
-    board.build_road(Color.RED, (2, 1))
+    board.build_road(Color.RED, EDGE_IDS[(2, 1)])
     board.build_settlement(Color.RED, 1)
 
 
@@ -120,11 +135,11 @@ def test_buildable_nodes_respects_distance_two():
     board = Board()
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
 
-    board.build_road(Color.RED, (3, 4))
+    board.build_road(Color.RED, EDGE_IDS[(3, 4)])
     nodes = board.buildable_node_ids(Color.RED)
     assert len(nodes) == 0
 
-    board.build_road(Color.RED, (4, 5))
+    board.build_road(Color.RED, EDGE_IDS[(4, 5)])
     nodes = board.buildable_node_ids(Color.RED)
     assert len(nodes) == 1
     assert nodes.pop() == 5
@@ -133,12 +148,12 @@ def test_buildable_nodes_respects_distance_two():
 def test_cant_use_enemy_roads_to_connect():
     board = Board()
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
-    board.build_road(Color.RED, (3, 2))
+    board.build_road(Color.RED, EDGE_IDS[(3, 2)])
 
     board.build_settlement(Color.BLUE, 1, initial_build_phase=True)
-    board.build_road(Color.BLUE, (1, 2))
-    board.build_road(Color.BLUE, (0, 1))
-    board.build_road(Color.BLUE, (0, 20))  # north out of center tile
+    board.build_road(Color.BLUE, EDGE_IDS[(1, 2)])
+    board.build_road(Color.BLUE, EDGE_IDS[(0, 1)])
+    board.build_road(Color.BLUE, EDGE_IDS[(0, 20)])  # north out of center tile
 
     nodes = board.buildable_node_ids(Color.RED)
     assert len(nodes) == 0
@@ -165,7 +180,7 @@ def test_buildable_edges_in_mini():
 def test_buildable_edges():
     board = Board()
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
-    board.build_road(Color.RED, (3, 4))
+    board.build_road(Color.RED, EDGE_IDS[(3, 4)])
     buildable = board.buildable_edges(Color.RED)
     assert len(buildable) == 4
 
@@ -188,13 +203,13 @@ def test_connected_components_empty_board():
 def test_one_connected_component():
     board = Board()
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
-    board.build_road(Color.RED, (3, 2))
+    board.build_road(Color.RED, EDGE_IDS[(3, 2)])
     board.build_settlement(Color.RED, 1, initial_build_phase=True)
-    board.build_road(Color.RED, (1, 2))
+    board.build_road(Color.RED, EDGE_IDS[(1, 2)])
     components = board.find_connected_components(Color.RED)
     assert len(components) == 1
 
-    board.build_road(Color.RED, (0, 1))
+    board.build_road(Color.RED, EDGE_IDS[(0, 1)])
     components = board.find_connected_components(Color.RED)
     assert len(components) == 1
 
@@ -202,12 +217,12 @@ def test_one_connected_component():
 def test_two_connected_components():
     board = Board()
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
-    board.build_road(Color.RED, (3, 4))
+    board.build_road(Color.RED, EDGE_IDS[(3, 4)])
     components = board.find_connected_components(Color.RED)
     assert len(components) == 1
 
     board.build_settlement(Color.RED, 1, initial_build_phase=True)
-    board.build_road(Color.RED, (0, 1))
+    board.build_road(Color.RED, EDGE_IDS[(0, 1)])
     components = board.find_connected_components(Color.RED)
     assert len(components) == 2
 
@@ -216,22 +231,22 @@ def test_three_connected_components_bc_enemy_cut_road():
     board = Board()
     # Initial Building Phase of 2 players:
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
-    board.build_road(Color.RED, (3, 4))
+    board.build_road(Color.RED, EDGE_IDS[(3, 4)])
 
     board.build_settlement(Color.BLUE, 15, initial_build_phase=True)
-    board.build_road(Color.BLUE, (15, 4))
+    board.build_road(Color.BLUE, EDGE_IDS[(15, 4)])
     board.build_settlement(Color.BLUE, 34, initial_build_phase=True)
-    board.build_road(Color.BLUE, (34, 13))
+    board.build_road(Color.BLUE, EDGE_IDS[(34, 13)])
 
     board.build_settlement(Color.RED, 1, initial_build_phase=True)
-    board.build_road(Color.RED, (0, 1))
+    board.build_road(Color.RED, EDGE_IDS[(0, 1)])
 
     # Extend road in a risky way
-    board.build_road(Color.RED, (5, 0))
-    board.build_road(Color.RED, (5, 16))
+    board.build_road(Color.RED, EDGE_IDS[(5, 0)])
+    board.build_road(Color.RED, EDGE_IDS[(5, 16)])
 
     # Plow </3
-    board.build_road(Color.BLUE, (5, 4))
+    board.build_road(Color.BLUE, EDGE_IDS[(5, 4)])
     board.build_settlement(Color.BLUE, 5)
 
     components = board.find_connected_components(Color.RED)
@@ -244,34 +259,34 @@ def test_connected_components():
 
     # Simple test: roads stay at component, disconnected settlement creates new
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
-    board.build_road(Color.RED, (3, 2))
+    board.build_road(Color.RED, EDGE_IDS[(3, 2)])
     assert len(board.find_connected_components(Color.RED)) == 1
     assert len(board.find_connected_components(Color.RED)[0]) == 2
 
     # This is just to be realistic
     board.build_settlement(Color.BLUE, 13, initial_build_phase=True)
-    board.build_road(Color.BLUE, (13, 14))
+    board.build_road(Color.BLUE, EDGE_IDS[(13, 14)])
     board.build_settlement(Color.BLUE, 37, initial_build_phase=True)
-    board.build_road(Color.BLUE, (37, 14))
+    board.build_road(Color.BLUE, EDGE_IDS[(37, 14)])
 
     board.build_settlement(Color.RED, 0, initial_build_phase=True)
-    board.build_road(Color.RED, (0, 1))
+    board.build_road(Color.RED, EDGE_IDS[(0, 1)])
     assert len(board.find_connected_components(Color.RED)) == 2
     assert len(board.find_connected_components(Color.RED)[0]) == 2
     assert len(board.find_connected_components(Color.RED)[1]) == 2
 
     # Merging subcomponents
-    board.build_road(Color.RED, (1, 2))
+    board.build_road(Color.RED, EDGE_IDS[(1, 2)])
     assert len(board.find_connected_components(Color.RED)) == 1
     assert len(board.find_connected_components(Color.RED)[0]) == 4
 
-    board.build_road(Color.RED, (3, 4))
-    board.build_road(Color.RED, (4, 15))
-    board.build_road(Color.RED, (15, 17))
+    board.build_road(Color.RED, EDGE_IDS[(3, 4)])
+    board.build_road(Color.RED, EDGE_IDS[(4, 15)])
+    board.build_road(Color.RED, EDGE_IDS[(15, 17)])
     assert len(board.find_connected_components(Color.RED)) == 1
 
     # Enemy cutoff
-    board.build_road(Color.BLUE, (14, 15))
+    board.build_road(Color.BLUE, EDGE_IDS[(14, 15)])
     board.build_settlement(Color.BLUE, 15)
     assert len(board.find_connected_components(Color.RED)) == 2
 
@@ -281,9 +296,9 @@ def test_building_road_to_enemy_works_well():
 
     board.build_settlement(Color.BLUE, 0, initial_build_phase=True)
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
-    board.build_road(Color.RED, (3, 2))
-    board.build_road(Color.RED, (2, 1))
-    board.build_road(Color.RED, (1, 0))
+    board.build_road(Color.RED, EDGE_IDS[(3, 2)])
+    board.build_road(Color.RED, EDGE_IDS[(2, 1)])
+    board.build_road(Color.RED, EDGE_IDS[(1, 0)])
 
     # Test building towards enemy works well.
     assert len(board.find_connected_components(Color.RED)) == 1
@@ -296,20 +311,20 @@ def test_building_into_enemy_doesnt_merge_components():
     board.build_settlement(Color.BLUE, 0, initial_build_phase=True)
     board.build_settlement(Color.RED, 16, initial_build_phase=True)
     board.build_settlement(Color.RED, 6, initial_build_phase=True)
-    board.build_road(Color.RED, (16, 5))
-    board.build_road(Color.RED, (5, 0))
-    board.build_road(Color.RED, (6, 1))
-    board.build_road(Color.RED, (1, 0))
+    board.build_road(Color.RED, EDGE_IDS[(16, 5)])
+    board.build_road(Color.RED, EDGE_IDS[(5, 0)])
+    board.build_road(Color.RED, EDGE_IDS[(6, 1)])
+    board.build_road(Color.RED, EDGE_IDS[(1, 0)])
     assert len(board.find_connected_components(Color.RED)) == 2
 
 
 def test_enemy_edge_not_buildable():
     board = Board()
     board.build_settlement(Color.BLUE, 0, initial_build_phase=True)
-    board.build_road(Color.BLUE, (0, 1))
+    board.build_road(Color.BLUE, EDGE_IDS[(0, 1)])
 
     board.build_settlement(Color.RED, 2, initial_build_phase=True)
-    board.build_road(Color.RED, (2, 1))
+    board.build_road(Color.RED, EDGE_IDS[(2, 1)])
     buildable_edges = board.buildable_edges(Color.RED)
     assert len(buildable_edges) == 3
 
@@ -318,38 +333,38 @@ def test_many_buildings():
     board = Board()
     board.build_settlement(Color.ORANGE, 7, True)
     board.build_settlement(Color.ORANGE, 12, True)
-    board.build_road(Color.ORANGE, (6, 7))
-    board.build_road(Color.ORANGE, (7, 8))
-    board.build_road(Color.ORANGE, (8, 9))
-    board.build_road(Color.ORANGE, (8, 27))
-    board.build_road(Color.ORANGE, (26, 27))
-    board.build_road(Color.ORANGE, (9, 10))
-    board.build_road(Color.ORANGE, (10, 11))
-    board.build_road(Color.ORANGE, (11, 12))
-    board.build_road(Color.ORANGE, (12, 13))
-    board.build_road(Color.ORANGE, (13, 34))
+    board.build_road(Color.ORANGE, EDGE_IDS[(6, 7)])
+    board.build_road(Color.ORANGE, EDGE_IDS[(7, 8)])
+    board.build_road(Color.ORANGE, EDGE_IDS[(8, 9)])
+    board.build_road(Color.ORANGE, EDGE_IDS[(8, 27)])
+    board.build_road(Color.ORANGE, EDGE_IDS[(26, 27)])
+    board.build_road(Color.ORANGE, EDGE_IDS[(9, 10)])
+    board.build_road(Color.ORANGE, EDGE_IDS[(10, 11)])
+    board.build_road(Color.ORANGE, EDGE_IDS[(11, 12)])
+    board.build_road(Color.ORANGE, EDGE_IDS[(12, 13)])
+    board.build_road(Color.ORANGE, EDGE_IDS[(13, 34)])
     assert len(board.find_connected_components(Color.ORANGE)) == 1
 
     board.build_settlement(Color.WHITE, 30, True)
-    board.build_road(Color.WHITE, (29, 30))
-    board.build_road(Color.WHITE, (10, 29))
-    board.build_road(Color.WHITE, (28, 29))
-    board.build_road(Color.WHITE, (27, 28))
+    board.build_road(Color.WHITE, EDGE_IDS[(29, 30)])
+    board.build_road(Color.WHITE, EDGE_IDS[(10, 29)])
+    board.build_road(Color.WHITE, EDGE_IDS[(28, 29)])
+    board.build_road(Color.WHITE, EDGE_IDS[(27, 28)])
     board.build_settlement(Color.WHITE, 10)  # cut
-    board.build_road(Color.WHITE, (30, 31))
-    board.build_road(Color.WHITE, (31, 32))
+    board.build_road(Color.WHITE, EDGE_IDS[(30, 31)])
+    board.build_road(Color.WHITE, EDGE_IDS[(31, 32)])
     board.build_settlement(Color.WHITE, 32)
-    board.build_road(Color.WHITE, (11, 32))
-    board.build_road(Color.WHITE, (32, 33))
-    board.build_road(Color.WHITE, (33, 34))
+    board.build_road(Color.WHITE, EDGE_IDS[(11, 32)])
+    board.build_road(Color.WHITE, EDGE_IDS[(32, 33)])
+    board.build_road(Color.WHITE, EDGE_IDS[(33, 34)])
     board.build_settlement(Color.WHITE, 34)
-    board.build_road(Color.WHITE, (34, 35))
-    board.build_road(Color.WHITE, (35, 36))
+    board.build_road(Color.WHITE, EDGE_IDS[(34, 35)])
+    board.build_road(Color.WHITE, EDGE_IDS[(35, 36)])
 
     board.build_settlement(Color.WHITE, 41, True)
     board.build_city(Color.WHITE, 41)
-    board.build_road(Color.WHITE, (41, 42))
-    board.build_road(Color.WHITE, (40, 42))
+    board.build_road(Color.WHITE, EDGE_IDS[(41, 42)])
+    board.build_road(Color.WHITE, EDGE_IDS[(40, 42)])
     board.build_settlement(Color.WHITE, 27)  # cut
 
     assert len(board.find_connected_components(Color.WHITE)) == 2
@@ -357,3 +372,143 @@ def test_many_buildings():
 
 
 # TODO: Test super long road, cut at many places, to yield 5+ component graph
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_longest_road_length_matches_longest_acyclic_path(seed):
+    rng = random.Random(seed)
+    colors = [Color.RED, Color.BLUE, Color.WHITE]
+    board = Board()
+    for color in colors:
+        node_id = rng.choice(sorted(board.buildable_node_ids(color, True)))
+        board.build_settlement(color, node_id, initial_build_phase=True)
+
+    for _ in range(60):
+        color = rng.choice(colors)
+        buildable_nodes = sorted(board.buildable_node_ids(color))
+        if len(buildable_nodes) > 0 and rng.random() < 0.2:
+            board.build_settlement(color, rng.choice(buildable_nodes))
+        elif len(board.buildable_edges(color)) > 0:
+            board.build_road(color, rng.choice(sorted(board.buildable_edges(color))))
+
+        for color in colors:
+            expected_lengths = []
+            for component in board.find_connected_components(color):
+                expected = len(longest_acyclic_path(board, component, color))
+                assert longest_road_length(board, component, color) == expected
+                expected_lengths.append(expected)
+            assert board.road_lengths[color] == max(expected_lengths)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_buildable_masks_match_connected_components(seed):
+    rng = random.Random(seed)
+    colors = [Color.RED, Color.BLUE, Color.WHITE]
+    board = Board()
+    for color in colors:
+        node_id = rng.choice(board.buildable_node_ids(color, True))
+        board.build_settlement(color, node_id, initial_build_phase=True)
+
+    land_incident_edges = get_land_incident_edges(board.map.land_nodes)
+    for _ in range(60):
+        color = rng.choice(colors)
+        buildable_nodes = board.buildable_node_ids(color)
+        if len(buildable_nodes) > 0 and rng.random() < 0.2:
+            board.build_settlement(color, rng.choice(buildable_nodes))
+        elif len(board.buildable_edges(color)) > 0:
+            board.build_road(color, rng.choice(board.buildable_edges(color)))
+        board = board.copy()
+
+        board_buildable_ids = {
+            node_id
+            for node_id in board.map.land_nodes
+            if all(n not in board.buildings for n in (node_id, *NEIGHBORS[node_id]))
+        }
+        for color in colors:
+            nodes = set().union(*board.find_connected_components(color))
+            edges = {
+                edge_id
+                for node_id in nodes
+                for edge_id in land_incident_edges.get(node_id, ())
+                if board.roads[edge_id] is None
+            }
+            assert board.buildable_node_ids(color) == sorted(
+                nodes & board_buildable_ids
+            )
+            assert board.buildable_edges(color) == sorted(edges)
+
+
+class ListOfSetsComponents:
+    """Connected components maintained as Board did before component_masks:
+    lists of node sets, searched linearly. To be updated after each build."""
+
+    def __init__(self):
+        self.components = defaultdict(list)
+
+    def index(self, node_id, color):
+        for i, component in enumerate(self.components[color]):
+            if node_id in component:
+                return i
+
+    def build_settlement(self, board, color, node_id, initial_build_phase=False):
+        if initial_build_phase:
+            self.components[color].append({node_id})
+            return
+
+        neighbors_by_color = defaultdict(list)
+        for neighbor_id, edge_id in INCIDENT_EDGES[node_id]:
+            neighbors_by_color[board.roads[edge_id]].append(neighbor_id)
+        for edge_color, neighbor_ids in neighbors_by_color.items():
+            if edge_color in (color, None) or len(neighbor_ids) != 2:
+                continue
+            a, c = neighbor_ids
+            a_nodeset = board.dfs_walk(a, edge_color)
+            c_nodeset = board.dfs_walk(c, edge_color)
+            del self.components[edge_color][self.index(node_id, edge_color)]
+            self.components[edge_color].append(a_nodeset)
+            self.components[edge_color].append(c_nodeset)
+
+    def build_road(self, board, color, edge_id):
+        a, b = EDGES[edge_id]
+        a_index = self.index(a, color)
+        b_index = self.index(b, color)
+        if a_index is None and not board.is_enemy_node(a, color):
+            self.components[color][b_index].add(a)
+        elif b_index is None and not board.is_enemy_node(b, color):
+            self.components[color][a_index].add(b)
+        elif a_index is not None and b_index is not None and a_index != b_index:
+            merged = self.components[color][a_index] | self.components[color][b_index]
+            self.components[color][a_index] = merged
+            del self.components[color][b_index]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_component_masks_match_list_of_sets_components(seed):
+    rng = random.Random(seed)
+    colors = [Color.RED, Color.BLUE, Color.WHITE, Color.ORANGE]
+    board = Board()
+    expected = ListOfSetsComponents()
+    for color in colors:
+        node_id = rng.choice(board.buildable_node_ids(color, True))
+        board.build_settlement(color, node_id, initial_build_phase=True)
+        expected.build_settlement(board, color, node_id, initial_build_phase=True)
+
+    for _ in range(100):
+        color = rng.choice(colors)
+        buildable_nodes = board.buildable_node_ids(color)
+        if len(buildable_nodes) > 0 and rng.random() < 0.3:
+            node_id = rng.choice(buildable_nodes)
+            board.build_settlement(color, node_id)
+            expected.build_settlement(board, color, node_id)
+        elif len(board.buildable_edges(color)) > 0:
+            edge_id = rng.choice(board.buildable_edges(color))
+            board.build_road(color, edge_id)
+            expected.build_road(board, color, edge_id)
+        board = board.copy()
+
+        for color in colors:
+            assert board.find_connected_components(color) == expected.components[color]
+            for node_id in board.map.land_nodes:
+                assert board._get_connected_component_index(
+                    node_id, color
+                ) == expected.index(node_id, color)
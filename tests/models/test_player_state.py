@@ -0,0 +1,47 @@
+import pytest
+
+from catanatron.state import State
+from catanatron.state_functions import (
+    get_player_freqdeck,
+    player_deck_replenish,
+    player_record,
+)
+from catanatron.models.enums import WHEAT
+from catanatron.models.player import Color, SimplePlayer
+from catanatron.models.player_state import PLAYER_INITIAL_STATE, PlayerField
+
+
+def test_player_state_view_matches_records():
+    state = State([SimplePlayer(Color.RED), SimplePlayer(Color.BLUE)])
+
+    assert len(state.player_state) == 2 * len(PLAYER_INITIAL_STATE)
+    assert list(state.player_state)[0] == "P0_VICTORY_POINTS"
+    assert state.player_state["P1_ROADS_AVAILABLE"] == 15
+    assert state.player_state["P0_HAS_ROAD"] is False
+
+    player_deck_replenish(state, state.colors[1], WHEAT, 2)
+    assert state.player_state["P1_WHEAT_IN_HAND"] == 2
+    assert get_player_freqdeck(state, state.colors[1]) == [0, 0, 0, 2, 0]
+
+
+def test_player_state_view_writes_through():
+    state = State([SimplePlayer(Color.RED), SimplePlayer(Color.BLUE)])
+
+    state.player_state["P0_ACTUAL_VICTORY_POINTS"] = 7
+    record = player_record(state, state.colors[0])
+    assert record[PlayerField.ACTUAL_VICTORY_POINTS] == 7
+
+    with pytest.raises(KeyError):
+        state.player_state["P2_ACTUAL_VICTORY_POINTS"] = 7
+    with pytest.raises(TypeError):
+        del state.player_state["P0_ACTUAL_VICTORY_POINTS"]
+
+
+def test_state_copy_copies_records():
+    state = State([SimplePlayer(Color.RED), SimplePlayer(Color.BLUE)])
+    state_copy = state.copy()
+
+    player_deck_replenish(state_copy, Color.RED, WHEAT)
+    assert state_copy.player_state == state_copy.player_state.copy()
+    assert state.player_state != state_copy.player_state
+    assert player_record(state, Color.RED)[PlayerField.WHEAT_IN_HAND] == 0
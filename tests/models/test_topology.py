@@ -0,0 +1,78 @@
+import networkx as nx
+
+from catanatron.models.board import get_edges, get_static_graph
+from catanatron.models.map import NUM_EDGES, NUM_NODES, MINI_MAP_TEMPLATE, CatanMap
+from catanatron.models.topology import (
+    EDGE_IDS,
+    EDGES,
+    INCIDENT_EDGE_MASKS,
+    INCIDENT_EDGES,
+    NEIGHBOR_MASKS,
+    NEIGHBORS,
+    NUM_GRAPH_NODES,
+    bfs_distances,
+    get_land_edges,
+    get_land_incident_edges,
+    ids_to_mask,
+    mask_to_ids,
+    shortest_path,
+)
+
+
+def test_tables_match_static_graph():
+    graph = get_static_graph()
+    assert NUM_GRAPH_NODES == graph.number_of_nodes()
+    assert sorted(EDGES) == sorted(tuple(sorted(edge)) for edge in graph.edges)
+    for node_id in graph.nodes:
+        assert NEIGHBORS[node_id] == tuple(graph.neighbors(node_id))
+        for neighbor_id, edge_id in INCIDENT_EDGES[node_id]:
+            assert set(EDGES[edge_id]) == {node_id, neighbor_id}
+            assert EDGE_IDS[(node_id, neighbor_id)] == edge_id
+
+
+def test_land_edges_come_first_in_get_edges_order():
+    graph = get_static_graph()
+    land_edges = list(graph.subgraph(range(NUM_NODES)).edges())
+    assert get_edges() == land_edges
+    assert list(EDGES[: len(land_edges)]) == land_edges
+
+    mini_map = CatanMap.from_template(MINI_MAP_TEMPLATE)
+    mini_edges = list(graph.subgraph(mini_map.land_nodes).edges())
+    assert get_edges(mini_map.land_nodes) == mini_edges
+    assert [EDGES[i] for i in get_land_edges(mini_map.land_nodes)] == mini_edges
+
+    incident_edges = get_land_incident_edges(mini_map.land_nodes)
+    assert set(incident_edges) == mini_map.land_nodes
+    for node_id, edge_ides in incident_edges.items():
+        assert {EDGES[i] for i in edge_ides} == {
+            tuple(sorted(edge))
+            for edge in graph.subgraph(mini_map.land_nodes).edges(node_id)
+        }
+
+
+def test_distances_and_paths_match_networkx():
+    graph = get_static_graph()
+    for source in [0, 7, 31, 53, 80]:
+        distances = nx.single_source_shortest_path_length(graph, source)
+        assert bfs_distances(source) == distances
+        for target in [2, 45, 93]:
+            path = shortest_path(source, target)
+            assert path[0] == source and path[-1] == target
+            assert len(path) == distances[target] + 1
+            assert all(b in NEIGHBORS[a] for a, b in zip(path, path[1:]))
+
+
+def test_base_map_land_edges_are_first_ids():
+    assert get_land_edges(frozenset(range(NUM_NODES))) == tuple(range(NUM_EDGES))
+    for edge_id, (a, b) in enumerate(EDGES):
+        assert EDGE_IDS[(a, b)] == EDGE_IDS[(b, a)] == edge_id
+
+
+def test_masks():
+    assert mask_to_ids(0) == ()
+    assert mask_to_ids(ids_to_mask([71, 3, 0, 53])) == (0, 3, 53, 71)
+    for node_id in range(NUM_GRAPH_NODES):
+        assert list(mask_to_ids(NEIGHBOR_MASKS[node_id])) == sorted(NEIGHBORS[node_id])
+        assert list(mask_to_ids(INCIDENT_EDGE_MASKS[node_id])) == sorted(
+            edge_id for _, edge_id in INCIDENT_EDGES[node_id]
+        )
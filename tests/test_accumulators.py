@@ -1,8 +1,25 @@
+import pickle
+import random
+
+import numpy as np
+import pytest
+
 from catanatron import ActionType, Color, RandomPlayer, Game, GameAccumulator
 from catanatron.state_functions import get_actual_victory_points
 from catanatron.game import TURNS_LIMIT
 from catanatron_experimental import SimulationAccumulator
-from catanatron_experimental.play import GameConfigOptions, play_batch_core
+from catanatron_experimental.cli.accumulators import (
+    StatisticsAccumulator,
+    VpDistributionAccumulator,
+)
+from catanatron_experimental.cli.summaries import RunningStats
+from catanatron_experimental.play import (
+    GameConfigOptions,
+    OutputOptions,
+    build_players,
+    play_batch,
+    play_batch_core,
+)
 
 
 def test_accumulators():
@@ -84,3 +101,78 @@ def test_simulation_accumulator():
     ]
 
     assert MySimAccumulator.after_all_num_games == 2
+
+
+def test_play_batch_parallel_matches_sequential():
+    player_keys = ["R", "R", "W"]
+    sequential_wins, sequential_results = play_batch(
+        6, build_players(player_keys), quiet=True, seed=5
+    )
+    assert sum(h.count for h in sequential_results.values()) == 3 * sum(
+        sequential_wins.values()
+    )
+
+    wins, results = play_batch(
+        6,
+        build_players(player_keys),
+        quiet=True,
+        seed=5,
+        num_workers=2,
+        player_keys=player_keys,
+    )
+    assert wins == sequential_wins
+    assert results == sequential_results
+
+
+def test_play_batch_parallel_rejects_csv_output(tmp_path):
+    player_keys = ["R", "R"]
+    with pytest.raises(ValueError):
+        play_batch(
+            2,
+            build_players(player_keys),
+            OutputOptions(output=str(tmp_path), csv=True),
+            quiet=True,
+            num_workers=2,
+            player_keys=player_keys,
+        )
+
+
+def test_running_stats_merge():
+    random.seed(1)
+    values = [random.random() * 100 for _ in range(101)]
+    stats, left, right = RunningStats(), RunningStats(), RunningStats()
+    for i, value in enumerate(values):
+        stats.add(value)
+        (left if i < 30 else right).add(value)
+    left.merge(right)
+
+    for s in [stats, left]:
+        assert s.count == len(values)
+        assert s.mean == pytest.approx(np.mean(values))
+        assert s.variance == pytest.approx(np.var(values))
+        assert s.min == min(values) and s.max == max(values)
+
+
+def test_accumulators_merge_partials():
+    players = [RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)]
+    games = list(play_batch_core(6, players, GameConfigOptions(), seed=1))
+
+    def accumulate(games):
+        accumulators = [StatisticsAccumulator(), VpDistributionAccumulator()]
+        for game in games:
+            for accumulator in accumulators:
+                accumulator.before(game)
+                accumulator.after(game)
+        return accumulators
+
+    merged = accumulate(games[:2])
+    for accumulator, other in zip(merged, accumulate(games[2:])):
+        accumulator.merge(pickle.loads(pickle.dumps(other.partial())))
+    expected = accumulate(games)
+
+    assert merged[0].wins == expected[0].wins
+    assert merged[0].results_by_player == expected[0].results_by_player
+    assert merged[0].get_avg_turns() == pytest.approx(expected[0].get_avg_turns())
+    assert merged[1].partial() == expected[1].partial()
+    assert GameAccumulator().partial() is None
+    GameAccumulator().merge(None)  # no-op, like the other hooks
@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from catanatron.action_log import CHUNK_SIZE, ActionLog
+
+
+def test_action_log_reads_like_list():
+    log = ActionLog(range(150))
+    assert len(log) == 150
+    assert log == list(range(150))
+    assert log[0] == 0 and log[64] == 64 and log[-1] == 149
+    assert log[100:] == list(range(100, 150))
+    assert list(reversed(log)) == list(reversed(range(150)))
+    assert 70 in log
+    with pytest.raises(IndexError):
+        log[150]
+    with pytest.raises(IndexError):
+        log[-151]
+
+
+def test_action_log_copies_are_independent():
+    random.seed(1)
+    logs = [ActionLog()]
+    lists = [[]]
+    for i in range(3000):
+        j = len(logs) - 1 - random.randrange(min(3, len(logs)))  # recent ones
+        operation = random.random()
+        if operation < 0.1:
+            logs.append(logs[j].copy())
+            lists.append(lists[j].copy())
+        elif operation < 0.3 and len(lists[j]) > 0:
+            assert logs[j].pop() == lists[j].pop()
+        else:
+            logs[j].append(i)
+            lists[j].append(i)
+
+    assert max(len(l) for l in lists) > 3 * CHUNK_SIZE
+    for log, values in zip(logs, lists):
+        assert log == values
+        assert len(log) == len(values)
@@ -10,6 +10,7 @@ from catanatron.state_functions import (
 )
 from catanatron.models.player import SimplePlayer, Color
 from catanatron.models.enums import KNIGHT, ORE, SHEEP, WHEAT
+from catanatron.models.topology import EDGE_IDS
 
 
 def test_longest_road_simple():
@@ -17,19 +18,19 @@ def test_longest_road_simple():
 
     # Place initial settlements.
     board.build_settlement(Color.RED, 0, initial_build_phase=True)
-    board.build_road(Color.RED, (0, 1))
+    board.build_road(Color.RED, EDGE_IDS[(0, 1)])
     board.build_settlement(Color.BLUE, 24, initial_build_phase=True)
-    board.build_road(Color.BLUE, (24, 25))
+    board.build_road(Color.BLUE, EDGE_IDS[(24, 25)])
     board.build_settlement(Color.BLUE, 26, initial_build_phase=True)
-    board.build_road(Color.BLUE, (25, 26))
+    board.build_road(Color.BLUE, EDGE_IDS[(25, 26)])
     board.build_settlement(Color.RED, 2, initial_build_phase=True)
-    board.build_road(Color.RED, (1, 2))
+    board.build_road(Color.RED, EDGE_IDS[(1, 2)])
     assert board.road_color is None
     assert board.road_lengths == {Color.RED: 2, Color.BLUE: 2}
 
-    board.build_road(Color.RED, (2, 3))
-    board.build_road(Color.RED, (3, 4))
-    board.build_road(Color.RED, (4, 5))
+    board.build_road(Color.RED, EDGE_IDS[(2, 3)])
+    board.build_road(Color.RED, EDGE_IDS[(3, 4)])
+    board.build_road(Color.RED, EDGE_IDS[(4, 5)])
     assert board.road_color is Color.RED
     assert board.road_length == 5
     assert board.road_lengths == {Color.RED: 5, Color.BLUE: 2}
@@ -39,30 +40,30 @@ def test_longest_road_tie():
     board = Board()
     # Place initial settlements.
     board.build_settlement(Color.RED, 0, initial_build_phase=True)
-    board.build_road(Color.RED, (0, 1))
+    board.build_road(Color.RED, EDGE_IDS[(0, 1)])
     board.build_settlement(Color.BLUE, 24, initial_build_phase=True)
-    board.build_road(Color.BLUE, (24, 25))
+    board.build_road(Color.BLUE, EDGE_IDS[(24, 25)])
     board.build_settlement(Color.BLUE, 26, initial_build_phase=True)
-    board.build_road(Color.BLUE, (25, 26))
+    board.build_road(Color.BLUE, EDGE_IDS[(25, 26)])
     board.build_settlement(Color.RED, 2, initial_build_phase=True)
-    board.build_road(Color.RED, (1, 2))
+    board.build_road(Color.RED, EDGE_IDS[(1, 2)])
     assert board.road_color is None
     assert board.road_lengths == {Color.RED: 2, Color.BLUE: 2}
 
-    board.build_road(Color.RED, (2, 3))
-    board.build_road(Color.RED, (3, 4))
-    board.build_road(Color.RED, (4, 5))
+    board.build_road(Color.RED, EDGE_IDS[(2, 3)])
+    board.build_road(Color.RED, EDGE_IDS[(3, 4)])
+    board.build_road(Color.RED, EDGE_IDS[(4, 5)])
 
-    board.build_road(Color.BLUE, (26, 27))
-    board.build_road(Color.BLUE, (27, 28))
-    board.build_road(Color.BLUE, (28, 29))
+    board.build_road(Color.BLUE, EDGE_IDS[(26, 27)])
+    board.build_road(Color.BLUE, EDGE_IDS[(27, 28)])
+    board.build_road(Color.BLUE, EDGE_IDS[(28, 29)])
     assert (
         board.road_color is Color.RED
     )  # even if blue also has 5-road. red had it first
     assert board.road_length == 5
     assert board.road_lengths == {Color.RED: 5, Color.BLUE: 5}
 
-    board.build_road(Color.BLUE, (29, 30))
+    board.build_road(Color.BLUE, EDGE_IDS[(29, 30)])
     assert board.road_color is Color.BLUE
     assert board.road_length == 6
     assert board.road_lengths == {Color.RED: 5, Color.BLUE: 6}
@@ -74,30 +75,30 @@ def test_complicated_road():  # classic 8-like roads
 
     # Place initial settlements.
     board.build_settlement(Color.RED, 0, initial_build_phase=True)
-    board.build_road(Color.RED, (0, 1))
+    board.build_road(Color.RED, EDGE_IDS[(0, 1)])
     board.build_settlement(Color.BLUE, 24, initial_build_phase=True)
-    board.build_road(Color.BLUE, (24, 25))
+    board.build_road(Color.BLUE, EDGE_IDS[(24, 25)])
     board.build_settlement(Color.BLUE, 26, initial_build_phase=True)
-    board.build_road(Color.BLUE, (25, 26))
+    board.build_road(Color.BLUE, EDGE_IDS[(25, 26)])
     board.build_settlement(Color.RED, 2, initial_build_phase=True)
-    board.build_road(Color.RED, (1, 2))
+    board.build_road(Color.RED, EDGE_IDS[(1, 2)])
 
-    board.build_road(Color.RED, (2, 3))
-    board.build_road(Color.RED, (3, 4))
-    board.build_road(Color.RED, (4, 5))
-    board.build_road(Color.RED, (0, 5))
+    board.build_road(Color.RED, EDGE_IDS[(2, 3)])
+    board.build_road(Color.RED, EDGE_IDS[(3, 4)])
+    board.build_road(Color.RED, EDGE_IDS[(4, 5)])
+    board.build_road(Color.RED, EDGE_IDS[(0, 5)])
 
-    board.build_road(Color.RED, (1, 6))
-    board.build_road(Color.RED, (6, 7))
-    board.build_road(Color.RED, (7, 8))
-    board.build_road(Color.RED, (8, 9))
-    board.build_road(Color.RED, (2, 9))
+    board.build_road(Color.RED, EDGE_IDS[(1, 6)])
+    board.build_road(Color.RED, EDGE_IDS[(6, 7)])
+    board.build_road(Color.RED, EDGE_IDS[(7, 8)])
+    board.build_road(Color.RED, EDGE_IDS[(8, 9)])
+    board.build_road(Color.RED, EDGE_IDS[(2, 9)])
 
     assert board.road_color is Color.RED
     assert board.road_length == 11
     assert board.road_lengths == {Color.RED: 11, Color.BLUE: 2}
 
-    board.build_road(Color.RED, (8, 27))
+    board.build_road(Color.RED, EDGE_IDS[(8, 27)])
     assert board.road_color is Color.RED
     assert board.road_length == 11
     assert board.road_lengths == {Color.RED: 11, Color.BLUE: 2}
@@ -107,28 +108,28 @@ def test_triple_longest_road_tie():
     board = Board()
 
     board.build_settlement(Color.RED, 3, True)
-    board.build_road(Color.RED, (3, 2))
-    board.build_road(Color.RED, (2, 1))
-    board.build_road(Color.RED, (1, 0))
-    board.build_road(Color.RED, (0, 5))
-    board.build_road(Color.RED, (5, 4))
-    board.build_road(Color.RED, (3, 4))
+    board.build_road(Color.RED, EDGE_IDS[(3, 2)])
+    board.build_road(Color.RED, EDGE_IDS[(2, 1)])
+    board.build_road(Color.RED, EDGE_IDS[(1, 0)])
+    board.build_road(Color.RED, EDGE_IDS[(0, 5)])
+    board.build_road(Color.RED, EDGE_IDS[(5, 4)])
+    board.build_road(Color.RED, EDGE_IDS[(3, 4)])
 
     board.build_settlement(Color.BLUE, 24, True)
-    board.build_road(Color.BLUE, (24, 25))
-    board.build_road(Color.BLUE, (25, 26))
-    board.build_road(Color.BLUE, (26, 27))
-    board.build_road(Color.BLUE, (27, 8))
-    board.build_road(Color.BLUE, (8, 7))
-    board.build_road(Color.BLUE, (7, 24))
+    board.build_road(Color.BLUE, EDGE_IDS[(24, 25)])
+    board.build_road(Color.BLUE, EDGE_IDS[(25, 26)])
+    board.build_road(Color.BLUE, EDGE_IDS[(26, 27)])
+    board.build_road(Color.BLUE, EDGE_IDS[(27, 8)])
+    board.build_road(Color.BLUE, EDGE_IDS[(8, 7)])
+    board.build_road(Color.BLUE, EDGE_IDS[(7, 24)])
 
     board.build_settlement(Color.WHITE, 17, True)
-    board.build_road(Color.WHITE, (18, 17))
-    board.build_road(Color.WHITE, (17, 39))
-    board.build_road(Color.WHITE, (39, 41))
-    board.build_road(Color.WHITE, (41, 42))
-    board.build_road(Color.WHITE, (42, 40))
-    board.build_road(Color.WHITE, (40, 18))
+    board.build_road(Color.WHITE, EDGE_IDS[(18, 17)])
+    board.build_road(Color.WHITE, EDGE_IDS[(17, 39)])
+    board.build_road(Color.WHITE, EDGE_IDS[(39, 41)])
+    board.build_road(Color.WHITE, EDGE_IDS[(41, 42)])
+    board.build_road(Color.WHITE, EDGE_IDS[(42, 40)])
+    board.build_road(Color.WHITE, EDGE_IDS[(40, 18)])
 
     assert board.road_color is Color.RED
     assert board.road_length == 6
@@ -185,13 +186,13 @@ def test_cut_but_not_disconnected():
     board = Board()
 
     board.build_settlement(Color.RED, 0, initial_build_phase=True)
-    board.build_road(Color.RED, (0, 1))
-    board.build_road(Color.RED, (1, 2))
-    board.build_road(Color.RED, (2, 3))
-    board.build_road(Color.RED, (3, 4))
-    board.build_road(Color.RED, (4, 5))
-    board.build_road(Color.RED, (5, 0))
-    board.build_road(Color.RED, (3, 12))
+    board.build_road(Color.RED, EDGE_IDS[(0, 1)])
+    board.build_road(Color.RED, EDGE_IDS[(1, 2)])
+    board.build_road(Color.RED, EDGE_IDS[(2, 3)])
+    board.build_road(Color.RED, EDGE_IDS[(3, 4)])
+    board.build_road(Color.RED, EDGE_IDS[(4, 5)])
+    board.build_road(Color.RED, EDGE_IDS[(5, 0)])
+    board.build_road(Color.RED, EDGE_IDS[(3, 12)])
     assert (
         max(map(lambda path: len(path), board.continuous_roads_by_player(Color.RED)))
         == 7
@@ -0,0 +1,125 @@
+import json
+
+from catanatron.array_state import (
+    ArrayState,
+    BuildingsArray,
+    EdgeRoadsArray,
+    NodeBuildingsArray,
+)
+from catanatron.game import Game
+from catanatron.json import GameEncoder
+from catanatron.state import State, apply_action
+from catanatron.state_functions import (
+    get_player_buildings,
+    get_player_freqdeck,
+    player_deck_replenish,
+)
+from catanatron.models.enums import CITY, ROAD, SETTLEMENT, WOOD, ActionType
+from catanatron.models.player import Color, RandomPlayer, SimplePlayer
+from catanatron.models.topology import NUM_GRAPH_EDGES
+
+
+def test_buildings_array_behaves_like_lists():
+    buildings = BuildingsArray({Color.RED: 0, Color.BLUE: 1})
+    buildings[Color.RED][SETTLEMENT].append(3)
+    buildings[Color.RED][SETTLEMENT].append(7)
+    buildings[Color.RED][ROAD].append(12)
+    buildings[Color.RED][SETTLEMENT].remove(3)
+    buildings[Color.RED][CITY].append(3)
+
+    assert buildings[Color.RED][SETTLEMENT] == [7]
+    assert buildings[Color.RED][CITY] == [3]
+    assert buildings[Color.RED][ROAD] == [12]
+    assert buildings[Color.RED][SETTLEMENT][-1] == 7
+    assert len(buildings[Color.BLUE][ROAD]) == 0
+
+    copy = buildings.copy()
+    copy[Color.RED][ROAD].append(13)
+    assert buildings[Color.RED][ROAD] == [12]
+
+
+def test_board_arrays_behave_like_board_collections():
+    buildings = NodeBuildingsArray()
+    buildings[3] = (Color.RED, SETTLEMENT)
+    assert buildings.get(3) == (Color.RED, SETTLEMENT)
+    assert buildings.get(4, None) is None
+    assert dict(buildings) == {3: (Color.RED, SETTLEMENT)}
+
+    roads = EdgeRoadsArray()
+    roads[12] = Color.RED
+    assert roads[12] == Color.RED
+    assert roads[13] is None
+    expected = [None] * NUM_GRAPH_EDGES
+    expected[12] = Color.RED
+    assert roads == expected
+    roads[12] = None
+    assert roads == [None] * NUM_GRAPH_EDGES
+
+
+def test_array_state_copy_is_independent():
+    players = [SimplePlayer(Color.RED), SimplePlayer(Color.BLUE)]
+    state = ArrayState(players)
+    apply_action(state, state.playable_actions[0])
+    color = state.colors[0]
+
+    copy = state.copy()
+    player_deck_replenish(copy, color, WOOD, 2)
+    apply_action(copy, copy.playable_actions[0])
+
+    assert get_player_freqdeck(state, color) == [0, 0, 0, 0, 0]
+    assert get_player_freqdeck(copy, color) == [2, 0, 0, 0, 0]
+    assert len(get_player_buildings(state, color, ROAD)) == 0
+    assert len(get_player_buildings(copy, color, ROAD)) == 1
+    assert state.board.roads.count(None) == NUM_GRAPH_EDGES
+    assert copy.board.roads.count(None) == NUM_GRAPH_EDGES - 1
+
+
+def test_array_state_plays_same_game_as_state():
+    def build_players():
+        return [
+            RandomPlayer(Color.RED),
+            RandomPlayer(Color.BLUE),
+            RandomPlayer(Color.WHITE),
+            RandomPlayer(Color.ORANGE),
+        ]
+
+    game = Game(build_players(), seed=123)
+    game.play()
+
+    array_game = Game(build_players(), seed=123)
+    array_game.state = ArrayState.from_state(array_game.state)
+    array_game.play()
+
+    assert isinstance(array_game.state, ArrayState)
+    assert array_game.state.actions == game.state.actions
+    assert dict(array_game.state.player_state) == game.state.player_state
+    assert dict(array_game.state.board.buildings) == game.state.board.buildings
+    assert list(array_game.state.board.roads) == game.state.board.roads
+    for color in game.state.colors:
+        for building_type in [SETTLEMENT, CITY, ROAD]:
+            assert get_player_buildings(
+                array_game.state, color, building_type
+            ) == get_player_buildings(game.state, color, building_type)
+
+
+def test_array_game_copy_keeps_backend():
+    game = Game([SimplePlayer(Color.RED), SimplePlayer(Color.BLUE)])
+    game.state = ArrayState.from_state(game.state)
+    game.execute(game.state.playable_actions[0])
+
+    game_copy = game.copy()
+    assert isinstance(game_copy.state, ArrayState)
+    game_copy.execute(game_copy.state.playable_actions[0])
+    assert len(game_copy.state.actions) == len(game.state.actions) + 1
+    assert game.state.playable_actions[0].action_type == ActionType.BUILD_ROAD
+    assert game.state.board.roads.count(None) == NUM_GRAPH_EDGES
+    assert game_copy.state.board.roads.count(None) == NUM_GRAPH_EDGES - 1
+
+
+def test_array_game_serializes():
+    game = Game([SimplePlayer(Color.RED), SimplePlayer(Color.BLUE)])
+    game.state = ArrayState.from_state(game.state)
+    game.execute(game.state.playable_actions[0])
+
+    result = json.loads(json.dumps(game, cls=GameEncoder))
+    assert result["player_state"]["P0_VICTORY_POINTS"] == 1
@@ -0,0 +1,105 @@
+import numpy as np
+
+from catanatron.game import Game
+from catanatron.models.player import Color, RandomPlayer
+from catanatron_gym.features import create_sample_vector
+from catanatron_experimental.machine_learning.players.evaluation import (
+    EvaluationQueue,
+    LinearBackend,
+)
+from catanatron_experimental.machine_learning.players.mcts import MCTSPlayer
+from catanatron_experimental.machine_learning.players.minimax import AlphaBetaPlayer
+from catanatron_experimental.machine_learning.players.tree_search_utils import (
+    execute_spectrum,
+)
+
+
+class CountingBackend(LinearBackend):
+    num_calls = 0
+
+    def predict(self, matrix):
+        self.num_calls += 1
+        return super().predict(matrix)
+
+
+def get_leaves(num_leaves):
+    game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)], seed=1)
+    leaves = []
+    while len(leaves) < num_leaves:
+        game.play_tick()
+        leaves.append((game.copy(), game.state.current_color()))
+    return leaves
+
+
+def test_queue_evaluates_in_batches():
+    backend = CountingBackend()
+    queue = EvaluationQueue(backend, batch_size=4)
+    leaves = get_leaves(10)
+    futures = [queue.submit(game, color) for game, color in leaves]
+
+    assert backend.num_calls == 2  # two full batches, 2 leaves pending
+    assert sum(future.done() for future in futures) == 8
+    values = [future.result() for future in futures]  # flushes the rest
+    assert backend.num_calls == 3
+    assert queue.num_leaves == 10
+
+    for (game, color), value in zip(leaves, values):
+        vector = np.array(create_sample_vector(game, color, backend.features))
+        expected = backend.predict(vector.astype(np.float32)[np.newaxis, :])[0]
+        assert np.isclose(value, expected)
+
+
+def test_queue_sets_exceptions():
+    class FailingBackend(LinearBackend):
+        def predict(self, matrix):
+            raise ValueError("bad model")
+
+    queue = EvaluationQueue(FailingBackend())
+    game, color = get_leaves(1)[0]
+    future = queue.submit(game, color)
+    queue.flush()
+    assert isinstance(future.exception(), ValueError)
+
+
+def test_mcts_with_evaluation_queue():
+    backend = CountingBackend()
+    player = MCTSPlayer(
+        Color.RED, 16, batch_size=8, evaluation_queue=EvaluationQueue(backend)
+    )
+    game = Game([player, RandomPlayer(Color.BLUE)], seed=1)
+    while game.state.current_color() != Color.RED:
+        game.play_tick()
+
+    action = player.decide(game, game.state.playable_actions)
+    assert action in game.state.playable_actions
+    assert backend.num_calls == 2
+    assert player.root.visits == 16
+
+
+def test_alphabeta_with_evaluation_queue():
+    backend = CountingBackend()
+    queue = EvaluationQueue(backend)
+    player = AlphaBetaPlayer(Color.RED, 1, evaluation_queue=queue)
+    game = Game([player, RandomPlayer(Color.BLUE)], seed=1)
+    while game.state.current_color() != Color.RED:
+        game.play_tick()
+    actions = game.state.playable_actions
+
+    # the leafs of the root (depth 1) are evaluated in one batch
+    action = player.decide(game, actions)
+    assert backend.num_calls == 1
+    assert queue.num_leaves == len(actions)
+
+    def expected_value(action):
+        value = 0
+        for outcome, proba in execute_spectrum(game, action):
+            vector = create_sample_vector(outcome, Color.RED, backend.features)
+            matrix = np.array([vector], dtype=np.float32)
+            value += proba * backend.predict(matrix)[0]
+        return value
+
+    values = [expected_value(a) for a in actions]
+    assert np.isclose(expected_value(action), max(values))
+
+    player = AlphaBetaPlayer(Color.RED, 2, evaluation_queue=queue)
+    assert player.decide(game, actions) in actions
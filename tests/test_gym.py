@@ -1,12 +1,23 @@
 import random
 
+import numpy as np
+import pytest
 import gymnasium as gym
 from gymnasium.utils.env_checker import check_env
 
 from catanatron_gym.features import get_feature_ordering
+from catanatron.models.action_table import ACTIONS
+from catanatron.models.enums import Action, ActionType
 from catanatron.models.player import Color, RandomPlayer
 from catanatron_experimental.machine_learning.players.value import ValueFunctionPlayer
-from catanatron_gym.envs.catanatron_env import CatanatronEnv
+from catanatron_gym.envs.catanatron_env import (
+    ACTIONS_ARRAY,
+    CatanatronEnv,
+    from_action_space,
+    normalize_action,
+    to_action_space,
+)
+from catanatron_gym.envs.catanatron_vec_env import CatanatronVecEnv
 
 features = get_feature_ordering(2)
 
@@ -51,6 +62,59 @@ def test_gym():
     env.close()
 
 
+def test_action_mask():
+    env = CatanatronEnv()
+    observation, info = env.reset()
+    for _ in range(50):
+        mask = info["action_mask"]
+        assert mask.dtype == bool
+        assert mask.shape == (env.action_space.n,)
+        assert sorted(np.flatnonzero(mask)) == sorted(set(info["valid_actions"]))
+
+        action = random.choice(info["valid_actions"])
+        observation, reward, terminated, truncated, info = env.step(action)
+        if terminated or truncated:
+            break
+
+
+def test_action_space_mapping():
+    env = CatanatronEnv()
+    for _ in range(100):
+        playable_actions = env.game.state.playable_actions
+        for action in playable_actions:
+            action_int = to_action_space(action)
+            normalized = normalize_action(action)
+            assert ACTIONS_ARRAY[action_int] == (
+                normalized.action_type,
+                normalized.value,
+            )
+
+            # first playable with that action_int
+            first = next(
+                a for a in playable_actions if to_action_space(a) == action_int
+            )
+            assert from_action_space(action_int, playable_actions) == first
+
+        invalid = next(
+            i for i in range(len(ACTIONS_ARRAY)) if i not in env.get_valid_actions()
+        )
+        with pytest.raises(ValueError):
+            from_action_space(invalid, playable_actions)
+
+        _, _, terminated, truncated, _ = env.step(
+            random.choice(env.get_valid_actions())
+        )
+        if terminated or truncated:
+            env.reset()
+
+
+def test_action_space_mapping_of_interned_actions():
+    for action in ACTIONS:
+        if action.action_type == ActionType.CANCEL_TRADE:
+            continue  # not in the action space
+        assert to_action_space(action) == to_action_space(Action(*action))
+
+
 def test_gym_registration_and_api_works():
     env = gym.make("catanatron_gym:catanatron-v1")
     observation, info = env.reset()
@@ -138,3 +202,44 @@ def test_mixed_rep():
     observation, info = env.reset()
     assert "board" in observation
     assert "numeric" in observation
+
+
+def play_random_vec_env(env, num_steps):
+    observations, info = env.reset(seed=1)
+    num_finished = 0
+    for _ in range(num_steps):
+        masks = info["action_mask"]
+        assert masks.any(axis=1).all()
+        actions = [random.choice(np.flatnonzero(mask)) for mask in masks]
+        observations, rewards, terminated, truncated, info = env.step(actions)
+        assert observations.shape == (env.num_envs, len(features))
+        if "final_observation" in info:
+            for i in np.flatnonzero(info["_final_observation"]):
+                assert terminated[i] or truncated[i]
+                assert rewards[i] in [-1, 0, 1]
+                # auto-reset: back to initial placement (no settlements)
+                vps_index = features.index("P0_ACTUAL_VPS")
+                assert info["final_observation"][i][vps_index] >= 2
+                assert get_p0_num_settlements(observations[i]) == 0
+                num_finished += 1
+    return num_finished
+
+
+def test_vec_env():
+    env = CatanatronVecEnv(3)
+    observations, info = env.reset(seed=1)
+    assert observations.shape == (3, len(features))
+    assert info["action_mask"].shape == (3, env.single_action_space.n)
+    for i, single_env in enumerate(env.batch.envs):
+        assert np.array_equal(observations[i], single_env._get_observation())
+        valid_actions = np.flatnonzero(info["action_mask"][i])
+        assert sorted(valid_actions) == sorted(single_env.get_valid_actions())
+
+    assert play_random_vec_env(env, 400) > 0
+    env.close()
+
+
+def test_vec_env_with_workers():
+    env = CatanatronVecEnv(3, num_workers=2)
+    assert play_random_vec_env(env, 400) > 0
+    env.close()
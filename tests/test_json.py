@@ -4,6 +4,8 @@ from catanatron.game import Game
 from catanatron.models.enums import ActionType
 from catanatron.models.player import SimplePlayer, Color
 from catanatron.json import GameEncoder, action_from_json
+from catanatron.models.action_table import get_action
+from catanatron.models.topology import EDGES
 
 
 def test_serialization():
@@ -33,3 +35,22 @@ def test_action_from_json():
     assert action.color == Color.RED
     assert action.action_type == ActionType.MARITIME_TRADE
     assert action.value == ("SHEEP", "SHEEP", "SHEEP", "SHEEP", "ORE")
+    assert action is get_action(action.code)  # interned
+
+
+def test_roads_are_node_pairs_in_json():
+    game = Game(players=[SimplePlayer(Color.RED), SimplePlayer(Color.BLUE)])
+    game.execute(game.state.playable_actions[0])
+    road = game.state.playable_actions[0]
+    assert isinstance(road.value, int)
+
+    result = json.loads(json.dumps(game, cls=GameEncoder))
+    data = result["current_playable_actions"][0]
+    assert data == [road.color.value, "BUILD_ROAD", list(EDGES[road.value])]
+    assert action_from_json(data) == road
+
+    game.execute(road)
+    result = json.loads(json.dumps(game, cls=GameEncoder))
+    assert result["actions"][-1][2] == list(EDGES[road.value])
+    (edge,) = [e for e in result["edges"] if e["color"] is not None]
+    assert tuple(edge["id"]) == EDGES[road.value]
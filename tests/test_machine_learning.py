@@ -6,7 +6,7 @@ import numpy as np
 from tests.utils import advance_to_play_turn, build_initial_placements
 from catanatron.state import player_deck_replenish
 from catanatron.models.enums import ORE, Action, ActionType, WHEAT, NodeRef
-from catanatron.models.board import Board, get_edges
+from catanatron.models.board import Board, get_edge_ids, get_edges
 from catanatron.models.map import (
     BASE_MAP_TEMPLATE,
     MINI_MAP_TEMPLATE,
@@ -16,10 +16,14 @@ from catanatron.models.map import (
 )
 from catanatron.game import Game
 from catanatron.models.map import number_probability
-from catanatron.models.player import SimplePlayer, Color
+from catanatron.models.player import RandomPlayer, SimplePlayer, Color
 from catanatron_gym.features import (
     create_sample,
+    create_sample_array,
+    create_sample_matrix,
+    create_sample_vector,
     expansion_features,
+    get_feature_plan,
     port_features,
     reachability_features,
     iter_players,
@@ -34,6 +38,7 @@ from catanatron_gym.board_tensor_features import (
     init_board_tensor_map,
     init_tile_coordinate_map,
 )
+from catanatron.models.topology import EDGE_IDS
 
 
 def test_create_sample():
@@ -50,6 +55,50 @@ def test_create_sample():
     assert len(sample) > 0
 
 
+def test_create_sample_array_matches_vector():
+    players = [
+        RandomPlayer(Color.RED),
+        RandomPlayer(Color.BLUE),
+        RandomPlayer(Color.WHITE),
+    ]
+    game = Game(players, seed=1)
+    games = []
+    for _ in range(20):
+        for _ in range(25):
+            game.play_tick()
+        games.append(game.copy())
+
+        for color in game.state.colors:
+            vector = create_sample_vector(game, color)
+            array = create_sample_array(game, color)
+            assert array.dtype == np.float32
+            assert np.allclose(array, vector)
+
+    colors = [game.state.current_color() for game in games]
+    matrix = create_sample_matrix(games, colors)
+    assert matrix.shape == (20, len(create_sample_vector(game, colors[0])))
+    for row, game, color in zip(matrix, games, colors):
+        assert np.allclose(row, create_sample_vector(game, color))
+
+    # subset of features, with some not in samples (skipped, as in vector)
+    features = ["P1_PUBLIC_VPS", "NOT_A_FEATURE", "BANK_WOOD", "TILE3_HAS_ROBBER"]
+    vector = create_sample_vector(game, Color.RED, features)
+    assert np.allclose(create_sample_array(game, Color.RED, features), vector)
+
+
+def test_feature_plan_keeps_map_values_of_last_layout():
+    for seed in range(5):
+        game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)], seed=seed)
+        for _ in range(200):
+            game.play_tick()
+        array = create_sample_array(game, Color.RED)
+        assert np.allclose(array, create_sample_vector(game, Color.RED))
+
+    plan = get_feature_plan(game)
+    assert plan.last_map is game.state.board.map
+    assert list(plan.map_values.keys()) == [game.state.board.robber_coordinate]
+
+
 def test_port_distance_features():
     players = [
         SimplePlayer(Color.RED),
@@ -60,7 +109,7 @@ def test_port_distance_features():
     game = Game(players)
     color = game.state.colors[0]
     game.execute(Action(color, ActionType.BUILD_SETTLEMENT, 3))
-    game.execute(Action(color, ActionType.BUILD_ROAD, (2, 3)))
+    game.execute(Action(color, ActionType.BUILD_ROAD, EDGE_IDS[(2, 3)]))
 
     ports = game.state.board.map.port_nodes
     se_port_resource = next(filter(lambda entry: 29 in entry[1], ports.items()))[0]
@@ -101,7 +150,7 @@ def test_expansion_features():
     game = Game(players)
     color = game.state.colors[0]
     game.execute(Action(color, ActionType.BUILD_SETTLEMENT, 3))
-    game.execute(Action(color, ActionType.BUILD_ROAD, (2, 3)))
+    game.execute(Action(color, ActionType.BUILD_ROAD, EDGE_IDS[(2, 3)]))
 
     neighbor_tile_resource = game.state.board.map.land_tiles[(1, -1, 0)].resource
     if neighbor_tile_resource is None:
@@ -144,7 +193,7 @@ def test_reachability_features():
     assert features["P0_1_ROAD_REACHABLE_BRICK"] == number_probability(4)
     assert features["P0_1_ROAD_REACHABLE_SHEEP"] == number_probability(6)
 
-    game.execute(Action(p0_color, ActionType.BUILD_ROAD, (0, 5)))
+    game.execute(Action(p0_color, ActionType.BUILD_ROAD, EDGE_IDS[(0, 5)]))
     features = reachability_features(game, p0_color)
     assert features["P0_0_ROAD_REACHABLE_WOOD"] == number_probability(3)
     assert features["P0_0_ROAD_REACHABLE_BRICK"] == number_probability(4)
@@ -225,7 +274,7 @@ def test_graph_features():
     game = Game(players)
     p0_color = game.state.colors[0]
     game.execute(Action(p0_color, ActionType.BUILD_SETTLEMENT, 3))
-    game.execute(Action(p0_color, ActionType.BUILD_ROAD, (2, 3)))
+    game.execute(Action(p0_color, ActionType.BUILD_ROAD, EDGE_IDS[(2, 3)]))
 
     features = graph_features(game, p0_color)
     assert features[f"NODE3_P0_SETTLEMENT"]
@@ -250,7 +299,7 @@ def test_graph_features_in_mini():
     game = Game(players, catan_map=CatanMap.from_template(MINI_MAP_TEMPLATE))
     p0_color = game.state.colors[0]
     game.execute(Action(p0_color, ActionType.BUILD_SETTLEMENT, 3))
-    game.execute(Action(p0_color, ActionType.BUILD_ROAD, (2, 3)))
+    game.execute(Action(p0_color, ActionType.BUILD_ROAD, EDGE_IDS[(2, 3)]))
 
     features = graph_features(game, p0_color)
     assert features[f"NODE3_P0_SETTLEMENT"]
@@ -278,23 +327,22 @@ def test_init_board_tensor_map():
     assert node_map[72] == (0, 10)
     assert node_map[60] == (20, 10)
 
-    assert edge_map[(82, 81)] == (1, 0)
-    assert edge_map[(81, 82)] == (1, 0)
-    assert edge_map[(81, 47)] == (3, 0)
-    assert edge_map[(92, 93)] == (19, 0)
-    assert edge_map[(82, 79)] == (0, 1)
-    assert edge_map[(47, 43)] == (4, 1)
-    assert edge_map[(53, 94)] == (19, 2)
-    assert edge_map[(44, 40)] == (2, 3)
-    assert edge_map[(21, 16)] == (6, 3)
-    assert edge_map[(24, 53)] == (18, 3)
-    assert edge_map[(72, 71)] == (1, 10)
-    assert edge_map[(60, 61)] == (19, 10)
+    assert edge_map[EDGE_IDS[(82, 81)]] == (1, 0)
+    assert edge_map[EDGE_IDS[(81, 47)]] == (3, 0)
+    assert edge_map[EDGE_IDS[(92, 93)]] == (19, 0)
+    assert edge_map[EDGE_IDS[(82, 79)]] == (0, 1)
+    assert edge_map[EDGE_IDS[(47, 43)]] == (4, 1)
+    assert edge_map[EDGE_IDS[(53, 94)]] == (19, 2)
+    assert edge_map[EDGE_IDS[(44, 40)]] == (2, 3)
+    assert edge_map[EDGE_IDS[(21, 16)]] == (6, 3)
+    assert edge_map[EDGE_IDS[(24, 53)]] == (18, 3)
+    assert edge_map[EDGE_IDS[(72, 71)]] == (1, 10)
+    assert edge_map[EDGE_IDS[(60, 61)]] == (19, 10)
 
     for i in range(NUM_NODES):
         assert i in node_map
-    for edge in get_edges():
-        assert edge in edge_map
+    for edge_id in get_edge_ids():
+        assert edge_id in edge_map
 
 
 def test_init_tile_map():
@@ -349,6 +397,36 @@ def test_create_board_tensor():
     assert tensor[9][6][1] == 1
 
 
+def test_create_board_tensor_is_incremental():
+    players = [
+        RandomPlayer(Color.RED),
+        RandomPlayer(Color.BLUE),
+        RandomPlayer(Color.WHITE),
+    ]
+    game = Game(players, seed=1)
+    create_board_tensor(game, Color.RED)
+    cache = game.state.board.tensor_cache
+
+    for _ in range(300):
+        if game.winning_color() is not None:
+            break
+        game.play_tick()
+        record = game.execute_with_undo(
+            game.state.playable_actions[0], validate_action=False
+        )
+        game_copy = game.copy()  # shares the cache
+        game.undo(record)
+
+        for game_ in [game, game_copy]:
+            fresh = game_.copy()
+            fresh.state.board.tensor_cache = None
+            for color in game.state.colors:
+                tensor = create_board_tensor(game_, color)
+                assert np.array_equal(tensor, create_board_tensor(fresh, color))
+    assert game.state.board.tensor_cache is cache
+    assert game_copy.state.board.tensor_cache is cache
+
+
 def test_robber_plane_simple():
     players = [
         SimplePlayer(Color.RED),
@@ -0,0 +1,111 @@
+import math
+
+from catanatron.game import Game
+from catanatron.models.enums import ActionPrompt, ActionType
+from catanatron.models.player import Color, RandomPlayer
+from catanatron_experimental.machine_learning.players.mcts import (
+    EXP_C,
+    MCTSPlayer,
+    StateNode,
+    epsilon,
+    iter_subtree,
+    prune_tree,
+)
+
+
+def test_mcts_reuses_tree_across_decisions():
+    player = MCTSPlayer(Color.RED, 20)
+    game = Game([player, RandomPlayer(Color.BLUE)], seed=1)
+    while game.state.current_color() != Color.RED:
+        game.play_tick()
+
+    # initial settlement, followed by initial road of same player
+    player.decide(game, game.state.playable_actions)
+    stats = player.root.action_stats()
+    action = max(stats.keys(), key=lambda a: stats[a][1])  # most visited
+    game.execute(action)
+    assert game.state.playable_actions[0].action_type == ActionType.BUILD_ROAD
+
+    previous_root = player.root
+    root = player.get_root(game)
+    assert root.parent is None
+    assert root.visits > 0
+    assert any(
+        child is root
+        for children in previous_root.children.values()
+        for child, _ in children
+    )
+    # only root holds a game
+    assert all(node.game is None for node in iter_subtree(root) if node is not root)
+
+
+def test_mcts_starts_new_tree_on_other_game():
+    player = MCTSPlayer(Color.RED, 5)
+    game = Game([player, RandomPlayer(Color.BLUE)])
+    player.get_root(game)
+    other_game = Game([player, RandomPlayer(Color.BLUE)])
+    root = player.get_root(other_game)
+    assert root.visits == 0
+
+
+def test_prune_tree_bounds_nodes():
+    game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)], seed=1)
+    root = StateNode(game.state.current_color(), game.copy(), None)
+    for _ in range(30):
+        root.run_simulation()
+    num_nodes = len(list(iter_subtree(root)))
+
+    assert prune_tree(root, num_nodes) == num_nodes
+    left = prune_tree(root, 100)
+    assert left <= 100
+    assert left == len(list(iter_subtree(root)))
+    root.run_simulation()  # can keep searching
+
+
+def test_action_scores_match_ucb():
+    game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)], seed=1)
+    root = StateNode(game.state.current_color(), game.copy(), None)
+    root.run_simulations(10)
+
+    scores = root.action_scores()
+    for i, (action, children) in enumerate(root.children.items()):
+        expected = 0
+        for child, proba in children:
+            expected += proba * (
+                child.wins / (child.visits + epsilon)
+                + EXP_C
+                * (math.log(root.visits + epsilon) / (child.visits + epsilon)) ** 0.5
+            )
+        assert math.isclose(scores[i], expected)
+
+
+def test_batched_simulations_remove_virtual_loss():
+    game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)], seed=1)
+    root = StateNode(game.state.current_color(), game.copy(), None)
+    root.run_simulations(10, batch_size=4)
+
+    assert root.visits == 10
+    assert root.child_visits.sum() == 10
+    for node in iter_subtree(root):
+        if node is not root:
+            assert node.visits == node.parent.child_visits[node.index]
+            assert node.wins == node.parent.child_wins[node.index]
+
+
+def test_discard_outcomes_replay_the_same_hand():
+    game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)], seed=1)
+    while game.state.current_prompt != ActionPrompt.DISCARD:
+        game.play_tick()
+    root = StateNode(game.state.current_color(), game.copy(), None)
+    root.expand(root.game)
+    (child,) = root.child_nodes
+    assert child.outcome.value is None
+
+    hands = []
+    for _ in range(5):
+        replay = root.game.copy()
+        child.apply_outcome(replay)
+        hands.append(replay.state.player_records)
+    assert child.outcome.action_type == ActionType.DISCARD
+    assert child.outcome.value is not None
+    assert all(hand == hands[0] for hand in hands)
@@ -0,0 +1,118 @@
+import time
+
+from catanatron.game import Game
+from catanatron.models.enums import ActionType
+from catanatron.models.player import Color, RandomPlayer
+from catanatron_experimental.machine_learning.players.minimax import (
+    AlphaBetaPlayer,
+    DebugStateNode,
+)
+from catanatron_experimental.machine_learning.players.transposition import (
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
+)
+
+
+def test_transposition_table_probe_respects_depth_and_bounds():
+    table = TranspositionTable()
+    table.store("exact", 2, 10, EXACT, "action")
+    table.store("lower", 2, 10, LOWER_BOUND)
+    table.store("upper", 2, 10, UPPER_BOUND)
+
+    assert table.probe("exact", 2, 0, 5).action == "action"
+    assert table.probe("exact", 3, 0, 5) is None  # not deep enough
+    assert table.probe("lower", 1, 0, 5) is not None  # value >= beta
+    assert table.probe("lower", 1, 0, 20) is None
+    assert table.probe("upper", 1, 15, 20) is not None  # value <= alpha
+    assert table.probe("upper", 1, 0, 20) is None
+    assert table.probe("missing", 0, 0, 20) is None
+    assert (table.hits, table.misses) == (3, 4)
+
+
+def test_transposition_table_eviction():
+    table = TranspositionTable(capacity=2)
+    table.store("a", 1, 1, EXACT)
+    table.store("b", 1, 2, EXACT)
+    table.probe("a", 1, 0, 0)  # makes "b" the least recently used
+    table.store("c", 1, 3, EXACT)
+    assert table.get("b") is None
+    assert table.get("a") is not None
+    assert table.evictions == 1
+
+    # shallower results don't replace deeper ones
+    table.store("a", 0, 100, EXACT)
+    assert table.get("a").value == 1
+    table.store("a", 2, 100, EXACT)
+    assert table.get("a").value == 100
+
+
+def test_alphabeta_with_transposition_table():
+    players = [
+        AlphaBetaPlayer(Color.RED, 2, True, transposition_table=True),
+        RandomPlayer(Color.BLUE),
+    ]
+    game = Game(players, seed=1)
+    for _ in range(100):
+        game.play_tick()
+
+    table = players[0].transposition_table
+    assert table.stores > 0
+    assert table.hits + table.misses > 0
+
+    # kept across decisions of the same game, when asked to
+    while len(game.state.playable_actions) < 2:
+        game.play_tick()
+    keeping_player = AlphaBetaPlayer(
+        Color.RED, 2, False, transposition_table=True, keep_transposition_table=True
+    )
+    keeping_player.decide(game, game.state.playable_actions)
+    hits = keeping_player.transposition_table.hits
+    keeping_player.decide(game, game.state.playable_actions)
+    # root resolved by the table, at both iterations (depth 1 and 2)
+    assert keeping_player.transposition_table.hits == hits + 2
+
+
+def test_alphabeta_returns_within_time_budget():
+    players = [RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)]
+    game = Game(players, seed=1)
+    while len(game.state.playable_actions) < 5:
+        game.play_tick()
+
+    player = AlphaBetaPlayer(game.state.current_color(), 10, True, time_budget_ms=50)
+    start = time.time()
+    action = player.decide(game, game.state.playable_actions)
+    assert time.time() - start < 1
+    assert action in game.state.playable_actions
+
+
+def search_root(player, game, depth):
+    """Iterative deepening like decide, with no deadline. (action, value)"""
+    game_copy = game.copy()
+    for i in range(1, depth + 1):
+        node = DebugStateNode("", player.color)
+        result = player.alphabeta(
+            game_copy, i, float("-inf"), float("inf"), float("inf"), node
+        )
+    return result
+
+
+def test_alphabeta_transposition_table_keeps_root_value():
+    chance_types = {ActionType.BUY_DEVELOPMENT_CARD, ActionType.MOVE_ROBBER}
+    for seed in range(3):
+        players = [RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)]
+        game = Game(players, seed=seed)
+        for _ in range(60):
+            game.play_tick()
+        # a position with chance nodes right below the root
+        while len(game.state.playable_actions) < 2 or not any(
+            a.action_type in chance_types for a in game.state.playable_actions
+        ):
+            game.play_tick()
+
+        color = game.state.current_color()
+        for depth in [2, 3]:
+            expected = search_root(AlphaBetaPlayer(color, depth), game, depth)
+            player = AlphaBetaPlayer(color, depth, transposition_table=True)
+            assert search_root(player, game, depth) == expected
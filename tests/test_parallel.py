@@ -0,0 +1,62 @@
+import pickle
+
+from catanatron.game import Game
+from catanatron.array_state import ArrayState
+from catanatron.models.player import Color, RandomPlayer
+from catanatron_experimental.machine_learning.players.mcts import MCTSPlayer
+from catanatron_experimental.machine_learning.players.minimax import AlphaBetaPlayer
+from catanatron_experimental.machine_learning.players.parallel import (
+    decode_game,
+    encode_game,
+    get_worker_pool,
+)
+
+
+def test_encode_game_round_trip():
+    game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)], seed=1)
+    for _ in range(100):
+        game.play_tick()
+
+    data = encode_game(game)
+    assert len(data) < len(pickle.dumps(game))
+
+    decoded = decode_game(data)
+    assert decoded.id == game.id
+    assert decoded.state.player_state == game.state.player_state
+    assert decoded.state.board.buildings == game.state.board.buildings
+    assert decoded.state.playable_actions == game.state.playable_actions
+    assert decoded.state.actions == []
+
+    # can keep playing on its own
+    decoded.execute(decoded.state.playable_actions[0])
+    assert len(game.state.actions) == 100
+
+
+def test_encode_game_keeps_backend():
+    game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)])
+    game.state = ArrayState.from_state(game.state)
+    decoded = decode_game(encode_game(game))
+    assert isinstance(decoded.state, ArrayState)
+    decoded.execute(decoded.state.playable_actions[0])
+
+
+def test_worker_pool_is_reused():
+    pool = get_worker_pool(2)
+    assert get_worker_pool(2) is pool
+    assert get_worker_pool(1) is pool  # smaller requests use the same pool
+    assert get_worker_pool() is pool
+
+
+def test_parallel_search_players_decide():
+    game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)], seed=1)
+    while len(game.state.playable_actions) < 4:
+        game.play_tick()
+    color = game.state.current_color()
+
+    alphabeta = AlphaBetaPlayer(color, 2, num_workers=2)
+    action = alphabeta.decide(game, game.state.playable_actions)
+    assert action in game.state.playable_actions
+
+    mcts = MCTSPlayer(color, 4, num_workers=2)
+    action = mcts.decide(game, game.state.playable_actions)
+    assert action in game.state.playable_actions
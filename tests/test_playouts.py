@@ -0,0 +1,29 @@
+from catanatron.game import Game
+from catanatron.models.player import Color, RandomPlayer
+from catanatron_experimental.machine_learning.players import playouts
+from catanatron_experimental.machine_learning.players.playouts import (
+    run_playouts,
+    run_playouts_task,
+)
+from catanatron_experimental.machine_learning.players.parallel import encode_game
+
+
+def test_run_playouts(monkeypatch):
+    monkeypatch.setattr(playouts, "USE_MULTIPROCESSING", False)
+    game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)], vps_to_win=4)
+    game.execute(game.state.playable_actions[0])
+
+    counter = run_playouts(game, 8)
+
+    assert sum(counter.values()) == 8
+    assert set(counter.keys()) <= {Color.RED, Color.BLUE, None}
+    assert len(game.state.actions) == 1  # original game untouched
+
+
+def test_run_playouts_task():
+    game = Game([RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)], vps_to_win=4)
+    game.play()
+
+    winners = run_playouts_task((encode_game(game), 3, 0))
+
+    assert winners == [game.winning_color()] * 3
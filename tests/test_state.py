@@ -1,6 +1,14 @@
+import random
+
 import pytest
 
-from catanatron.state import State, apply_action
+from catanatron.array_state import ArrayState
+from catanatron.state import (
+    State,
+    apply_action,
+    apply_action_with_undo,
+    undo_action,
+)
 from catanatron.state_functions import (
     get_dev_cards_in_hand,
     player_freqdeck_add,
@@ -10,6 +18,9 @@ from catanatron.state_functions import (
 )
 from catanatron.models.enums import (
     RESOURCES,
+    SETTLEMENT,
+    CITY,
+    ROAD,
     ActionPrompt,
     BRICK,
     MONOPOLY,
@@ -22,8 +33,9 @@ from catanatron.models.enums import (
     WOOD,
     YEAR_OF_PLENTY,
 )
-from catanatron.models.player import Color, SimplePlayer
+from catanatron.models.player import Color, RandomPlayer, SimplePlayer
 from catanatron.models.decks import freqdeck_count, freqdeck_from_listdeck
+from catanatron.models.topology import EDGE_IDS
 
 
 def test_buying_road_is_payed_for():
@@ -32,7 +44,7 @@ def test_buying_road_is_payed_for():
 
     state.is_initial_build_phase = False
     state.board.build_settlement(players[0].color, 3, True)
-    action = Action(players[0].color, ActionType.BUILD_ROAD, (3, 4))
+    action = Action(players[0].color, ActionType.BUILD_ROAD, EDGE_IDS[(3, 4)])
     player_freqdeck_add(
         state,
         players[0].color,
@@ -192,3 +204,150 @@ def test_sequence():
     assert Action(p0_color, ActionType.BUILD_SETTLEMENT, 50) in state.playable_actions
 
     apply_action(state, state.playable_actions[0])
+
+
+def state_snapshot(state):
+    board = state.board
+    return (
+        dict(state.player_state),
+        list(state.resource_freqdeck),
+        list(state.development_listdeck),
+        [
+            list(state.buildings_by_color[color][building_type])
+            for color in state.colors
+            for building_type in [SETTLEMENT, CITY, ROAD]
+        ],
+        list(state.actions),
+        list(state.playable_actions),
+        state.num_turns,
+        state.current_player_index,
+        state.current_turn_index,
+        state.current_prompt,
+        state.is_initial_build_phase,
+        state.is_discarding,
+        state.is_moving_knight,
+        state.is_road_building,
+        state.free_roads_available,
+        state.is_resolving_trade,
+        state.current_trade,
+        state.acceptees,
+        dict(board.buildings),
+        list(board.roads),
+        dict(board.component_masks),
+        dict(board.component_index),
+        dict(board.road_lengths),
+        board.road_color,
+        board.road_length,
+        board.board_buildable_mask,
+        dict(board.reachable_masks),
+        dict(board.buildable_edge_masks),
+        board.robber_coordinate,
+        board.payout_table,
+    )
+
+
+@pytest.mark.parametrize("state_class", [State, ArrayState])
+def test_undo_action_restores_state(state_class):
+    random.seed(7)
+    players = [
+        RandomPlayer(Color.RED),
+        RandomPlayer(Color.BLUE),
+        RandomPlayer(Color.WHITE),
+    ]
+    state = state_class(players)
+
+    for _ in range(400):
+        before = state_snapshot(state)
+        for action in state.playable_actions:
+            record = apply_action_with_undo(state, action)
+            assert record.action.action_type == action.action_type
+            undo_action(state, record)
+            assert state_snapshot(state) == before
+
+        apply_action(state, random.choice(state.playable_actions))
+        if any(
+            state.player_state[f"P{i}_ACTUAL_VICTORY_POINTS"] >= 10
+            for i in range(len(state.colors))
+        ):
+            break
+
+
+def test_undo_action_restores_longest_road():
+    players = [SimplePlayer(Color.RED), SimplePlayer(Color.BLUE)]
+    state = State(players)
+    state.is_initial_build_phase = False
+    state.board.build_settlement(Color.RED, 3, True)
+    state.buildings_by_color[Color.RED][SETTLEMENT].append(3)
+    for edge in [(3, 4), (4, 5), (5, 0), (0, 1)]:
+        player_freqdeck_add(state, Color.RED, freqdeck_from_listdeck([WOOD, BRICK]))
+        apply_action(state, Action(Color.RED, ActionType.BUILD_ROAD, EDGE_IDS[edge]))
+    assert state.board.road_color is None
+
+    player_freqdeck_add(state, Color.RED, freqdeck_from_listdeck([WOOD, BRICK]))
+    before = state_snapshot(state)
+    record = apply_action_with_undo(
+        state, Action(Color.RED, ActionType.BUILD_ROAD, EDGE_IDS[(1, 2)])
+    )
+    assert state.board.road_color == Color.RED
+    assert state.player_state["P0_HAS_ROAD"] or state.player_state["P1_HAS_ROAD"]
+
+    undo_action(state, record)
+    assert state_snapshot(state) == before
+    assert state.board.road_color is None
+
+
+def test_apply_action_with_undo_leaves_state_on_error():
+    players = [SimplePlayer(Color.RED), SimplePlayer(Color.BLUE)]
+    state = State(players)
+    player_deck_replenish(state, Color.BLUE, WHEAT, 1)
+
+    before = state_snapshot(state)
+    action = Action(Color.RED, ActionType.MOVE_ROBBER, ((0, 0, 0), Color.BLUE, ORE))
+    with pytest.raises(Exception):
+        apply_action_with_undo(state, action)
+    assert state_snapshot(state) == before
+
+
+@pytest.mark.parametrize("state_class", [State, ArrayState])
+def test_forks_dont_leak_mutations(state_class):
+    random.seed(3)
+    players = [
+        RandomPlayer(Color.RED),
+        RandomPlayer(Color.BLUE),
+        RandomPlayer(Color.WHITE),
+    ]
+    state = state_class(players)
+
+    for _ in range(80):
+        before = state_snapshot(state)
+        forks = [state.fork() for _ in range(3)]
+        for state_fork in forks:
+            for _ in range(10):
+                if len(state_fork.playable_actions) == 0:
+                    break
+                action = random.choice(state_fork.playable_actions)
+                record = apply_action_with_undo(state_fork, action)
+                if random.random() < 0.3:
+                    undo_action(state_fork, record)
+            assert state_snapshot(state) == before
+
+        # and parent mutations don't leak to forks
+        fork_before = state_snapshot(forks[0])
+        for _ in range(5):
+            apply_action(state, random.choice(state.playable_actions))
+        assert state_snapshot(forks[0]) == fork_before
+
+
+def test_fork_shares_until_written():
+    players = [SimplePlayer(Color.RED), SimplePlayer(Color.BLUE)]
+    state = State(players)
+    state_fork = state.fork()
+    assert state_fork.board is state.board
+    assert state_fork.actions is not state.actions
+    assert state_fork.player_records is not state.player_records
+
+    apply_action(state_fork, state_fork.playable_actions[0])  # a settlement
+    assert state_fork.board is not state.board
+    assert state_fork.buildings_by_color is not state.buildings_by_color
+    assert len(state.actions) == 0
+    assert len(state.board.buildings) == 0
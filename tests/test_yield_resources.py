@@ -1,11 +1,20 @@
+import random
+
+import pytest
+
+from catanatron.game import Game
 from catanatron.state import yield_resources
 from catanatron.models.board import Board
-from catanatron.models.player import Color
+from catanatron.models.enums import RESOURCES, SETTLEMENT
+from catanatron.models.player import Color, RandomPlayer
 from catanatron.models.decks import (
+    freqdeck_can_draw,
     freqdeck_count,
     freqdeck_draw,
+    freqdeck_replenish,
     starting_resource_bank,
 )
+from catanatron.models.topology import EDGE_IDS
 
 
 def test_yield_resources():
@@ -31,8 +40,8 @@ def test_yield_resources_two_settlements():
         tile, edge2, node2 = board.map.land_tiles[(-1, 0, 1)], (4, 15), 15
 
     board.build_settlement(Color.RED, 3, initial_build_phase=True)
-    board.build_road(Color.RED, (3, 4))
-    board.build_road(Color.RED, edge2)
+    board.build_road(Color.RED, EDGE_IDS[(3, 4)])
+    board.build_road(Color.RED, EDGE_IDS[edge2])
     board.build_settlement(Color.RED, node2)
     payout, depleted = yield_resources(board, resource_freqdeck, tile.number)
     assert len(depleted) == 0
@@ -61,8 +70,8 @@ def test_yield_resources_two_players_and_city():
 
     # red has one settlements and one city on tile
     board.build_settlement(Color.RED, 2, initial_build_phase=True)
-    board.build_road(Color.RED, edge1)
-    board.build_road(Color.RED, edge2)
+    board.build_road(Color.RED, EDGE_IDS[edge1])
+    board.build_road(Color.RED, EDGE_IDS[edge2])
     board.build_settlement(Color.RED, red_node)
     board.build_city(Color.RED, red_node)
 
@@ -92,3 +101,47 @@ def test_empty_payout_if_not_enough_resources():
     assert (
         Color.RED not in payout or freqdeck_count(payout[Color.RED], tile.resource) == 0  # type: ignore
     )
+
+
+def tile_walk_yield_resources(board, resource_freqdeck, number):
+    """Reference implementation, walking every tile on every roll"""
+    intented_payout = dict()
+    for coordinate, tile in board.map.land_tiles.items():
+        if tile.number != number or board.robber_coordinate == coordinate:
+            continue
+        for node_id in tile.nodes.values():
+            building = board.buildings.get(node_id, None)
+            if building is None:
+                continue
+            freqdeck = intented_payout.setdefault(building[0], [0, 0, 0, 0, 0])
+            amount = 1 if building[1] == SETTLEMENT else 2
+            freqdeck_replenish(freqdeck, amount, tile.resource)
+
+    totals = [sum(counts) for counts in zip(*intented_payout.values())]
+    depleted = [
+        resource
+        for resource, total in zip(RESOURCES, totals)
+        if not freqdeck_can_draw(resource_freqdeck, total, resource)
+    ]
+    for freqdeck in intented_payout.values():
+        for i, resource in enumerate(RESOURCES):
+            if resource in depleted:
+                freqdeck[i] = 0
+    return intented_payout, depleted
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_yield_resources_matches_tile_walk(seed):
+    players = [RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)]
+    game = Game(players, seed=seed)
+    game.play()
+    board = game.state.board
+    rng = random.Random(seed)
+
+    for coordinate in board.map.land_tiles.keys():
+        board.robber_coordinate = coordinate
+        resource_freqdeck = [rng.randint(0, 4) for _ in RESOURCES]
+        for number in range(2, 13):
+            assert yield_resources(
+                board, resource_freqdeck, number
+            ) == tile_walk_yield_resources(board, resource_freqdeck, number)
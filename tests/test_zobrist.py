@@ -0,0 +1,69 @@
+import random
+
+from catanatron.game import Game
+from catanatron.state import State, apply_action, apply_action_with_undo, undo_action
+from catanatron.zobrist import compute_zobrist_hash, get_state_hash
+from catanatron.models.enums import Action, ActionType
+from catanatron.models.player import Color, RandomPlayer, SimplePlayer
+
+
+def test_zobrist_hash_is_maintained_incrementally():
+    players = [RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)]
+    game = Game(players, seed=1)
+    while game.winning_color() is None and game.state.num_turns < 200:
+        game.play_tick()
+        assert game.state.zobrist_hash == compute_zobrist_hash(game.state.board)
+
+
+def test_zobrist_hash_survives_undo():
+    players = [RandomPlayer(Color.RED), RandomPlayer(Color.BLUE)]
+    game = Game(players, seed=2)
+    for _ in range(200):
+        game.play_tick()
+
+    state = game.state
+    for action in state.playable_actions:
+        before = get_state_hash(state)
+        record = apply_action_with_undo(state, action)
+        undo_action(state, record)
+        assert get_state_hash(state) == before
+
+
+def test_state_hash_ignores_action_order():
+    state = State([SimplePlayer(Color.RED), SimplePlayer(Color.BLUE)])
+    while state.is_initial_build_phase:
+        apply_action(state, state.playable_actions[0])
+
+    # find two free roads RED can build in either order
+    apply_action(state, Action(Color.RED, ActionType.ROLL, (1, 1)))
+    color = state.current_color()
+    edges = state.board.buildable_edges(color)[:2]
+    assert len(edges) == 2
+    state.player_state[f"P{state.current_player_index}_WOOD_IN_HAND"] = 2
+    state.player_state[f"P{state.current_player_index}_BRICK_IN_HAND"] = 2
+    state.resource_freqdeck[0] -= 2
+    state.resource_freqdeck[1] -= 2
+
+    state_ab = state.copy()
+    apply_action(state_ab, Action(color, ActionType.BUILD_ROAD, edges[0]))
+    apply_action(state_ab, Action(color, ActionType.BUILD_ROAD, edges[1]))
+    state_ba = state.copy()
+    apply_action(state_ba, Action(color, ActionType.BUILD_ROAD, edges[1]))
+    apply_action(state_ba, Action(color, ActionType.BUILD_ROAD, edges[0]))
+
+    assert get_state_hash(state_ab) == get_state_hash(state_ba)
+    assert get_state_hash(state_ab) != get_state_hash(state)
+
+
+def test_zobrist_hash_tracks_robber():
+    state = State([SimplePlayer(Color.RED), SimplePlayer(Color.BLUE)])
+    coordinate = random.choice(
+        [c for c in state.board.map.land_tiles if c != state.board.robber_coordinate]
+    )
+    before = state.zobrist_hash
+    apply_action(
+        state,
+        Action(state.current_color(), ActionType.MOVE_ROBBER, (coordinate, None, None)),
+    )
+    assert state.zobrist_hash != before
+    assert state.zobrist_hash == compute_zobrist_hash(state.board)
@@ -1,5 +1,6 @@
 from catanatron.game import Game
 from catanatron.models.enums import Action, ActionType
+from catanatron.models.topology import EDGE_IDS
 
 
 def build_initial_placements(
@@ -7,18 +8,19 @@ def build_initial_placements(
     p0_actions=[0, (0, 1), 2, (1, 2)],
     p1_actions=[24, (24, 25), 26, (25, 26)],
 ):
+    """Roads are given as (a, b) node pairs"""
     p0_color = game.state.colors[0]
     p1_color = game.state.colors[1]
     game.execute(Action(p0_color, ActionType.BUILD_SETTLEMENT, p0_actions[0]))
-    game.execute(Action(p0_color, ActionType.BUILD_ROAD, p0_actions[1]))
+    game.execute(Action(p0_color, ActionType.BUILD_ROAD, EDGE_IDS[p0_actions[1]]))
 
     game.execute(Action(p1_color, ActionType.BUILD_SETTLEMENT, p1_actions[0]))
-    game.execute(Action(p1_color, ActionType.BUILD_ROAD, p1_actions[1]))
+    game.execute(Action(p1_color, ActionType.BUILD_ROAD, EDGE_IDS[p1_actions[1]]))
     game.execute(Action(p1_color, ActionType.BUILD_SETTLEMENT, p1_actions[2]))
-    game.execute(Action(p1_color, ActionType.BUILD_ROAD, p1_actions[3]))
+    game.execute(Action(p1_color, ActionType.BUILD_ROAD, EDGE_IDS[p1_actions[3]]))
 
     game.execute(Action(p0_color, ActionType.BUILD_SETTLEMENT, p0_actions[2]))
-    game.execute(Action(p0_color, ActionType.BUILD_ROAD, p0_actions[3]))
+    game.execute(Action(p0_color, ActionType.BUILD_ROAD, EDGE_IDS[p0_actions[3]]))
 
 
 def advance_to_play_turn(game):